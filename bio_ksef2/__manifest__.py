@@ -34,6 +34,8 @@ Requirements:
     },
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
+        'data/ir_actions_server_data.xml',
         'views/ksef_config_views.xml',
         'views/res_partner_views.xml',
         'views/account_move_views.xml',
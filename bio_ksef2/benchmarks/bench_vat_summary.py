@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+VAT summary of 10,000 invoices: float dict loop vs integer-grosze aggregation
+
+Usage:
+    python bio_ksef2/benchmarks/bench_vat_summary.py [invoices] [lines_per_invoice]
+"""
+import sys
+
+from common import sample_invoice_data, timeit
+
+from ksef_client.vat_summary import (
+    check_amount_total, format_grosze, inconsistent_invoices, summarize_invoices, summarize_lines,
+)
+
+
+def float_loop(lines):
+    """Previous xml_generator._calculate_vat_summary (float sums)"""
+    summary = {}
+    for line in lines:
+        vat_rate = line.get('vat_rate', 23)
+        if vat_rate not in summary:
+            summary[vat_rate] = {'net': 0.0, 'vat': 0.0, 'gross': 0.0}
+        summary[vat_rate]['net'] += line.get('net_amount', 0.0)
+        summary[vat_rate]['vat'] += line.get('vat_amount', 0.0)
+        summary[vat_rate]['gross'] += line.get('gross_amount', 0.0)
+    return summary
+
+
+def measure(label, func):
+    print(f'{label:>28}: {timeit(func, 1) * 1000:9.1f} ms')
+    return func()
+
+
+def main():
+    invoice_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    invoices = [sample_invoice_data(line_count, number=idx) for idx in range(invoice_count)]
+    amount_totals = {data['invoice_number']: round(data['total_gross'], 2) for data in invoices}
+
+    print(f'{invoice_count} invoices x {line_count} lines')
+    floats = measure('float loop per invoice', lambda: [float_loop(data['lines']) for data in invoices])
+    measure('grosze per invoice', lambda: [summarize_lines(data['lines']) for data in invoices])
+    summaries = measure('grosze batch', lambda: summarize_invoices({
+        data['invoice_number']: data['lines'] for data in invoices
+    }))
+    measure('amount_total check (batch)', lambda: inconsistent_invoices(summaries, amount_totals))
+
+    # Grosz drift of the float loop against the exact sums
+    drift = 0
+    for data, summary in zip(invoices, floats):
+        exact = summaries[data['invoice_number']]
+        for vat_rate, amounts in summary.items():
+            if f'{amounts["vat"]:.2f}' != format_grosze(exact[vat_rate].vat):
+                drift += 1
+    mismatched = sum(1 for key, summary in summaries.items() if check_amount_total(summary, amount_totals[key]))
+    print(f'float P_14_x values off by a grosz: {drift}, invoices not matching amount_total: {mismatched}')
+
+
+if __name__ == '__main__':
+    main()
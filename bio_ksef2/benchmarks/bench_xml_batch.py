@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Month-end batch: serial rendering vs generate_fa_vat_xml_batch() process pool
+
+Usage:
+    python bio_ksef2/benchmarks/bench_xml_batch.py [invoices] [lines_per_invoice] [workers]
+"""
+import os
+import sys
+import time
+
+from common import sample_invoice_data
+
+from ksef_client.xml_generator import generate_fa_vat_xml_batch
+
+
+def main():
+    invoice_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    invoices = [sample_invoice_data(line_count, number=idx) for idx in range(invoice_count)]
+    print(f'{invoice_count} invoices x {line_count} lines, {workers} workers')
+
+    start = time.perf_counter()
+    serial = generate_fa_vat_xml_batch(invoices, max_workers=1)
+    serial_time = time.perf_counter() - start
+    print(f'{"serial":>8}: {serial_time:7.2f} s')
+
+    start = time.perf_counter()
+    parallel = generate_fa_vat_xml_batch(invoices, max_workers=workers)
+    parallel_time = time.perf_counter() - start
+    print(f'{"pool":>8}: {parallel_time:7.2f} s  (x{serial_time / parallel_time:.1f})')
+
+    assert [item['size'] for item in serial] == [item['size'] for item in parallel]
+    print(f'{sum(item["size"] for item in parallel) / 1024 / 1024:.1f} MB XML')
+
+
+if __name__ == '__main__':
+    main()
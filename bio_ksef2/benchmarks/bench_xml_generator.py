@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark FA XML rendering for 1-, 100- and 10,000-line invoices
+
+Usage:
+    python bio_ksef2/benchmarks/bench_xml_generator.py
+"""
+from common import sample_invoice_data, timeit
+
+from ksef_client.xml_generator import generate_fa_vat_xml
+
+CASES = (
+    (1, 5000),
+    (100, 500),
+    (10000, 5),
+)
+
+
+def main():
+    print(f'{"lines":>7} {"format":>6} {"ms/doc":>10} {"docs/s":>10} {"KB/doc":>8}')
+    for line_count, repeat in CASES:
+        invoice_data = sample_invoice_data(line_count, foreign_currency=True)
+        for format_version in ('FA2', 'FA3'):
+            seconds = timeit(lambda: generate_fa_vat_xml(invoice_data, format_version), repeat)
+            size = len(generate_fa_vat_xml(invoice_data, format_version).encode('utf-8'))
+            print(f'{line_count:>7} {format_version:>6} {seconds * 1000:>10.3f} '
+                  f'{1 / seconds:>10.0f} {size / 1024:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
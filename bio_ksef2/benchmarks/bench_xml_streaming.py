@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Peak memory of rendering + hashing a large invoice: whole string vs UTF-8 chunks
+
+Usage:
+    python bio_ksef2/benchmarks/bench_xml_streaming.py [lines]
+"""
+import hashlib
+import sys
+import tracemalloc
+
+from common import sample_invoice_data
+
+from ksef_client.xml_generator import generate_fa_vat_xml, iter_fa_vat_xml_chunks
+
+
+def render_whole(invoice_data):
+    invoice_bytes = generate_fa_vat_xml(invoice_data).encode('utf-8')
+    return hashlib.sha256(invoice_bytes).hexdigest(), len(invoice_bytes)
+
+
+def render_chunks(invoice_data):
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter_fa_vat_xml_chunks(invoice_data):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    invoice_data = sample_invoice_data(line_count)
+    print(f'{line_count} lines')
+    for label, func in (('whole string', render_whole), ('chunks', render_chunks)):
+        tracemalloc.start()
+        _, size = func(invoice_data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{label:>14}: {size / 1024 / 1024:7.1f} MB XML, peak {peak / 1024 / 1024:7.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
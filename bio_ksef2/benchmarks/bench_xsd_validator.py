@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+XSD pre-flight validation: schema compile time and per-document validation time
+
+Usage:
+    python bio_ksef2/benchmarks/bench_xsd_validator.py
+
+Schemas are read from bio_ksef2/docs only (imported MF definition schemas from
+docs/MF); a form without a local schema is reported as not available.
+"""
+import time
+
+from common import sample_invoice_data, timeit
+
+from ksef_client import xsd_validator
+from ksef_client.xml_generator import FORMAT_PARAMS, generate_fa_vat_xml
+
+CASES = (
+    (1, 500),
+    (100, 50),
+    (10000, 2),
+)
+
+
+def main():
+    for format_version, (namespace, *_) in FORMAT_PARAMS.items():
+        start = time.perf_counter()
+        schema = xsd_validator.get_schema(namespace)
+        compile_time = time.perf_counter() - start
+        if schema is None:
+            print(f'{format_version}: schema not available ({namespace})')
+            continue
+        print(f'{format_version}: compile {compile_time * 1000:.1f} ms (once per worker thread)')
+
+        for line_count, repeat in CASES:
+            content = generate_fa_vat_xml(sample_invoice_data(line_count), format_version).encode('utf-8')
+            seconds = timeit(lambda: xsd_validator.validate_xml(content), repeat)
+            result = xsd_validator.validate_xml(content)
+            state = 'valid' if result is None else f'{len(result["status"]["details"])} errors'
+            print(f'  {line_count:>6} lines: {seconds * 1000:9.3f} ms/doc ({state})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Shared helpers for ksef_client benchmarks (run outside Odoo)"""
+import os
+import sys
+import time
+
+# Make `ksef_client` importable without loading the Odoo addon
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VAT_RATES = (23, 8, 5, 0)
+
+
+def sample_invoice_data(line_count: int, number: int = 1, foreign_currency: bool = False) -> dict:
+    """Builds a synthetic invoice_data dict in the format produced by the send wizard"""
+    currency_rate = 4.2875 if foreign_currency else None
+    lines = []
+    for idx in range(line_count):
+        vat_rate = VAT_RATES[idx % len(VAT_RATES)]
+        quantity = 1.0 + idx % 7
+        price_unit = 10.0 + (idx % 97) * 1.37
+        net_amount = round(quantity * price_unit, 2)
+        vat_amount = round(net_amount * vat_rate / 100, 2)
+        lines.append({
+            'name': f'Produkt testowy nr {idx} & "spółka"',
+            'index': f'SKU-{idx:06d}',
+            'gtin': f'590{idx:010d}',
+            'quantity': quantity,
+            'unit': 'szt',
+            'price_unit': price_unit,
+            'discount_amount': 0.0,
+            'net_amount': net_amount,
+            'vat_rate': vat_rate,
+            'vat_amount': vat_amount,
+            'gross_amount': net_amount + vat_amount,
+            'currency_rate': currency_rate,
+            'procedure': None,
+            'customer_product_code': f'C{idx}' if idx % 3 == 0 else '',
+            'customer_product_name': '',
+            'position_identifier': 'CU',
+            'logistics_code': 'LOG-01',
+        })
+
+    total_net = sum(line['net_amount'] for line in lines)
+    total_gross = sum(line['gross_amount'] for line in lines)
+    return {
+        'invoice_number': f'FV/2026/{number:06d}',
+        'date_of_receipt_by_buyer': '2026-01-31',
+        'ref': f'PO-{number}',
+        'issue_date': '2026-01-31',
+        'sale_date': '2026-01-31',
+        'payment_date': '2026-02-14',
+        'currency': 'EUR' if foreign_currency else 'PLN',
+        'currency_rate': currency_rate,
+        'is_foreign_currency': foreign_currency,
+        'seller': {
+            'nip': 'PL9462527947', 'name': 'Sprzedawca Sp. z o.o.', 'street': 'ul. Testowa 1',
+            'city': 'Warszawa', 'zip': '00-001', 'country': 'PL', 'gln': '5900000000001',
+        },
+        'buyer': {
+            'nip': '5260309174', 'name': 'Nabywca S.A.', 'street': 'ul. Kupiecka 2',
+            'city': 'Kraków', 'zip': '30-001', 'country': 'PL', 'gln': '',
+        },
+        'delivery_address': {
+            'name': 'Magazyn Centralny', 'street': 'ul. Składowa 3', 'city': 'Łódź',
+            'zip': '90-001', 'country': 'PL', 'nip': '', 'gln': '5900000000002',
+        },
+        'lines': lines,
+        'total_net': total_net,
+        'total_vat': total_gross - total_net,
+        'total_gross': total_gross,
+        'payment_term': {'days': 14, 'unit': 'dni', 'event': 'wystawienie faktury', 'due_date': '2026-02-14'},
+        'delivery_note_number': f'WZ/{number}',
+        'order_date': '2026-01-20',
+        'rodzaj_faktury': 'VAT',
+    }
+
+
+def timeit(func, repeat: int) -> float:
+    """Best-of-3 average seconds per call"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = (time.perf_counter() - start) / repeat
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,55 @@
+<?xml version="1.0" encoding="UTF-8"?>
+<!--
+	NOT the official MF common visualization templates
+	(http://crd.gov.pl/xml/schematy/dziedzinowe/mf/2022/01/07/eD/DefinicjeSzablony/WspolneSzablonyWizualizacji_v12-0E.xsl):
+	a local substitute written for this module with only the page frame and the templates called by the FA
+	styl.xsl stylesheets. The official file placed next to it (WspolneSzablonyWizualizacji_v12-0E.xsl) replaces it.
+-->
+<xsl:stylesheet xmlns:xsl="http://www.w3.org/1999/XSL/Transform" version="1.0">
+	<xsl:template match="/">
+		<html>
+			<head>
+				<meta http-equiv="Content-Type" content="text/html; charset=UTF-8"/>
+				<title>
+					<xsl:call-template name="TytulDokumentu"/>
+				</title>
+				<xsl:call-template name="StyleWspolne"/>
+				<xsl:call-template name="StyleDlaFormularza"/>
+			</head>
+			<body>
+				<div class="tlo-formularza">
+					<xsl:apply-templates/>
+				</div>
+			</body>
+		</html>
+	</xsl:template>
+	<xsl:template name="TytulDokumentu"/>
+	<xsl:template name="StyleDlaFormularza"/>
+	<xsl:template name="StyleWspolne">
+		<style type="text/css">
+	body { font-family: Arial, Helvetica, sans-serif; font-size: 0.8em; margin: 0; }
+	.deklaracja { max-width: 1000px; margin: 0 auto; padding: 10px; background-color: #FFFFFF; }
+	.naglowek td { vertical-align: top; }
+	.kod-formularza { font-size: 1.6em; font-weight: bold; }
+	.wariant { font-size: 1em; }
+	.nazwa { font-size: 1.4em; font-weight: bold; text-align: center; }
+	.naglowek-tytulowy { margin: 10px 0; text-align: center; }
+	.etykieta { display: block; font-size: 0.9em; color: #505050; }
+	.normalna, .wypelniane { font-weight: normal; }
+	.niewypelniane, .niewypelnianeopisy { background-color: #E8E8E8; }
+	.prawne { font-size: 0.9em; }
+	.white-space { white-space: pre-wrap; }
+	table { border-collapse: collapse; }
+	h1, h2, h3 { margin: 8px 0; }
+		</style>
+	</xsl:template>
+	<xsl:template name="NaglowekTytulowy">
+		<xsl:param name="uzycie"/>
+		<xsl:param name="nazwa"/>
+		<div class="naglowek-tytulowy {$uzycie}">
+			<div class="nazwa">
+				<xsl:value-of select="$nazwa"/>
+			</div>
+		</div>
+	</xsl:template>
+</xsl:stylesheet>
@@ -6,6 +6,11 @@ Simplified client for Polish KSeF API integration with Odoo
 from . import certificate
 from . import auth
 from . import invoice
+from . import upo
+from . import vat_summary
+from . import visualization
 from . import xml_generator
+from . import xml_reader
+from . import xsd_validator
 
-__all__ = ['certificate', 'auth', 'invoice', 'xml_generator']
+__all__ = ['certificate', 'auth', 'invoice', 'upo', 'vat_summary', 'visualization', 'xml_generator', 'xml_reader', 'xsd_validator']
@@ -1,20 +1,33 @@
 # -*- coding: utf-8 -*-
 """KSeF Authentication Module - Adapted for Odoo"""
 import base64
+import hashlib
+import threading
 import time
-import dateutil
+import dateutil.parser
 import logging
-import requests
+from datetime import datetime, timedelta, timezone
 
 from cryptography import x509
 from cryptography.hazmat.primitives.asymmetric import rsa, padding as apadding
 from cryptography.hazmat.primitives import hashes
 
 from . import certificate as cert
+from . import transport
 
 
 _logger = logging.getLogger(__name__)
 
+# Access tokens are renewed this many seconds before they expire
+TOKEN_MARGIN = 60
+
+# Authenticated Auth objects of this worker process, per (API URL, KSeF token digest).
+# _sessions_lock only guards the dicts; each key has its own lock held during
+# (re)authentication, so one slow login does not delay other companies.
+_sessions = {}
+_session_locks = {}
+_sessions_lock = threading.Lock()
+
 
 class Challenge:
     def __init__(self, api_url):
@@ -23,7 +36,7 @@ class Challenge:
         self.timestamp = None
 
         try:
-            resp = requests.post(f'{self.api_url}/api/v2/auth/challenge', timeout=60)
+            resp = transport.post(f'{self.api_url}/api/v2/auth/challenge', timeout=60)
             if resp.status_code != 200:
                 _logger.warning(f'API Error /challenge: {resp.status_code}')
                 return
@@ -98,7 +111,7 @@ class Auth:
 
         # 4. Відправляємо запит на автентифікацію
         try:
-            resp = requests.post(
+            resp = transport.post(
                 f'{self.api_url}/api/v2/auth/ksef-token',
                 json=body,
                 timeout=60
@@ -143,7 +156,7 @@ class Auth:
 
             try:
                 headers = {'Authorization': f'Bearer {self.auth_token}'}
-                resp = requests.get(
+                resp = transport.get(
                     f'{self.api_url}/api/v2/auth/{self.reference_number}',
                     headers=headers,
                     timeout=60
@@ -179,7 +192,7 @@ class Auth:
             _logger.info('Attempting to redeem token...')
 
             headers = {'Authorization': f'Bearer {self.auth_token}'}
-            resp = requests.post(
+            resp = transport.post(
                 f'{self.api_url}/api/v2/auth/token/redeem',
                 headers=headers,
                 timeout=60
@@ -210,6 +223,37 @@ class Auth:
             _logger.error(f'Error redeeming token: {e}')
             return False
 
+    def refresh(self) -> bool:
+        """Отримує новий access токен за refresh токеном (без повної автентифікації)"""
+        if not self.refresh_token or not _is_valid(self.refresh_token_valid_until):
+            return False
+        try:
+            resp = transport.post(
+                f'{self.api_url}/api/v2/auth/token/refresh',
+                headers={'Authorization': f'Bearer {self.refresh_token}'},
+                timeout=60
+            )
+            if resp.status_code != 200:
+                _logger.warning(f'Token refresh failed: {resp.status_code} - {resp.text}')
+                return False
+
+            access_token = resp.json().get('accessToken', {})
+            if not access_token.get('token'):
+                _logger.error('Failed to extract access token from refresh response')
+                return False
+            self.token = access_token['token']
+            self.token_valid_until = access_token.get('validUntil')
+            _logger.info(f'✓ Access token refreshed, valid until: {self.token_valid_until}')
+            return True
+
+        except Exception as e:
+            _logger.error(f'Error refreshing token: {e}')
+            return False
+
+    def is_valid(self, margin: int = TOKEN_MARGIN) -> bool:
+        """Чи access токен дійсний ще щонайменше margin секунд"""
+        return bool(self.token) and _is_valid(self.token_valid_until, margin)
+
     def _load_certificate(self):
         """Завантажує публічний сертифікат для шифрування"""
         try:
@@ -232,3 +276,45 @@ class Auth:
         except Exception as e:
             _logger.error(f'Error loading certificate: {e}')
             return None, None
+
+
+def _is_valid(valid_until, margin: int = 0) -> bool:
+    """validUntil (ISO 8601) is at least margin seconds away; unknown expiry counts as expired"""
+    if not valid_until:
+        return False
+    try:
+        expiry = dateutil.parser.isoparse(valid_until)
+    except (TypeError, ValueError):
+        return False
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) + timedelta(seconds=margin) < expiry
+
+
+def get_access_token(api_url, ksef_token):
+    """
+    Access токен для api_url/ksef_token, спільний для всіх викликів процесу
+
+    The token of the previous call is reused while it is valid, then renewed
+    with the refresh token; a full challenge/ksef-token authentication runs
+    only when neither is usable.
+
+    Returns:
+        access токен або None, якщо автентифікація не вдалася
+    """
+    key = (api_url, hashlib.sha256((ksef_token or '').encode()).hexdigest())
+    with _sessions_lock:
+        key_lock = _session_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        auth_client = _sessions.get(key)
+        if auth_client is not None and (auth_client.is_valid() or auth_client.refresh()):
+            return auth_client.token
+
+        auth_client = Auth(api_url, ksef_token)
+        with _sessions_lock:
+            if not auth_client.token:
+                _sessions.pop(key, None)
+                return None
+            _sessions[key] = auth_client
+        return auth_client.token
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from . import transport
 
 
 _logger = logging.getLogger(__name__)
@@ -13,7 +14,7 @@ class PublicCertificateManager:
 
     def fetch_certificates(self) -> bool:
         try:
-            resp = requests.get(
+            resp = transport.get(
                 f"{self.api_url}/api/v2/security/public-key-certificates",
                 timeout=60
             )
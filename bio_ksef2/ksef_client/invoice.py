@@ -3,11 +3,13 @@
 Модуль для роботи з інвойсами KSeF (створення, відправка, перевірка)
 """
 import logging
-import requests
 import base64
 import os
 import hashlib
-from typing import Optional, Dict, Any
+import json
+import tempfile
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -18,9 +20,15 @@ from cryptography import x509
 
 # config removed
 from . import certificate as cert
+from . import transport
 
 _logger = logging.getLogger(__name__)
 
+# Plaintext chunk size for hashing/encryption of str/bytes invoices
+ENCRYPT_CHUNK_SIZE = 64 * 1024
+# Ciphertext stays in memory up to this size, larger invoices spill to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
 
 class InvoiceSession:
     """Клас для роботи з онлайн сесією відправки інвойсів"""
@@ -100,7 +108,7 @@ class InvoiceSession:
                 'Content-Type': 'application/json'
             }
 
-            resp = requests.post(
+            resp = transport.post(
                 f'{self.api_url}/api/v2/sessions/online',
                 headers=headers,
                 json=body
@@ -127,12 +135,17 @@ class InvoiceSession:
             traceback.print_exc()
             return False
 
-    def send_invoice(self, invoice_xml: str) -> Optional[Dict[str, Any]]:
+    def send_invoice(self, invoice_xml: Union[str, bytes, Iterable[bytes]]) -> Optional[Dict[str, Any]]:
         """
         Відправляє інвойс в онлайн сесію
 
+        The invoice is hashed and encrypted chunk by chunk; the ciphertext is spooled
+        to a temporary file and base64-encoded piece by piece while the request body
+        is sent, so large invoices are never held as padded/encrypted/base64 copies.
+
         Args:
-            invoice_xml: XML інвойсу в форматі FA_VAT
+            invoice_xml: XML інвойсу в форматі FA_VAT - str, UTF-8 bytes або
+                         ітератор UTF-8 частин (xml_generator.iter_fa_vat_xml_chunks)
 
         Returns:
             Словник з даними відповіді або None у випадку помилки
@@ -141,47 +154,23 @@ class InvoiceSession:
             _logger.error('Session is not active! Call open() first.')
             return None
 
+        encrypted_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
         try:
-            # 1. Підготовка даних
-            invoice_bytes = invoice_xml.encode('utf-8')
-            invoice_size = len(invoice_bytes)
-
-            # 2. Хеш оригінального інвойсу (SHA-256)
-            invoice_hash = hashlib.sha256(invoice_bytes).digest()
-            invoice_hash_b64 = base64.b64encode(invoice_hash).decode('utf-8')
-
-            # 3. Шифрування інвойсу за допомогою AES-256-CBC з PKCS#7 padding
-            padder = sym_padding.PKCS7(128).padder()  # 128 біт для AES block size
-            padded_data = padder.update(invoice_bytes) + padder.finalize()
+            # 1-4. Хеш і розмір оригіналу, AES-256-CBC з PKCS#7 padding, хеш і розмір шифротексту
+            payload = self._encrypt_invoice(_iter_invoice_chunks(invoice_xml), encrypted_file)
 
-            cipher = Cipher(algorithms.AES(self.aes_key), modes.CBC(self.iv))
-            encryptor = cipher.encryptor()
-            encrypted_invoice = encryptor.update(padded_data) + encryptor.finalize()
-
-            # 4. Хеш і розмір зашифрованого інвойсу
-            encrypted_invoice_size = len(encrypted_invoice)
-            encrypted_invoice_hash = hashlib.sha256(encrypted_invoice).digest()
-            encrypted_invoice_hash_b64 = base64.b64encode(encrypted_invoice_hash).decode('utf-8')
-            encrypted_invoice_b64 = base64.b64encode(encrypted_invoice).decode('utf-8')
-
-            # 5. Формуємо body запиту
-            body = {
-                "invoiceHash": invoice_hash_b64,
-                "invoiceSize": invoice_size,
-                "encryptedInvoiceHash": encrypted_invoice_hash_b64,
-                "encryptedInvoiceSize": encrypted_invoice_size,
-                "encryptedInvoiceContent": encrypted_invoice_b64
-            }
+            # 5. Формуємо body запиту (encryptedInvoiceContent дописується потоково)
+            body = _EncryptedInvoiceBody(payload, encrypted_file)
 
             headers = {
                 'Authorization': f'Bearer {self.access_token}',
                 'Content-Type': 'application/json'
             }
 
-            resp = requests.post(
+            resp = transport.post(
                 f'{self.api_url}/api/v2/sessions/online/{self.session_reference}/invoices',
                 headers=headers,
-                json=body
+                data=body
             )
 
             if resp.status_code == 202:
@@ -208,6 +197,45 @@ class InvoiceSession:
             import traceback
             traceback.print_exc()
             return None
+        finally:
+            encrypted_file.close()
+
+    def _encrypt_invoice(self, chunks: Iterable[bytes], encrypted_file) -> Dict[str, Any]:
+        """
+        Потоково шифрує інвойс і записує шифротекст у encrypted_file
+
+        Returns:
+            invoiceHash/invoiceSize/encryptedInvoiceHash/encryptedInvoiceSize для body запиту
+        """
+        invoice_hash = hashlib.sha256()
+        encrypted_hash = hashlib.sha256()
+        invoice_size = 0
+        encrypted_size = 0
+
+        padder = sym_padding.PKCS7(128).padder()  # 128 біт для AES block size
+        encryptor = Cipher(algorithms.AES(self.aes_key), modes.CBC(self.iv)).encryptor()
+
+        for chunk in chunks:
+            invoice_hash.update(chunk)
+            invoice_size += len(chunk)
+            encrypted = encryptor.update(padder.update(chunk))
+            if encrypted:
+                encrypted_hash.update(encrypted)
+                encrypted_file.write(encrypted)
+                encrypted_size += len(encrypted)
+
+        encrypted = encryptor.update(padder.finalize()) + encryptor.finalize()
+        encrypted_hash.update(encrypted)
+        encrypted_file.write(encrypted)
+        encrypted_size += len(encrypted)
+        encrypted_file.seek(0)
+
+        return {
+            "invoiceHash": base64.b64encode(invoice_hash.digest()).decode('utf-8'),
+            "invoiceSize": invoice_size,
+            "encryptedInvoiceHash": base64.b64encode(encrypted_hash.digest()).decode('utf-8'),
+            "encryptedInvoiceSize": encrypted_size,
+        }
 
     def get_invoice_status(self, invoice_reference_number: str) -> Optional[Dict[str, Any]]:
         """
@@ -228,7 +256,7 @@ class InvoiceSession:
                 'Authorization': f'Bearer {self.access_token}'
             }
 
-            resp = requests.get(
+            resp = transport.get(
                 f'{self.api_url}/api/v2/sessions/{self.session_reference}/invoices/{invoice_reference_number}',
                 headers=headers
             )
@@ -285,7 +313,7 @@ class InvoiceSession:
 
             body = {}
 
-            resp = requests.post(
+            resp = transport.post(
                 f'{self.api_url}/api/v2/sessions/online/{self.session_reference}/close',
                 headers=headers,
                 json=body
@@ -327,6 +355,227 @@ class InvoiceSession:
             self.close()
 
 
+def _iter_invoice_chunks(invoice_xml: Union[str, bytes, Iterable[bytes]],
+                         chunk_size: int = ENCRYPT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Splits str/bytes invoices into UTF-8 chunks; iterators are passed through"""
+    if isinstance(invoice_xml, str):
+        # UTF-8 is encoded per character, so encoded slices concatenate to the full encoding
+        for start in range(0, len(invoice_xml), chunk_size):
+            yield invoice_xml[start:start + chunk_size].encode('utf-8')
+    elif isinstance(invoice_xml, (bytes, bytearray, memoryview)):
+        view = memoryview(invoice_xml)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    else:
+        yield from invoice_xml
+
+
+class _EncryptedInvoiceBody:
+    """
+    JSON body для POST /sessions/online/{ref}/invoices, що читається частинами
+
+    encryptedInvoiceContent is base64-encoded from the spooled ciphertext in
+    3-byte aligned pieces, which concatenate to the base64 of the whole content.
+    __len__ gives the HTTP client the Content-Length, read()/iteration serve the pieces.
+    """
+
+    # Multiple of 3 - base64 pieces have no padding except the last one
+    READ_SIZE = 3 * 16 * 1024
+
+    def __init__(self, payload: Dict[str, Any], encrypted_file):
+        self._head = (json.dumps(payload)[:-1] + ', "encryptedInvoiceContent": "').encode('utf-8')
+        self._tail = b'"}'
+        self._file = encrypted_file
+        encoded_size = 4 * ((payload['encryptedInvoiceSize'] + 2) // 3)
+        self._length = len(self._head) + encoded_size + len(self._tail)
+        self._pieces = self._iter_pieces()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._pieces
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b''.join(self._pieces)
+        return next(self._pieces, b'')
+
+    def _iter_pieces(self) -> Iterator[bytes]:
+        yield self._head
+        while True:
+            data = self._file.read(self.READ_SIZE)
+            if not data:
+                break
+            yield base64.b64encode(data)
+        yield self._tail
+
+
+class SessionStatus:
+    """Клас для перевірки статусів інвойсів вже відкритої або закритої сесії"""
+
+    # Maximum pageSize accepted by /sessions/{ref}/invoices
+    PAGE_SIZE = 1000
+
+    def __init__(self, api_url: str, access_token: str, session_reference: str):
+        """
+        Args:
+            api_url: URL API KSeF
+            access_token: Access token отриманий після автентифікації
+            session_reference: Референс-номер сесії, в якій відправлено інвойси
+        """
+        self.api_url = api_url
+        self.access_token = access_token
+        self.session_reference = session_reference
+
+    def get_invoice_status(self, invoice_reference_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Перевіряє статус одного інвойсу сесії
+
+        Args:
+            invoice_reference_number: Референс-номер інвойсу, отриманий після відправки
+
+        Returns:
+            Словник з даними статусу або None у випадку помилки
+        """
+        try:
+            resp = transport.get(
+                f'{self.api_url}/api/v2/sessions/{self.session_reference}/invoices/{invoice_reference_number}',
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=60,
+            )
+            if resp.status_code == 200:
+                return resp.json()
+
+            _logger.error(f'Failed to get invoice status: {resp.status_code}')
+            try:
+                _logger.error(f'Error details: {resp.json()}')
+            except:
+                _logger.error(f'Response: {resp.text}')
+            return None
+
+        except Exception as e:
+            _logger.error(f'Exception getting invoice status: {e}')
+            return None
+
+    def get_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Повертає статус сесії разом з лічильниками інвойсів
+
+        Returns:
+            Словник (status, invoiceCount, successfulInvoiceCount, failedInvoiceCount, upo)
+            або None у випадку помилки
+        """
+        try:
+            resp = transport.get(
+                f'{self.api_url}/api/v2/sessions/{self.session_reference}',
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=60,
+            )
+            if resp.status_code == 200:
+                return resp.json()
+
+            _logger.error(f'Failed to get session {self.session_reference} status: {resp.status_code}')
+            try:
+                _logger.error(f'Error details: {resp.json()}')
+            except:
+                _logger.error(f'Response: {resp.text}')
+            return None
+
+        except Exception as e:
+            _logger.error(f'Exception getting session status: {e}')
+            return None
+
+    def iter_invoices(self, page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Повертає статуси всіх інвойсів сесії, сторінка за сторінкою
+
+        Follows the x-continuation-token header until KSeF reports no more pages.
+
+        Args:
+            page_size: Кількість інвойсів на сторінку (10-1000)
+
+        Yields:
+            Словник статусу інвойсу (referenceNumber, ksefNumber, status, ...)
+        """
+        return self._iter_pages(f'/api/v2/sessions/{self.session_reference}/invoices', page_size)
+
+    def iter_failed_invoices(self, page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Повертає лише відхилені інвойси сесії, сторінка за сторінкою
+
+        Args:
+            page_size: Кількість інвойсів на сторінку (10-1000)
+
+        Yields:
+            Словник статусу відхиленого інвойсу
+        """
+        return self._iter_pages(f'/api/v2/sessions/{self.session_reference}/invoices/failed', page_size)
+
+    def download_upo_pages(self, pages: List[Dict[str, Any]], max_workers: int = 4) -> Optional[List[bytes]]:
+        """
+        Завантажує всі сторінки UPO закритої сесії паралельно
+
+        Args:
+            pages: 'upo' -> 'pages' зі статусу сесії (referenceNumber, downloadUrl, ...)
+            max_workers: Кількість одночасних запитів
+
+        Returns:
+            Список XML сторінок UPO (в порядку pages) або None, якщо хоч одна не завантажилась
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = list(executor.map(self._download_upo_page, pages))
+
+        if any(content is None for content in contents):
+            return None
+        return contents
+
+    def _download_upo_page(self, page: Dict[str, Any]) -> Optional[bytes]:
+        """Downloads one UPO page through /sessions/{ref}/upo/{upoRef}"""
+        upo_reference = page.get('referenceNumber')
+        try:
+            resp = transport.get(
+                f'{self.api_url}/api/v2/sessions/{self.session_reference}/upo/{upo_reference}',
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=60,
+            )
+            if resp.status_code == 200:
+                return resp.content
+
+            _logger.error(f'Failed to download UPO {upo_reference}: {resp.status_code}')
+            return None
+
+        except Exception as e:
+            _logger.error(f'Exception downloading UPO {upo_reference}: {e}')
+            return None
+
+    def _iter_pages(self, path: str, page_size: int) -> Iterator[Dict[str, Any]]:
+        """Iterates the 'invoices' of every page of a continuation-token listing"""
+        url = f'{self.api_url}{path}'
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        continuation_token = None
+
+        while True:
+            if continuation_token:
+                headers['x-continuation-token'] = continuation_token
+
+            resp = transport.get(url, headers=headers, params={'pageSize': page_size}, timeout=60)
+            if resp.status_code != 200:
+                _logger.error(f'Failed to list {path}: {resp.status_code}')
+                try:
+                    _logger.error(f'Error details: {resp.json()}')
+                except:
+                    _logger.error(f'Response: {resp.text}')
+                return
+
+            data = resp.json()
+            yield from data.get('invoices', [])
+
+            continuation_token = data.get('continuationToken')
+            if not continuation_token:
+                return
+
+
 def create_sample_invoice_xml(
     invoice_number: str,
     seller_nip: str,
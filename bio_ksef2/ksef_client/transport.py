@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Shared HTTP connection pool for the KSeF API calls
+
+All ksef_client requests go through get()/post(), which take the same
+arguments as requests.get()/requests.post() and return a response with
+status_code, json(), text, content and headers.
+
+With httpx installed, one httpx.Client is shared by all threads. HTTP/2 is
+opt-in (configure(http2=True), needs h2): concurrent sends, status checks and
+UPO downloads are then multiplexed over one connection per KSeF host (ALPN falls
+back to HTTP/1.1 when the server does not offer HTTP/2). Without httpx, each
+thread keeps a pooled requests.Session, so connections are still reused instead
+of opened per call.
+"""
+import logging
+import os
+import threading
+from importlib.util import find_spec
+
+try:
+    import httpx
+except ImportError:  # requests is the module's declared dependency; httpx is optional
+    httpx = None
+
+_logger = logging.getLogger(__name__)
+
+# Connection pool per worker process; HTTP/2 streams multiplex over these
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Seconds; used when the caller does not pass a timeout
+DEFAULT_TIMEOUT = 60
+
+_lock = threading.Lock()
+_client = None
+# HTTP/2 requested by configure(); off by default
+_http2 = False
+# Process that created _client: prefork workers must not share the parent's sockets
+_client_pid = None
+_sessions = threading.local()
+
+
+def http2_available() -> bool:
+    """True when requests can be sent over HTTP/2 (httpx and h2 installed)"""
+    return httpx is not None and find_spec('h2') is not None
+
+
+def configure(http2: bool = False):
+    """
+    Вмикає/вимикає HTTP/2 для спільного клієнта (процесу)
+
+    The shared client is recreated on the next request when the setting changes.
+    """
+    global _http2
+    http2 = bool(http2)
+    if http2 != _http2:
+        _http2 = http2
+        close()
+
+
+def _httpx_client():
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _lock:
+            if _client is None or _client_pid != os.getpid():
+                http2 = _http2 and http2_available()
+                if _http2 and not http2:
+                    _logger.warning('KSeF HTTP/2 requested but h2 is not installed, using HTTP/1.1')
+                _client = httpx.Client(
+                    http2=http2,
+                    limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+                    timeout=DEFAULT_TIMEOUT,
+                )
+                _client_pid = os.getpid()
+                _logger.info(f'KSeF HTTP client: httpx, HTTP/2 {"enabled" if http2 else "disabled"}')
+    return _client
+
+
+def _requests_session():
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        import requests
+
+        session = _sessions.session = requests.Session()
+    return session
+
+
+def request(method: str, url: str, **kwargs):
+    """requests.request() compatible call through the shared pool"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    if httpx is None:
+        return _requests_session().request(method, url, **kwargs)
+
+    data = kwargs.pop('data', None)
+    if isinstance(data, dict):
+        kwargs['data'] = data
+    elif data is not None:
+        if isinstance(data, (bytes, str)) or not hasattr(data, '__len__'):
+            kwargs['content'] = data
+        else:
+            # Sized streaming body (e.g. the encrypted invoice): keep Content-Length instead of chunking
+            headers = dict(kwargs.get('headers') or {})
+            headers.setdefault('Content-Length', str(len(data)))
+            kwargs['headers'] = headers
+            kwargs['content'] = iter(data)
+    return _httpx_client().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def close():
+    """Closes the shared connections (they are reopened on the next request)"""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
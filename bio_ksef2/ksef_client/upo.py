@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""UPO (Urzędowe Poświadczenie Odbioru) parsing for KSeF sessions"""
+from typing import Dict, List
+from xml.etree import ElementTree
+
+
+def session_upo_documents(upo_content: bytes) -> List[Dict[str, str]]:
+    """
+    Перелічує інвойси, підтверджені сторінкою UPO сесії
+
+    The page is only read: its XAdES signature covers the whole page, so the
+    page itself (unchanged) is the receipt attached to each listed invoice.
+
+    Args:
+        upo_content: XML сторінки UPO сесії
+
+    Returns:
+        Список словників:
+            {
+                'ksef_number': str,     # NumerKSeFDokumentu
+                'invoice_number': str,  # NumerFaktury
+            }
+    """
+    root = ElementTree.fromstring(upo_content)
+    namespace = root.tag[1:].partition('}')[0] if root.tag.startswith('{') else ''
+    prefix = f'{{{namespace}}}' if namespace else ''
+
+    return [
+        {
+            'ksef_number': document.findtext(f'{prefix}NumerKSeFDokumentu'),
+            'invoice_number': document.findtext(f'{prefix}NumerFaktury'),
+        }
+        for document in root.iterfind(f'{prefix}Dokument')
+    ]
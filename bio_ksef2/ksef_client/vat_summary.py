@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Exact per-rate VAT summary (P_13_x / P_14_x / P_14_xW) in integer grosze"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List
+
+_HUNDRED = Decimal(100)
+_ONE = Decimal(1)
+
+# Line amounts are converted to grosze one by one before they are added.
+# Float noise below this (in units, not grosze) is dropped before ROUND_HALF_UP,
+# so e.g. 15.694999999999999 is treated as 15.695 and rounded up.
+_FLOAT_DIGITS = 6
+_FLOAT_NOISE = 10 ** (2 - _FLOAT_DIGITS)  # the same threshold in grosze
+
+
+class VatTotal:
+    """Net/VAT/gross sums of one VAT rate, in grosze"""
+    __slots__ = ('vat_rate', 'net', 'vat', 'gross')
+
+    def __init__(self, vat_rate: Any = None, net: int = 0, vat: int = 0, gross: int = 0):
+        self.vat_rate = vat_rate
+        self.net = net
+        self.vat = vat
+        self.gross = gross
+
+    def vat_pln(self, currency_rate: Any) -> int:
+        """P_14_xW - VAT przeliczony na PLN, zaokrąglony raz dla całej stawki"""
+        return int((self.vat * Decimal(str(currency_rate))).quantize(_ONE, ROUND_HALF_UP))
+
+
+def to_grosze(amount: Any) -> int:
+    """Kwota (float/Decimal/int/str) -> grosze, ROUND_HALF_UP"""
+    if not amount:
+        return 0
+    if isinstance(amount, float):
+        scaled = amount * 100
+        nearest = round(scaled)
+        if abs(scaled - nearest) < _FLOAT_NOISE:
+            # Whole grosze up to float noise (the usual case for Odoo amounts)
+            return nearest
+        amount = round(amount, _FLOAT_DIGITS)
+    return int((Decimal(str(amount)) * _HUNDRED).quantize(_ONE, ROUND_HALF_UP))
+
+
+def format_grosze(grosze: int) -> str:
+    """Grosze -> '1234.56' (formatting of P_13_x/P_14_x/P_15)"""
+    sign = '-' if grosze < 0 else ''
+    whole, cents = divmod(abs(grosze), 100)
+    return f'{sign}{whole}.{cents:02d}'
+
+
+def summarize_lines(lines: Iterable[Dict[str, Any]]) -> Dict[Any, VatTotal]:
+    """
+    Підраховує підсумки за ставками ПДВ одного інвойсу (в валюті документа)
+
+    Every line amount is converted to grosze before it is added, so the totals
+    are exact integer sums of the (already rounded) line amounts.
+
+    Args:
+        lines: Рядки інвойсу (net_amount, vat_amount, gross_amount, vat_rate)
+
+    Returns:
+        {vat_rate: VatTotal} у порядку першої появи ставки
+    """
+    return summarize_invoices({None: lines})[None]
+
+
+def summarize_invoices(lines_by_invoice: Dict[Any, Iterable[Dict[str, Any]]]) -> Dict[Any, Dict[Any, VatTotal]]:
+    """
+    Підраховує підсумки за ставками ПДВ для пакету інвойсів за один прохід
+
+    Args:
+        lines_by_invoice: {invoice_key: рядки інвойсу}
+
+    Returns:
+        {invoice_key: {vat_rate: VatTotal}} - every key, also for invoices without lines
+    """
+    summaries = {}
+    for key, lines in lines_by_invoice.items():
+        summary = summaries[key] = {}
+        for line in lines:
+            get = line.get
+            vat_rate = get('vat_rate', 23)
+            total = summary.get(vat_rate)
+            if total is None:
+                total = summary[vat_rate] = VatTotal(vat_rate)
+            total.net += to_grosze(get('net_amount'))
+            total.vat += to_grosze(get('vat_amount'))
+            total.gross += to_grosze(get('gross_amount'))
+    return summaries
+
+
+def sum_totals(summary: Dict[Any, VatTotal]) -> VatTotal:
+    """Sums all rates of one invoice into a single VatTotal (vat_rate=None)"""
+    result = VatTotal()
+    for total in summary.values():
+        result.net += total.net
+        result.vat += total.vat
+        result.gross += total.gross
+    return result
+
+
+def check_amount_total(summary: Dict[Any, VatTotal], amount_total: Any) -> int:
+    """
+    Порівнює суму брутто за ставками з amount_total інвойсу
+
+    Returns:
+        Різниця amount_total - sum(gross) в грошах (0 = узгоджено)
+    """
+    return to_grosze(amount_total) - sum(total.gross for total in summary.values())
+
+
+def inconsistent_invoices(summaries: Dict[Any, Dict[Any, VatTotal]],
+                          amount_totals: Dict[Any, Any]) -> List[Any]:
+    """Keys of invoices whose per-rate gross sum differs from amount_total"""
+    return [
+        key for key, summary in summaries.items()
+        if key in amount_totals and check_amount_total(summary, amount_totals[key])
+    ]
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""HTML visualization of FA invoices with the styl.xsl stylesheets"""
+import glob
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # lxml ships with Odoo; without it nothing is rendered
+    etree = None
+
+_logger = logging.getLogger(__name__)
+
+_thread_transforms = threading.local()
+
+# Stylesheets (docs/FA3/styl.xsl, docs/FA2/styl.local.xsl) are matched by the form
+# namespace bound to the tns prefix; imported common templates
+# (docs/MF/WspolneSzablonyWizualizacji_v12-0E.local.xsl) by file name. Nothing is
+# fetched from crd.gov.pl: a stylesheet importing a file missing here fails to compile.
+STYLESHEET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs')
+
+# Non-official local substitutes (X.local.xsl replaces X.xsl); an official
+# X.xsl placed next to it wins
+LOCAL_STUB_SUFFIX = '.local.xsl'
+
+
+@lru_cache(maxsize=None)
+def _local_stylesheets() -> Dict[str, Dict[str, str]]:
+    """
+    {'namespaces': {form namespace: path}, 'files': {file name: path},
+     'local': [paths of the local substitutes in use]} for STYLESHEET_DIR
+    """
+    official = {'namespaces': {}, 'files': {}}
+    local = {'namespaces': {}, 'files': {}}
+    for path in sorted(glob.glob(os.path.join(STYLESHEET_DIR, '**', '*.xsl'), recursive=True)):
+        try:
+            _, root = next(etree.iterparse(path, events=('start',)))
+        except etree.XMLSyntaxError as e:
+            _logger.warning(f'Skipping unreadable stylesheet {path}: {e}')
+            continue
+        name = os.path.basename(path)
+        stylesheets = official
+        if name.endswith(LOCAL_STUB_SUFFIX):
+            stylesheets = local
+            name = name[:-len(LOCAL_STUB_SUFFIX)] + '.xsl'
+        namespace = root.nsmap.get('tns')
+        if namespace:
+            stylesheets['namespaces'].setdefault(namespace, path)
+        else:
+            stylesheets['files'].setdefault(name, path)
+
+    result = {'local': []}
+    for key in ('namespaces', 'files'):
+        result[key] = dict(local[key], **official[key])
+        result['local'] += [path for name, path in local[key].items() if name not in official[key]]
+    return result
+
+
+def local_stylesheets() -> List[str]:
+    """File names of the non-official local substitutes used instead of official stylesheets"""
+    if etree is None:
+        return []
+    return sorted(os.path.basename(path) for path in _local_stylesheets()['local'])
+
+
+def get_transform(namespace: str) -> Optional[Any]:
+    """
+    Повертає скомпільований styl.xsl для простору імен FA
+
+    The stylesheet is compiled once per thread and reused for every document
+    (XSLT objects are not shared between threads). A stylesheet that cannot be
+    compiled is logged as an error and remembered as None.
+
+    Returns:
+        lxml.etree.XSLT або None
+    """
+    if etree is None or not namespace:
+        return None
+
+    transforms = getattr(_thread_transforms, 'transforms', None)
+    if transforms is None:
+        transforms = _thread_transforms.transforms = {}
+    if namespace not in transforms:
+        transforms[namespace] = _compile_transform(namespace)
+    return transforms[namespace]
+
+
+def render_html(content: bytes) -> Optional[bytes]:
+    """
+    Генерує HTML-візуалізацію інвойсу FA
+
+    Args:
+        content: XML інвойсу (UTF-8 bytes)
+
+    Returns:
+        HTML (UTF-8 bytes) або None у випадку помилки
+    """
+    if etree is None:
+        return None
+
+    try:
+        document = etree.fromstring(content, parser=etree.XMLParser(resolve_entities=False, no_network=True))
+    except etree.XMLSyntaxError as e:
+        _logger.error(f'Cannot render invoice visualization, invalid XML: {e}')
+        return None
+
+    namespace = etree.QName(document).namespace
+    transform = get_transform(namespace)
+    if transform is None:
+        _logger.error(f'Cannot render invoice visualization, no stylesheet for {namespace}')
+        return None
+
+    try:
+        return bytes(transform(document))
+    except etree.XSLTApplyError as e:
+        _logger.error(f'Invoice visualization failed: {e}')
+        return None
+
+
+def render_batch(contents: List[bytes]) -> List[Optional[bytes]]:
+    """
+    Генерує HTML для пакету інвойсів
+
+    Rendered in the calling thread (no process pool inside an Odoo worker);
+    all documents of a namespace reuse the styl.xsl compiled once per thread.
+
+    Returns:
+        Список результатів render_html() у тому ж порядку
+    """
+    return [render_html(content) for content in contents]
+
+
+def warm_transforms():
+    """Compiles every local stylesheet (Odoo worker start-up)"""
+    if etree is None:
+        return
+    for namespace in _local_stylesheets()['namespaces']:
+        get_transform(namespace)
+
+
+def _compile_transform(namespace: str) -> Optional[Any]:
+    path = _local_stylesheets()['namespaces'].get(namespace)
+    if not path:
+        _logger.error(f'No local styl.xsl for {namespace} in {STYLESHEET_DIR}')
+        return None
+
+    files = _local_stylesheets()['files']
+    local = set(_local_stylesheets()['local'])
+    used_local = [path] if path in local else []
+
+    class LocalResolver(etree.Resolver):
+        def resolve(self, url, pubid, context):
+            local_path = files.get(url.rpartition('/')[2])
+            if local_path:
+                if local_path in local:
+                    used_local.append(local_path)
+                return self.resolve_filename(local_path, context)
+            return None
+
+    parser = etree.XMLParser(no_network=True)
+    parser.resolvers.add(LocalResolver())
+    try:
+        transform = etree.XSLT(etree.parse(path, parser=parser))
+    except (etree.XSLTParseError, etree.XMLSyntaxError, OSError) as e:
+        _logger.error(f'Failed to compile stylesheet {path} for {namespace}: {e}')
+        return None
+    if used_local:
+        names = ', '.join(sorted({os.path.basename(local_path) for local_path in used_local}))
+        _logger.warning(f'Visualization of {namespace} uses non-official local stylesheets ({names})')
+    return transform
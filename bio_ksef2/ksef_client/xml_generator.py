@@ -1,7 +1,96 @@
 # -*- coding: utf-8 -*-
 """Extended Invoice XML Generator for KSeF"""
+import base64
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional
+
+from .vat_summary import format_grosze, summarize_lines
+
+_logger = logging.getLogger(__name__)
+
+# FA(2) vs FA(3) are DIFFERENT schemas with different namespaces!
+# FA(2): http://crd.gov.pl/wzor/2023/06/29/12648/ - WariantFormularza=2
+# FA(3): http://crd.gov.pl/wzor/2025/06/25/13775/ - WariantFormularza=3 (not deployed in KSeF yet)
+# (namespace, kodSystemowy, WariantFormularza, wersjaSchemy)
+FORMAT_PARAMS = {
+    'FA2': ('http://crd.gov.pl/wzor/2023/06/29/12648/', 'FA (2)', '2', '1-0E'),
+    'FA3': ('http://crd.gov.pl/wzor/2025/06/25/13775/', 'FA (3)', '3', '1-0E'),
+}
+
+# EU member states (other than PL) - KodUE/NrVatUE buyers and WDT detection
+EU_COUNTRIES = frozenset((
+    'AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR', 'DE', 'GR', 'HU',
+    'IE', 'IT', 'LV', 'LT', 'LU', 'MT', 'NL', 'PT', 'RO', 'SK', 'SI', 'ES', 'SE',
+))
+
+# VAT rate -> (P_13_x, P_14_x, P_14_xW) summary fields
+# 0% is handled separately: P_13_6_2 for WDT, P_13_4 otherwise, no P_14_*
+VAT_RATE_FIELDS = {
+    23: ('P_13_1', 'P_14_1', 'P_14_1W'),
+    8: ('P_13_2', 'P_14_2', 'P_14_2W'),
+    5: ('P_13_3', 'P_14_3', 'P_14_3W'),
+}
+
+# DodatkowyOpis entries per line: (line key, Klucz, escape value)
+DODATKOWY_OPIS_FIELDS = (
+    ('customer_product_code', 'CustomerProductCode', True),
+    ('customer_product_name', 'CustomerProductName', True),
+    ('position_identifier', 'IdentyfikatorPozycji', False),  # CU/SER/RC - Auchan only
+    ('logistics_code', 'AktywnoscLogistyczna', True),
+)
+
+# Static Adnotacje blocks (P_19N for regular invoices, P_19/P_19A for WDT)
+_ADNOTACJE_HEAD = (
+    '        <Adnotacje>\n'
+    '            <P_16>2</P_16>\n'
+    '            <P_17>2</P_17>\n'
+    '            <P_18>2</P_18>\n'
+    '            <P_18A>2</P_18A>\n'
+    '            <Zwolnienie>\n'
+)
+_ADNOTACJE_TAIL = (
+    '\n'
+    '            </Zwolnienie>\n'
+    '            <NoweSrodkiTransportu>\n'
+    '                <P_22N>1</P_22N>\n'
+    '            </NoweSrodkiTransportu>\n'
+    '            <P_23>2</P_23>\n'
+    '            <PMarzy>\n'
+    '                <P_PMarzyN>1</P_PMarzyN>\n'
+    '            </PMarzy>\n'
+    '        </Adnotacje>'
+)
+_ADNOTACJE = _ADNOTACJE_HEAD + '                <P_19N>1</P_19N>' + _ADNOTACJE_TAIL
+_ADNOTACJE_WDT = (
+    _ADNOTACJE_HEAD
+    + '                <P_19>1</P_19>\n'
+    + '                <P_19A>art. 42 ust. 1 ustawy</P_19A>'
+    + _ADNOTACJE_TAIL
+)
+
+# Part of fa_vat_xml_cache_key() - bump when the generated XML changes for the
+# same invoice_data, so XML cached by older versions is rendered again
+XML_CACHE_VERSION = 1
+
+# Batches smaller than this are rendered in-process (pool start-up costs more)
+BATCH_MIN_PARALLEL = 32
+
+# iter_fa_vat_xml_chunks() chunk size (characters)
+XML_CHUNK_SIZE = 64 * 1024
+
+_XML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;',
+})
 
 
 def generate_fa_vat_xml(invoice_data: Dict[str, Any], format_version: str = 'FA2') -> str:
@@ -54,186 +143,279 @@ def generate_fa_vat_xml(invoice_data: Dict[str, Any], format_version: str = 'FA2
     Returns:
         XML рядок інвойсу FA_VAT
     """
+    return '\n'.join(_iter_fa_vat_parts(invoice_data, format_version))
+
+
+def iter_fa_vat_xml_chunks(invoice_data: Dict[str, Any], format_version: str = 'FA2',
+                           chunk_size: int = XML_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Генерує XML інвойсу FA_VAT частинами в кодуванні UTF-8
+
+    Concatenated chunks are byte-identical to generate_fa_vat_xml(...).encode('utf-8'),
+    but only about chunk_size characters are held at a time, so 20,000+ line
+    invoices can be fed straight into InvoiceSession.send_invoice().
+
+    Args:
+        invoice_data: Словник з даними інвойсу (див. generate_fa_vat_xml)
+        format_version: Версія формату ('FA2' або 'FA3')
+        chunk_size: Приблизний розмір частини в символах
+
+    Yields:
+        bytes - частини XML документа
+    """
+    buffer = []
+    buffered = 0
+    for part in _iter_fa_vat_parts(invoice_data, format_version):
+        if buffered >= chunk_size:
+            # Trailing '' keeps the separator between this chunk and the next part
+            buffer.append('')
+            yield '\n'.join(buffer).encode('utf-8')
+            buffer = []
+            buffered = 0
+        buffer.append(part)
+        buffered += len(part)
+    yield '\n'.join(buffer).encode('utf-8')
+
+
+def fa_vat_xml_cache_key(invoice_data: Dict[str, Any], format_version: str = 'FA2') -> str:
+    """
+    Стабільний ключ кешу XML: SHA-256 канонічного JSON invoice_data + format_version
+
+    DataWytworzeniaFa is not part of invoice_data, so re-rendering the same data
+    gives the same key even though the timestamp inside the XML would differ.
+    """
+    payload = json.dumps(
+        [XML_CACHE_VERSION, format_version, invoice_data],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generate_fa_vat_xml_batch(invoices: List[Dict[str, Any]], format_version: str = 'FA2',
+                              max_workers: Optional[int] = None, chunksize: Optional[int] = None,
+                              mp_context=None) -> List[Dict[str, Any]]:
+    """
+    Генерує XML для пакету інвойсів паралельно в кількох процесах
+
+    Only the plain invoice_data dicts are pickled to the workers (never ORM
+    records); each worker returns the UTF-8 XML together with its SHA-256 and
+    size, so send_invoice()/attachments don't have to hash or encode it again.
+
+    Args:
+        invoices: Список invoice_data (див. generate_fa_vat_xml)
+        format_version: Версія формату ('FA2' або 'FA3')
+        max_workers: Кількість процесів (за замовчуванням os.cpu_count())
+        chunksize: Кількість інвойсів на одне завдання процесу
+                   (за замовчуванням ~4 завдання на процес)
+        mp_context: multiprocessing context для ProcessPoolExecutor
+
+    Returns:
+        Список у тому ж порядку, що й invoices:
+            {
+                'content': bytes,      # XML (UTF-8), None якщо помилка
+                'sha256': str,         # base64 SHA-256 (invoiceHash)
+                'size': int,           # розмір у байтах (invoiceSize)
+                'error': str,          # None або текст помилки генерації
+            }
+    """
+    if not invoices:
+        return []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(invoices) < BATCH_MIN_PARALLEL:
+        return _render_batch(invoices, format_version)
+
+    if not chunksize:
+        chunksize = max(1, len(invoices) // (max_workers * 4))
+    chunks = [invoices[start:start + chunksize] for start in range(0, len(invoices), chunksize)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        for chunk_results in executor.map(_render_batch, chunks, [format_version] * len(chunks)):
+            results.extend(chunk_results)
+    return results
+
+
+def _render_batch(invoices: List[Dict[str, Any]], format_version: str) -> List[Dict[str, Any]]:
+    """Worker: renders, encodes and hashes a chunk of invoices"""
+    results = []
+    for invoice_data in invoices:
+        try:
+            content = generate_fa_vat_xml(invoice_data, format_version).encode('utf-8')
+        except Exception as e:
+            _logger.error(f'Failed to generate XML for {invoice_data.get("invoice_number")}: {e}')
+            results.append({'content': None, 'sha256': None, 'size': 0, 'error': str(e)})
+            continue
+        results.append({
+            'content': content,
+            'sha256': base64.b64encode(hashlib.sha256(content).digest()).decode('utf-8'),
+            'size': len(content),
+            'error': None,
+        })
+    return results
+
+
+def _iter_fa_vat_parts(invoice_data: Dict[str, Any], format_version: str) -> Iterator[str]:
+    """Yields XML fragments of the invoice; '\n'.join() of them is the whole document"""
 
     # DataWytworzeniaFa потребує DateTime
     creation_datetime = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
 
     # Визначаємо параметри формату
-    # FA(2) vs FA(3) are DIFFERENT schemas with different namespaces!
-    # FA(2): http://crd.gov.pl/wzor/2023/06/29/12648/ - WariantFormularza=2
-    # FA(3): http://crd.gov.pl/wzor/2025/06/25/13775/ - WariantFormularza=3 (not deployed in KSeF yet)
+    # FA(3): Real FA(3) schema (mandatory from Sept 1, 2025)
+    # WARNING: Not yet deployed in KSeF as of January 2026
     #
     # IMPORTANT: DodatkowyOpis is NOT supported in either FA(2) or FA(3)!
     # KSeF validation error proves this: "List of possible elements expected: P_12_XII, P_12_Zal_15,
     # KwotaAkcyzy, GTU, Procedura, KursWaluty, StanPrzed" - DodatkowyOpis is not in this list!
+    is_fa3 = format_version == 'FA3'
+    namespace, kod_systemowy, wariant, wersja_schemy = FORMAT_PARAMS['FA3' if is_fa3 else 'FA2']
 
-    if format_version == 'FA3':
-        # Real FA(3) schema (mandatory from Sept 1, 2025)
-        # WARNING: Not yet deployed in KSeF as of January 2026
-        namespace = 'http://crd.gov.pl/wzor/2025/06/25/13775/'
-        kod_systemowy = 'FA (3)'  # Based on schema pattern (FA(2) uses "FA (2)")
-        wariant = '3'
-        wersja_schemy = '1-0E'
-    else:
-        # FA(2) - Current schema (valid until Aug 31, 2025)
-        namespace = 'http://crd.gov.pl/wzor/2023/06/29/12648/'
-        kod_systemowy = 'FA (2)'
-        wariant = '2'
-        wersja_schemy = '1-0E'
+    escape = _escape_xml
+    clean_nip = _clean_nip
+    format_rate = _format_currency_rate
 
     # Початок XML
-    xml_parts = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        f'<Faktura xmlns="{namespace}">',
-        '    <Naglowek>',
-        f'        <KodFormularza kodSystemowy="{kod_systemowy}" wersjaSchemy="{wersja_schemy}">FA</KodFormularza>',
-        f'        <WariantFormularza>{wariant}</WariantFormularza>',
-        f'        <DataWytworzeniaFa>{creation_datetime}</DataWytworzeniaFa>',
-        '        <SystemInfo>Odoo KSeF Integration</SystemInfo>',
-        '    </Naglowek>',
-    ]
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<Faktura xmlns="{namespace}">\n'
+        '    <Naglowek>\n'
+        f'        <KodFormularza kodSystemowy="{kod_systemowy}" wersjaSchemy="{wersja_schemy}">FA</KodFormularza>\n'
+        f'        <WariantFormularza>{wariant}</WariantFormularza>\n'
+        f'        <DataWytworzeniaFa>{creation_datetime}</DataWytworzeniaFa>\n'
+        '        <SystemInfo>Odoo KSeF Integration</SystemInfo>\n'
+        '    </Naglowek>'
+    )
 
     # Продавець (Podmiot1)
-    seller = invoice_data['seller']
-    xml_parts.append('    <Podmiot1>')
-
     # PrefiksPodatnika - only for specific EU VAT cases (art. 97 ust. 10 pkt 2 i 3)
-    # Not needed for standard Polish sellers
     # TODO: Add PrefiksPodatnika only when required by specific regulations
-
-    xml_parts.extend([
-        f'       <PrefiksPodatnika>{seller.get("country", "PL")}</PrefiksPodatnika>',
-        '        <DaneIdentyfikacyjne>',
-        f'            <NIP>{_clean_nip(seller["nip"])}</NIP>',
-        f'            <Nazwa>{_escape_xml(seller["name"])}</Nazwa>',
-        '        </DaneIdentyfikacyjne>',
-        '        <Adres>',
-        f'            <KodKraju>{seller.get("country", "PL")}</KodKraju>',
-        f'            <AdresL1>{_escape_xml(seller.get("street", ""))}</AdresL1>',
-        f'            <AdresL2>{seller.get("zip", "")} {_escape_xml(seller.get("city", ""))}</AdresL2>',
-    ])
+    seller = invoice_data['seller']
+    seller_country = seller.get("country", "PL")
+    yield (
+        '    <Podmiot1>\n'
+        f'       <PrefiksPodatnika>{seller_country}</PrefiksPodatnika>\n'
+        '        <DaneIdentyfikacyjne>\n'
+        f'            <NIP>{clean_nip(seller["nip"])}</NIP>\n'
+        f'            <Nazwa>{escape(seller["name"])}</Nazwa>\n'
+        '        </DaneIdentyfikacyjne>\n'
+        '        <Adres>\n'
+        f'            <KodKraju>{seller_country}</KodKraju>\n'
+        f'            <AdresL1>{escape(seller.get("street", ""))}</AdresL1>\n'
+        f'            <AdresL2>{seller.get("zip", "")} {escape(seller.get("city", ""))}</AdresL2>'
+    )
 
     # GLN - optional, only if provided
     if seller.get("gln"):
-        xml_parts.append(f'            <GLN>{seller["gln"]}</GLN>')
+        yield f'            <GLN>{seller["gln"]}</GLN>'
 
-    xml_parts.extend([
-        '        </Adres>',
-        '    </Podmiot1>',
-    ])
+    yield '        </Adres>\n    </Podmiot1>'
 
     # Покупець (Podmiot2)
     buyer = invoice_data['buyer']
     buyer_country = buyer.get("country", "PL")
     buyer_nip = buyer.get("nip", "")
 
-    # List of EU countries for VAT-UE format
-    eu_countries = ['AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR', 'DE', 'GR', 'HU', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT', 'NL', 'PT', 'RO', 'SK', 'SI', 'ES', 'SE']
+    # Determine if this is WDT (intra-EU supply) invoice
+    # WDT = buyer from EU (not PL) + 0% VAT rate
+    is_wdt = buyer_country != 'PL' and buyer_country in EU_COUNTRIES
 
-    xml_parts.extend([
-        '    <Podmiot2>',
-        '        <DaneIdentyfikacyjne>',
-    ])
+    yield '    <Podmiot2>\n        <DaneIdentyfikacyjne>'
 
     # For EU buyers (not Poland), use KodUE + NrVatUE structure
-    if buyer_country != 'PL' and buyer_country in eu_countries and buyer_nip:
+    if is_wdt and buyer_nip:
         # Remove country prefix from VAT number (e.g., LT123456789 -> 123456789)
-        clean_vat = _clean_nip(buyer_nip)
-        xml_parts.extend([
-            f'            <KodUE>{buyer_country}</KodUE>',
-            f'            <NrVatUE>{clean_vat}</NrVatUE>',
-        ])
+        yield (
+            f'            <KodUE>{buyer_country}</KodUE>\n'
+            f'            <NrVatUE>{clean_nip(buyer_nip)}</NrVatUE>'
+        )
     elif buyer_country == 'PL' and buyer_nip:
         # Polish buyer - use NIP
-        xml_parts.append(f'            <NIP>{_clean_nip(buyer_nip)}</NIP>')
+        yield f'            <NIP>{clean_nip(buyer_nip)}</NIP>'
     elif buyer_nip:
         # Non-EU buyer with tax ID - use KodKraju + NrID
-        xml_parts.extend([
-            f'            <KodKraju>{buyer_country}</KodKraju>',
-            f'            <NrID>{_clean_nip(buyer_nip)}</NrID>',
-        ])
+        yield (
+            f'            <KodKraju>{buyer_country}</KodKraju>\n'
+            f'            <NrID>{clean_nip(buyer_nip)}</NrID>'
+        )
     else:
         # No tax ID
-        xml_parts.append('            <BrakID>1</BrakID>')
+        yield '            <BrakID>1</BrakID>'
 
-    xml_parts.extend([
-        f'            <Nazwa>{_escape_xml(buyer["name"])}</Nazwa>',
-        '        </DaneIdentyfikacyjne>',
-        '        <Adres>',
-        f'            <KodKraju>{buyer_country}</KodKraju>',
-        f'            <AdresL1>{_escape_xml(buyer.get("street", ""))}</AdresL1>',
-        f'            <AdresL2>{buyer.get("zip", "")} {_escape_xml(buyer.get("city", ""))}</AdresL2>',
-    ])
+    yield (
+        f'            <Nazwa>{escape(buyer["name"])}</Nazwa>\n'
+        '        </DaneIdentyfikacyjne>\n'
+        '        <Adres>\n'
+        f'            <KodKraju>{buyer_country}</KodKraju>\n'
+        f'            <AdresL1>{escape(buyer.get("street", ""))}</AdresL1>\n'
+        f'            <AdresL2>{buyer.get("zip", "")} {escape(buyer.get("city", ""))}</AdresL2>'
+    )
 
     # GLN - optional, only if provided
     if buyer.get("gln"):
-        xml_parts.append(f'            <GLN>{buyer["gln"]}</GLN>')
+        yield f'            <GLN>{buyer["gln"]}</GLN>'
 
-    xml_parts.append('        </Adres>')
+    yield '        </Adres>'
 
     # FA(3) requires JST and GV fields in Podmiot2 (mandatory!)
     # JST - Jednostka Samorządu Terytorialnego (territorial self-government unit)
     # GV - Grupa VAT (VAT group member)
     # Values: 1 = Yes, 2 = No
-    if format_version == 'FA3':
-        xml_parts.extend([
-            '        <JST>2</JST>',  # 2 = Not for JST distribution
-            '        <GV>2</GV>',    # 2 = Not a VAT group member
-        ])
+    if is_fa3:
+        yield (
+            '        <JST>2</JST>\n'  # 2 = Not for JST distribution
+            '        <GV>2</GV>'      # 2 = Not a VAT group member
+        )
 
-    xml_parts.append('    </Podmiot2>')
+    yield '    </Podmiot2>'
 
     # Podmiot3 - Third party (delivery address if different from buyer)
     # Rola = 2 means "Odbiorca" (receiver/delivery recipient)
     delivery = invoice_data.get('delivery_address')
     if delivery:
-        xml_parts.extend([
-            '    <Podmiot3>',
-            '        <DaneIdentyfikacyjne>',
-        ])
+        yield '    <Podmiot3>\n        <DaneIdentyfikacyjne>'
 
         # If delivery has tax ID (NIP or VAT), use it; otherwise use BrakID
         delivery_nip = delivery.get('nip', '')
         if delivery_nip:
-            xml_parts.append(f'            <NIP>{_clean_nip(delivery_nip)}</NIP>')
+            yield f'            <NIP>{clean_nip(delivery_nip)}</NIP>'
         else:
-            xml_parts.append('            <BrakID>1</BrakID>')
+            yield '            <BrakID>1</BrakID>'
 
-        xml_parts.extend([
-            f'            <Nazwa>{_escape_xml(delivery["name"])}</Nazwa>',
-            '        </DaneIdentyfikacyjne>',
-            '        <Adres>',
-            f'            <KodKraju>{delivery.get("country", "PL")}</KodKraju>',
-            f'            <AdresL1>{_escape_xml(delivery.get("street", ""))}</AdresL1>',
-            f'            <AdresL2>{delivery.get("zip", "")} {_escape_xml(delivery.get("city", ""))}</AdresL2>',
-        ])
+        yield (
+            f'            <Nazwa>{escape(delivery["name"])}</Nazwa>\n'
+            '        </DaneIdentyfikacyjne>\n'
+            '        <Adres>\n'
+            f'            <KodKraju>{delivery.get("country", "PL")}</KodKraju>\n'
+            f'            <AdresL1>{escape(delivery.get("street", ""))}</AdresL1>\n'
+            f'            <AdresL2>{delivery.get("zip", "")} {escape(delivery.get("city", ""))}</AdresL2>'
+        )
 
         # GLN (Global Location Number) - optional
         if delivery.get('gln'):
-            xml_parts.append(f'            <GLN>{delivery["gln"]}</GLN>')
-
-        xml_parts.extend([
-            '        </Adres>',
-            '        <Rola>2</Rola>',  # 2 = Odbiorca (receiver/delivery recipient)
-            '    </Podmiot3>',
-        ])
-
-
-    # Дані факту��и (Fa)
-    xml_parts.extend([
-        '    <Fa>',
-        f'        <KodWaluty>{invoice_data.get("currency", "PLN")}</KodWaluty>',
-        f'        <P_1>{invoice_data["issue_date"]}</P_1>',
-        f'        <P_2>{_escape_xml(invoice_data["invoice_number"])}</P_2>',
-    ])
+            yield f'            <GLN>{delivery["gln"]}</GLN>'
+
+        yield (
+            '        </Adres>\n'
+            '        <Rola>2</Rola>\n'  # 2 = Odbiorca (receiver/delivery recipient)
+            '    </Podmiot3>'
+        )
+
+    # Дані фактури (Fa)
+    yield (
+        '    <Fa>\n'
+        f'        <KodWaluty>{invoice_data.get("currency", "PLN")}</KodWaluty>\n'
+        f'        <P_1>{invoice_data["issue_date"]}</P_1>\n'
+        f'        <P_2>{escape(invoice_data["invoice_number"])}</P_2>'
+    )
 
     # WZ - Delivery note number (optional)
     # Must come AFTER P_2 and BEFORE P_6 per FA(3) schema
     delivery_note_number = invoice_data.get('delivery_note_number')
     if delivery_note_number:
-        xml_parts.append(f'        <WZ>{_escape_xml(delivery_note_number)}</WZ>')
+        yield f'        <WZ>{escape(delivery_note_number)}</WZ>'
 
-    xml_parts.append(f'        <P_6>{invoice_data["date_of_receipt_by_buyer"]}</P_6>')
+    yield f'        <P_6>{invoice_data["date_of_receipt_by_buyer"]}</P_6>'
 
     # Підсумки за ставками ПДВ
     # IMPORTANT: Amounts in P_13_*, P_14_*, P_15 must be in document currency (e.g., EUR)
@@ -241,97 +423,57 @@ def generate_fa_vat_xml(invoice_data: Dict[str, Any], format_version: str = 'FA2
     currency_rate = invoice_data.get('currency_rate', 1.0)
     is_foreign_currency = invoice_data.get('is_foreign_currency', False)
 
-    # Determine if this is WDT (intra-EU supply) invoice
-    # WDT = buyer from EU (not PL) + 0% VAT rate
-    eu_countries = ['AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR', 'DE', 'GR', 'HU', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT', 'NL', 'PT', 'RO', 'SK', 'SI', 'ES', 'SE']
-    is_wdt = buyer_country != 'PL' and buyer_country in eu_countries
-
     # Calculate VAT summary in document currency (NO conversion to PLN)
-    vat_summary = _calculate_vat_summary(invoice_data['lines'], currency_rate=None)
-
-    for vat_rate, amounts in vat_summary.items():
-        if vat_rate == 23:
-            xml_parts.append(f'        <P_13_1>{amounts["net"]:.2f}</P_13_1>')
-            xml_parts.append(f'        <P_14_1>{amounts["vat"]:.2f}</P_14_1>')
-            # P_14_1W - VAT amount converted to PLN (art. 106e ust. 11)
-            if is_foreign_currency:
-                vat_pln = amounts["vat"] * currency_rate
-                xml_parts.append(f'        <P_14_1W>{vat_pln:.2f}</P_14_1W>')
-        elif vat_rate == 8:
-            xml_parts.append(f'        <P_13_2>{amounts["net"]:.2f}</P_13_2>')
-            xml_parts.append(f'        <P_14_2>{amounts["vat"]:.2f}</P_14_2>')
-            # P_14_2W - VAT amount converted to PLN (art. 106e ust. 11)
-            if is_foreign_currency:
-                vat_pln = amounts["vat"] * currency_rate
-                xml_parts.append(f'        <P_14_2W>{vat_pln:.2f}</P_14_2W>')
-        elif vat_rate == 5:
-            xml_parts.append(f'        <P_13_3>{amounts["net"]:.2f}</P_13_3>')
-            xml_parts.append(f'        <P_14_3>{amounts["vat"]:.2f}</P_14_3>')
-            # P_14_3W - VAT amount converted to PLN (art. 106e ust. 11)
-            if is_foreign_currency:
-                vat_pln = amounts["vat"] * currency_rate
-                xml_parts.append(f'        <P_14_3W>{vat_pln:.2f}</P_14_3W>')
-        elif vat_rate == 0:
-            # Use P_13_6_2 for WDT (intra-EU supply), P_13_4 for other 0% cases
-            # No P_14_* fields for 0% VAT
-            if is_wdt:
-                xml_parts.append(f'        <P_13_6_2>{amounts["net"]:.2f}</P_13_6_2>')
-            else:
-                xml_parts.append(f'        <P_13_4>{amounts["net"]:.2f}</P_13_4>')
+    # Sums are exact integer grosze, each P_13_x/P_14_x/P_14_xW is rounded once per rate
+    vat_summary = summarize_lines(invoice_data['lines'])
+
+    # Rates are written in schema order (P_13_1 ... P_13_3, then P_13_6_x), not in
+    # the order they appear on the invoice lines
+    for vat_rate, fields in VAT_RATE_FIELDS.items():
+        total = vat_summary.get(vat_rate)
+        if total is None:
+            continue
+        net_field, vat_field, vat_pln_field = fields
+        yield f'        <{net_field}>{format_grosze(total.net)}</{net_field}>'
+        yield f'        <{vat_field}>{format_grosze(total.vat)}</{vat_field}>'
+        # P_14_xW - VAT amount converted to PLN (art. 106e ust. 11)
+        if is_foreign_currency:
+            yield f'        <{vat_pln_field}>{format_grosze(total.vat_pln(currency_rate))}</{vat_pln_field}>'
+
+    total = vat_summary.get(0)
+    if total is not None:
+        # Use P_13_6_2 for WDT (intra-EU supply), P_13_6_1 for domestic 0% supply
+        # (P_13_4/P_14_4 are the taxi flat rate). No P_14_* fields for 0% VAT
+        if is_wdt:
+            yield f'        <P_13_6_2>{format_grosze(total.net)}</P_13_6_2>'
+        else:
+            yield f'        <P_13_6_1>{format_grosze(total.net)}</P_13_6_1>'
 
     # Загальна сума (in document currency, e.g., EUR)
-    total_gross = invoice_data['total_gross']
-    xml_parts.append(f'        <P_15>{total_gross:.2f}</P_15>')
+    yield f'        <P_15>{invoice_data["total_gross"]:.2f}</P_15>'
 
     # Currency exchange rate (if foreign currency)
     if is_foreign_currency and currency_rate:
-        xml_parts.append(f'        <KursWalutyZ>{_format_currency_rate(currency_rate)}</KursWalutyZ>')
+        yield f'        <KursWalutyZ>{format_rate(currency_rate)}</KursWalutyZ>'
 
     # Adnotacje (обов'язкові анотації)
-    xml_parts.extend([
-        '        <Adnotacje>',
-        '            <P_16>2</P_16>',
-        '            <P_17>2</P_17>',
-        '            <P_18>2</P_18>',
-        '            <P_18A>2</P_18A>',
-        '            <Zwolnienie>',
-    ])
-
     # For WDT (intra-EU supply), indicate VAT exemption with legal basis
-    if is_wdt:
-        xml_parts.extend([
-            '                <P_19>1</P_19>',
-            '                <P_19A>art. 42 ust. 1 ustawy</P_19A>',
-        ])
-    else:
-        xml_parts.append('                <P_19N>1</P_19N>')
-
-    xml_parts.extend([
-        '            </Zwolnienie>',
-        '            <NoweSrodkiTransportu>',
-        '                <P_22N>1</P_22N>',
-        '            </NoweSrodkiTransportu>',
-        '            <P_23>2</P_23>',
-        '            <PMarzy>',
-        '                <P_PMarzyN>1</P_PMarzyN>',
-        '            </PMarzy>',
-        '        </Adnotacje>',
-    ])
+    yield _ADNOTACJE_WDT if is_wdt else _ADNOTACJE
 
     # Determine RodzajFaktury (invoice type)
     rodzaj_faktury = invoice_data.get('rodzaj_faktury', 'VAT')
-    xml_parts.append(f'        <RodzajFaktury>{rodzaj_faktury}</RodzajFaktury>')
+    yield f'        <RodzajFaktury>{rodzaj_faktury}</RodzajFaktury>'
 
     # Add credit note specific data (for KOR, KOR_ZAL, KOR_ROZ)
     if rodzaj_faktury in ('KOR', 'KOR_ZAL', 'KOR_ROZ'):
         # PrzyczynaKorekty - reason for correction
         correction_reason = invoice_data.get('correction_reason', '')
         if correction_reason:
-            xml_parts.append(f'        <PrzyczynaKorekty>{_escape_xml(correction_reason)}</PrzyczynaKorekty>')
+            yield f'        <PrzyczynaKorekty>{escape(correction_reason)}</PrzyczynaKorekty>'
 
         # TypKorekty - type of correction (1, 2, or 3)
         correction_type = invoice_data.get('correction_type', '2')
-        xml_parts.append(f'        <TypKorekty>{correction_type}</TypKorekty>')
+        yield f'        <TypKorekty>{correction_type}</TypKorekty>'
 
         # DaneFaKorygowanej - data of corrected invoice(s)
         # This is REQUIRED for KOR invoices!
@@ -343,64 +485,43 @@ def generate_fa_vat_xml(invoice_data: Dict[str, Any], format_version: str = 'FA2
             )
 
         for corrected_inv in corrected_invoices:
-            xml_parts.append('        <DaneFaKorygowanej>')
-            xml_parts.append(f'            <DataWystFaKorygowanej>{corrected_inv["date"]}</DataWystFaKorygowanej>')
-            xml_parts.append(f'            <NrFaKorygowanej>{_escape_xml(corrected_inv["number"])}</NrFaKorygowanej>')
+            yield (
+                '        <DaneFaKorygowanej>\n'
+                f'            <DataWystFaKorygowanej>{corrected_inv["date"]}</DataWystFaKorygowanej>\n'
+                f'            <NrFaKorygowanej>{escape(corrected_inv["number"])}</NrFaKorygowanej>'
+            )
 
             # Check if original invoice has KSeF number
             ksef_number = corrected_inv.get('ksef_number')
             if ksef_number:
                 # Invoice was in KSeF
-                xml_parts.append('            <NrKSeF>1</NrKSeF>')
-                xml_parts.append(f'            <NrKSeFFaKorygowanej>{ksef_number}</NrKSeFFaKorygowanej>')
+                yield (
+                    '            <NrKSeF>1</NrKSeF>\n'
+                    f'            <NrKSeFFaKorygowanej>{ksef_number}</NrKSeFFaKorygowanej>'
+                )
             else:
                 # Invoice was outside KSeF
-                xml_parts.append('            <NrKSeFN>1</NrKSeFN>')
+                yield '            <NrKSeFN>1</NrKSeFN>'
 
-            xml_parts.append('        </DaneFaKorygowanej>')
+            yield '        </DaneFaKorygowanej>'
 
     # DodatkowyOpis - Additional description fields (FA(3) only)
     # IMPORTANT: DodatkowyOpis is a child of <Fa>, NOT <FaWiersz>!
     # It must come AFTER RodzajFaktury/DaneFaKorygowanej and BEFORE FaWiersz
     # Uses NrWiersza to link to specific invoice line
-    if format_version == 'FA3':
-        for idx, line in enumerate(invoice_data['lines'], start=1):
-            # CustomerProductCode
-            if line.get('customer_product_code'):
-                xml_parts.extend([
-                    '        <DodatkowyOpis>',
-                    f'            <NrWiersza>{idx}</NrWiersza>',
-                    '            <Klucz>CustomerProductCode</Klucz>',
-                    f'            <Wartosc>{_escape_xml(line["customer_product_code"])}</Wartosc>',
-                    '        </DodatkowyOpis>',
-                ])
-            # CustomerProductName
-            if line.get('customer_product_name'):
-                xml_parts.extend([
-                    '        <DodatkowyOpis>',
-                    f'            <NrWiersza>{idx}</NrWiersza>',
-                    '            <Klucz>CustomerProductName</Klucz>',
-                    f'            <Wartosc>{_escape_xml(line["customer_product_name"])}</Wartosc>',
-                    '        </DodatkowyOpis>',
-                ])
-            # IdentyfikatorPozycji - Position identifier (CU/SER/RC) - Auchan only
-            if line.get('position_identifier'):
-                xml_parts.extend([
-                    '        <DodatkowyOpis>',
-                    f'            <NrWiersza>{idx}</NrWiersza>',
-                    '            <Klucz>IdentyfikatorPozycji</Klucz>',
-                    f'            <Wartosc>{line["position_identifier"]}</Wartosc>',
-                    '        </DodatkowyOpis>',
-                ])
-            # AktywnoscLogistyczna - Logistics activity code from delivery address
-            if line.get('logistics_code'):
-                xml_parts.extend([
-                    '        <DodatkowyOpis>',
-                    f'            <NrWiersza>{idx}</NrWiersza>',
-                    '            <Klucz>AktywnoscLogistyczna</Klucz>',
-                    f'            <Wartosc>{_escape_xml(line["logistics_code"])}</Wartosc>',
-                    '        </DodatkowyOpis>',
-                ])
+    lines = invoice_data['lines']
+    if is_fa3:
+        for idx, line in enumerate(lines, start=1):
+            for key, klucz, escaped in DODATKOWY_OPIS_FIELDS:
+                value = line.get(key)
+                if value:
+                    yield (
+                        '        <DodatkowyOpis>\n'
+                        f'            <NrWiersza>{idx}</NrWiersza>\n'
+                        f'            <Klucz>{klucz}</Klucz>\n'
+                        f'            <Wartosc>{escape(value) if escaped else value}</Wartosc>\n'
+                        '        </DodatkowyOpis>'
+                    )
 
     # Рядки товарів/послуг (FaWiersz)
     # Згідно з офіційним XSD:
@@ -410,130 +531,128 @@ def generate_fa_vat_xml(invoice_data: Dict[str, Any], format_version: str = 'FA2
     # P_10 - Wartość rabatów lub opustów (сума знижки, опціонально)
     # P_11 - Wartość sprzedaży netto (загальна сума після знижки без ПДВ)
     # P_12 - Stawka podatku (ставка ПДВ %)
-    for idx, line in enumerate(invoice_data['lines'], start=1):
-        xml_parts.extend([
-            '        <FaWiersz>',
-            f'            <NrWierszaFa>{idx}</NrWierszaFa>',
-            f'            <P_7>{_escape_xml(line["name"])}</P_7>',
-        ])
+    for idx, line in enumerate(lines, start=1):
+        get = line.get
+        yield (
+            '        <FaWiersz>\n'
+            f'            <NrWierszaFa>{idx}</NrWierszaFa>\n'
+            f'            <P_7>{escape(line["name"])}</P_7>'
+        )
 
         # Indeks - Internal product code/SKU
-        if line.get('index'):
-            xml_parts.append(f'            <Indeks>{_escape_xml(line["index"])}</Indeks>')
+        value = get('index')
+        if value:
+            yield f'            <Indeks>{escape(value)}</Indeks>'
 
         # GTIN - Product barcode (cleaned from trailing special chars)
-        if line.get('gtin'):
-            xml_parts.append(f'            <GTIN>{_escape_xml(line["gtin"])}</GTIN>')
+        value = get('gtin')
+        if value:
+            yield f'            <GTIN>{escape(value)}</GTIN>'
 
         # P_8A - Miara (одиниця виміру)
-        if line.get('unit'):
-            xml_parts.append(f'            <P_8A>{_escape_xml(line["unit"])}</P_8A>')
+        value = get('unit')
+        if value:
+            yield f'            <P_8A>{escape(value)}</P_8A>'
 
         # P_8B - Ilość (кількість)
-        if line.get('quantity'):
-            xml_parts.append(f'            <P_8B>{line["quantity"]:.2f}</P_8B>')
+        value = get('quantity')
+        if value:
+            yield f'            <P_8B>{value:.2f}</P_8B>'
 
         # P_9A - Cena jednostkowa netto (ціна за одиницю без ПДВ - оригінальна ціна)
-        if line.get('price_unit') is not None:
-            xml_parts.append(f'            <P_9A>{line["price_unit"]:.2f}</P_9A>')
+        value = get('price_unit')
+        if value is not None:
+            yield f'            <P_9A>{value:.2f}</P_9A>'
 
         # P_10 - Wartość rabatów lub opustów (сума знижок)
-        if line.get('discount_amount') and line['discount_amount'] > 0:
-            xml_parts.append(f'            <P_10>{line["discount_amount"]:.2f}</P_10>')
+        value = get('discount_amount')
+        if value and value > 0:
+            yield f'            <P_10>{value:.2f}</P_10>'
 
         # P_11 - Wartość sprzedaży netto (загальна сума після знижки без ПДВ)
-        xml_parts.append(f'            <P_11>{line["net_amount"]:.2f}</P_11>')
+        yield f'            <P_11>{line["net_amount"]:.2f}</P_11>'
 
         # P_12 - Stawka podatku (ставка ПДВ %)
-        if line.get('vat_rate') is not None:
-            xml_parts.append(f'            <P_12>{line["vat_rate"]}</P_12>')
+        value = get('vat_rate')
+        if value is not None:
+            yield f'            <P_12>{value}</P_12>'
 
-        # TODO: P_12_XII - dla procedur z art. 12 ust. 12 (optional)
-        # TODO: P_12_Zal_15 - dla procedur z załącznika nr 15 (optional)
-        # TODO: KwotaAkcyzy - excise tax amount (optional)
-        # TODO: GTU - GTU codes (optional, can be multiple)
+        # TODO: P_12_XII, P_12_Zal_15, KwotaAkcyzy, GTU (optional)
 
         # Procedura - Special procedures (optional)
         # NOTE: WDT (intra-EU supply) does NOT use Procedura field
         # Valid values: WSTO_EE, IED, TT_D, I_42, I_63, B_SPV, B_SPV_DOSTAWA, B_MPV_PROWIZJA
         # IMPORTANT: Must come AFTER P_12/GTU and BEFORE KursWaluty according to XSD sequence
-        if line.get('procedure'):
-            xml_parts.append(f'            <Procedura>{line["procedure"]}</Procedura>')
+        value = get('procedure')
+        if value:
+            yield f'            <Procedura>{value}</Procedura>'
 
         # KursWaluty - Курс валюти (для іноземної валюти)
         # IMPORTANT: Must come AFTER Procedura and BEFORE StanPrzed according to XSD sequence
-        if line.get('currency_rate'):
-            xml_parts.append(f'            <KursWaluty>{_format_currency_rate(line["currency_rate"])}</KursWaluty>')
+        value = get('currency_rate')
+        if value:
+            yield f'            <KursWaluty>{format_rate(value)}</KursWaluty>'
 
         # TODO: StanPrzed - stan przed korektą (for credit notes with quantity changes, optional)
-        # NOTE: This field shows state BEFORE correction for credit notes
 
-        xml_parts.append('        </FaWiersz>')
+        yield '        </FaWiersz>'
 
     # Platnosc - Payment terms (optional)
     # Must come AFTER FaWiersz and BEFORE WarunkiTransakcji
+    # FA(2) requires Termin and has TerminOpis as plain text; FA(3) makes Termin
+    # optional and structures TerminOpis (Ilosc/Jednostka/ZdarzeniePoczatkowe)
     payment_term = invoice_data.get('payment_term')
-    if payment_term:
-        xml_parts.extend([
-            '        <Platnosc>',
-            '            <TerminPlatnosci>',
-        ])
+    if payment_term and (is_fa3 or payment_term.get('due_date')):
+        yield '        <Platnosc>\n            <TerminPlatnosci>'
 
         # Termin - specific payment due date (if available)
         if payment_term.get('due_date'):
-            xml_parts.append(f'                <Termin>{payment_term["due_date"]}</Termin>')
+            yield f'                <Termin>{payment_term["due_date"]}</Termin>'
 
         # TerminOpis - payment term description (only if days/unit/event are provided)
         if payment_term.get('days') and payment_term.get('unit'):
-            xml_parts.append('                <TerminOpis>')
+            if is_fa3:
+                yield (
+                    '                <TerminOpis>\n'
+                    f'                    <Ilosc>{payment_term["days"]}</Ilosc>\n'
+                    f'                    <Jednostka>{payment_term["unit"]}</Jednostka>'
+                )
 
-            if payment_term.get('days'):
-                xml_parts.append(f'                    <Ilosc>{payment_term["days"]}</Ilosc>')
+                if payment_term.get('event'):
+                    yield f'                    <ZdarzeniePoczatkowe>{payment_term["event"]}</ZdarzeniePoczatkowe>'
 
-            if payment_term.get('unit'):
-                xml_parts.append(f'                    <Jednostka>{payment_term["unit"]}</Jednostka>')
-
-            if payment_term.get('event'):
-                xml_parts.append(f'                    <ZdarzeniePoczatkowe>{payment_term["event"]}</ZdarzeniePoczatkowe>')
-
-            xml_parts.append('                </TerminOpis>')
+                yield '                </TerminOpis>'
+            else:
+                # e.g. "14 dni - wystawienie faktury"
+                description = f'{payment_term["days"]} {payment_term["unit"]}'
+                if payment_term.get('event'):
+                    description = f'{description} - {payment_term["event"]}'
+                yield f'                <TerminOpis>{escape(description)}</TerminOpis>'
 
-        xml_parts.extend([
-            '            </TerminPlatnosci>',
-            '        </Platnosc>',
-        ])
+        yield '            </TerminPlatnosci>\n        </Platnosc>'
 
     # WarunkiTransakcji - Transaction conditions (must come AFTER FaWiersz)
     # According to FA(3) XSD: WarunkiTransakcji comes after Platnosc, after FaWiersz
     # Structure: WarunkiTransakcji -> Zamowienia -> DataZamowienia + NrZamowienia
-    if invoice_data.get('ref') or invoice_data.get('order_date'):
-        xml_parts.extend([
-            '        <WarunkiTransakcji>',
-            '            <Zamowienia>',
-        ])
+    order_date = invoice_data.get('order_date')
+    order_ref = invoice_data.get('ref')
+    if order_ref or order_date:
+        yield '        <WarunkiTransakcji>\n            <Zamowienia>'
 
         # DataZamowienia - order date (optional)
         # IMPORTANT: DataZamowienia requires TDataU format (YYYY-MM-DD)
         # Date should already be formatted as string in wizard
-        if invoice_data.get('order_date'):
-            xml_parts.append(f'                <DataZamowienia>{invoice_data["order_date"]}</DataZamowienia>')
+        if order_date:
+            yield f'                <DataZamowienia>{order_date}</DataZamowienia>'
 
         # NrZamowienia - order number (optional)
-        if invoice_data.get('ref'):
-            xml_parts.append(f'                <NrZamowienia>{_escape_xml(invoice_data["ref"])}</NrZamowienia>')
+        if order_ref:
+            yield f'                <NrZamowienia>{escape(order_ref)}</NrZamowienia>'
 
-        xml_parts.extend([
-            '            </Zamowienia>',
-            '        </WarunkiTransakcji>',
-        ])
+        yield '            </Zamowienia>\n        </WarunkiTransakcji>'
 
     # Закриваємо XML
-    xml_parts.extend([
-        '    </Fa>',
-        '</Faktura>',
-    ])
-
-    return '\n'.join(xml_parts)
+    yield '    </Fa>\n</Faktura>'
 
 
 def _clean_nip(nip: str) -> str:
@@ -544,6 +663,7 @@ def _clean_nip(nip: str) -> str:
     return nip.replace('PL', '').replace('pl', '').replace(' ', '').replace('-', '').strip()
 
 
+@lru_cache(maxsize=256)
 def _format_currency_rate(rate: float) -> str:
     r"""
     Форматує курс валюти згідно з XSD вимогами для TIlosci
@@ -563,38 +683,6 @@ def _escape_xml(text: str) -> str:
     if not text:
         return ''
 
-    import re
-    text = re.sub(r'\s+', ' ', text).strip()
-
-    return (text
-            .replace('&', '&amp;')
-            .replace('<', '&lt;')
-            .replace('>', '&gt;')
-            .replace('"', '&quot;')
-            .replace("'", '&apos;'))
-
-
-def _calculate_vat_summary(lines: List[Dict[str, Any]], currency_rate: float = None) -> Dict[int, Dict[str, float]]:
-    """
-    Підраховує підсумки за ставками ПДВ в валюті документа
-
-    Args:
-        lines: Рядки інвойсу
-        currency_rate: DEPRECATED - не використовується (суми завжди в валюті документа)
-
-    Returns:
-        Dict з підсумками за ставками ПДВ в валюті документа
-    """
-    summary = {}
-    for line in lines:
-        vat_rate = line.get('vat_rate', 23)
-        if vat_rate not in summary:
-            summary[vat_rate] = {'net': 0.0, 'vat': 0.0, 'gross': 0.0}
-
-        # NO currency conversion - amounts stay in document currency (e.g., EUR)
-        # Conversion to PLN only happens for P_14_*W fields in the main XML generation
-        summary[vat_rate]['net'] += line.get('net_amount', 0.0)
-        summary[vat_rate]['vat'] += line.get('vat_amount', 0.0)
-        summary[vat_rate]['gross'] += line.get('gross_amount', 0.0)
-
-    return summary
+    # Collapse whitespace runs (same as re.sub(r'\s+', ' ', text).strip()) and
+    # escape &, <, >, ", ' in a single pass
+    return ' '.join(text.split()).translate(_XML_ESCAPE_TABLE)
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Streaming FA(2)/FA(3) Invoice XML Reader for KSeF"""
+from typing import Any, Dict, Iterator, Optional, Union
+from xml.etree import ElementTree
+
+# Podmiot* elements that describe invoice parties (direct children of Faktura)
+PARTY_ROLES = {
+    'Podmiot1': 'seller',
+    'Podmiot2': 'buyer',
+    'Podmiot3': 'third_party',
+}
+
+# P_13_* / P_14_* suffix -> VAT rate. Only the suffixes the generator writes
+# have a fixed rate; the remaining ones (taxi, margin, exempt...) map to None.
+VAT_SUFFIX_RATES = {
+    '1': 23,
+    '2': 8,
+    '3': 5,
+    '4': 0,
+    '6_2': 0,
+}
+
+_PARTY_FIELDS = {
+    'NIP': 'nip',
+    'KodUE': 'eu_code',
+    'NrVatUE': 'vat_ue',
+    'NrID': 'tax_id',
+    'BrakID': 'no_id',
+    'Nazwa': 'name',
+    'PrefiksPodatnika': 'prefix',
+    'KodKraju': 'country',
+    'AdresL1': 'address_l1',
+    'AdresL2': 'address_l2',
+    'GLN': 'gln',
+    'Rola': 'role_code',
+}
+
+_LINE_FIELDS = {
+    'NrWierszaFa': ('number', int),
+    'P_7': ('name', str),
+    'Indeks': ('index', str),
+    'GTIN': ('gtin', str),
+    'P_8A': ('unit', str),
+    'P_8B': ('quantity', float),
+    'P_9A': ('price_unit', float),
+    'P_10': ('discount_amount', float),
+    'P_11': ('net_amount', float),
+    'P_12': ('vat_rate', None),
+    'Procedura': ('procedure', str),
+    'KursWaluty': ('currency_rate', float),
+}
+
+_FA_FIELDS = {
+    'KodWaluty': ('currency', str),
+    'P_1': ('issue_date', str),
+    'P_2': ('invoice_number', str),
+    'WZ': ('delivery_note_number', str),
+    'P_6': ('date_of_receipt_by_buyer', str),
+    'P_15': ('total_gross', float),
+    'KursWalutyZ': ('currency_rate', float),
+    'RodzajFaktury': ('rodzaj_faktury', str),
+}
+
+
+class InvoiceHeader:
+    """Naglowek - form code, variant and creation timestamp"""
+    __slots__ = ('namespace', 'system_code', 'schema_version', 'variant', 'created_at', 'system_info')
+
+    def __init__(self, namespace: Optional[str] = None):
+        self.namespace = namespace
+        self.system_code = None
+        self.schema_version = None
+        self.variant = None
+        self.created_at = None
+        self.system_info = None
+
+
+class Party:
+    """Podmiot1/Podmiot2/Podmiot3 - identification data and address"""
+    __slots__ = ('role', 'nip', 'eu_code', 'vat_ue', 'tax_id', 'no_id', 'name', 'prefix',
+                 'country', 'address_l1', 'address_l2', 'gln', 'role_code')
+
+    def __init__(self, role: str):
+        self.role = role
+        self.nip = None
+        self.eu_code = None
+        self.vat_ue = None
+        self.tax_id = None
+        self.no_id = None
+        self.name = None
+        self.prefix = None
+        self.country = None
+        self.address_l1 = None
+        self.address_l2 = None
+        self.gln = None
+        self.role_code = None
+
+
+class VatTotal:
+    """One P_13_x/P_14_x/P_14_xW group of the VAT summary"""
+    __slots__ = ('suffix', 'vat_rate', 'net', 'vat', 'vat_pln')
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+        self.vat_rate = VAT_SUFFIX_RATES.get(suffix)
+        self.net = 0.0
+        self.vat = 0.0
+        self.vat_pln = None
+
+
+class InvoiceLine:
+    """FaWiersz - one invoice line"""
+    __slots__ = ('number', 'name', 'index', 'gtin', 'unit', 'quantity', 'price_unit',
+                 'discount_amount', 'net_amount', 'vat_rate', 'procedure', 'currency_rate')
+
+    def __init__(self):
+        self.number = None
+        self.name = None
+        self.index = None
+        self.gtin = None
+        self.unit = None
+        self.quantity = None
+        self.price_unit = None
+        self.discount_amount = None
+        self.net_amount = None
+        self.vat_rate = None
+        self.procedure = None
+        self.currency_rate = None
+
+
+class InvoiceSummary:
+    """Fa-level fields and the VAT summary, emitted once </Fa> is reached"""
+    __slots__ = ('currency', 'issue_date', 'invoice_number', 'delivery_note_number',
+                 'date_of_receipt_by_buyer', 'total_gross', 'currency_rate',
+                 'rodzaj_faktury', 'vat_totals', 'line_count')
+
+    def __init__(self):
+        self.currency = None
+        self.issue_date = None
+        self.invoice_number = None
+        self.delivery_note_number = None
+        self.date_of_receipt_by_buyer = None
+        self.total_gross = None
+        self.currency_rate = None
+        self.rodzaj_faktury = None
+        self.vat_totals = {}
+        self.line_count = 0
+
+
+class FaInvoice:
+    """Complete invoice collected by read_fa_xml()"""
+    __slots__ = ('header', 'seller', 'buyer', 'third_parties', 'summary', 'lines')
+
+    def __init__(self):
+        self.header = None
+        self.seller = None
+        self.buyer = None
+        self.third_parties = []
+        self.summary = None
+        self.lines = []
+
+
+InvoiceRecord = Union[InvoiceHeader, Party, InvoiceLine, InvoiceSummary]
+
+
+def iter_fa_xml(source: Any) -> Iterator[InvoiceRecord]:
+    """
+    Потоково читає XML інвойсу FA(2)/FA(3) і повертає компактні записи
+
+    Every element is cleared and detached from its parent as soon as its end tag
+    is processed, so memory stays flat regardless of the number of FaWiersz rows.
+
+    Args:
+        source: Шлях до файлу або файлоподібний об'єкт (bytes)
+
+    Yields:
+        InvoiceHeader, Party (for each Podmiot), InvoiceLine (for each FaWiersz)
+        and finally one InvoiceSummary with Fa-level fields and VAT totals
+    """
+    path = []       # local tag names from root to the current element
+    elements = []   # matching Element objects, used to detach finished children
+    namespace = None
+    header = None
+    party = None
+    line = None
+    summary = None
+
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        tag = elem.tag.rpartition('}')[2]
+
+        if event == 'start':
+            path.append(tag)
+            elements.append(elem)
+            depth = len(path)
+            if depth == 1:
+                namespace = elem.tag[1:].partition('}')[0] if elem.tag.startswith('{') else None
+            elif depth == 2:
+                if tag == 'Naglowek':
+                    header = InvoiceHeader(namespace)
+                elif tag in PARTY_ROLES:
+                    party = Party(PARTY_ROLES[tag])
+                elif tag == 'Fa':
+                    summary = InvoiceSummary()
+            elif depth == 3 and tag == 'FaWiersz' and summary is not None:
+                line = InvoiceLine()
+            continue
+
+        depth = len(path)
+        text = elem.text.strip() if elem.text else None
+        section = path[1] if depth > 1 else None
+
+        if depth == 1:
+            pass
+        elif section == 'Naglowek' and header is not None:
+            if depth == 2:
+                yield header
+                header = None
+            elif tag == 'KodFormularza':
+                header.system_code = elem.get('kodSystemowy')
+                header.schema_version = elem.get('wersjaSchemy')
+            elif tag == 'WariantFormularza':
+                header.variant = text
+            elif tag == 'DataWytworzeniaFa':
+                header.created_at = text
+            elif tag == 'SystemInfo':
+                header.system_info = text
+        elif section in PARTY_ROLES and party is not None:
+            if depth == 2:
+                yield party
+                party = None
+            elif tag in _PARTY_FIELDS and path[2] in ('DaneIdentyfikacyjne', 'Adres', tag):
+                setattr(party, _PARTY_FIELDS[tag], text)
+        elif section == 'Fa' and summary is not None:
+            if depth == 2:
+                yield summary
+                summary = None
+            elif line is not None and path[2] == 'FaWiersz':
+                if depth == 3:
+                    summary.line_count += 1
+                    yield line
+                    line = None
+                elif depth == 4 and tag in _LINE_FIELDS:
+                    attr, convert = _LINE_FIELDS[tag]
+                    setattr(line, attr, _convert(text, convert))
+            elif depth == 3:
+                if tag in _FA_FIELDS:
+                    attr, convert = _FA_FIELDS[tag]
+                    setattr(summary, attr, _convert(text, convert))
+                elif tag.startswith(('P_13_', 'P_14_')):
+                    _add_vat_total(summary.vat_totals, tag, text)
+
+        path.pop()
+        elements.pop()
+        elem.clear()
+        if elements:
+            elements[-1].remove(elem)
+
+
+def read_fa_xml(source: Any, with_lines: bool = True) -> FaInvoice:
+    """
+    Читає XML інвойсу FA(2)/FA(3) у компактний запис FaInvoice
+
+    Args:
+        source: Шлях до файлу або файлоподібний об'єкт (bytes)
+        with_lines: False - пропустити збереження FaWiersz (лише підсумки)
+
+    Returns:
+        FaInvoice
+    """
+    invoice = FaInvoice()
+    for record in iter_fa_xml(source):
+        if isinstance(record, InvoiceLine):
+            if with_lines:
+                invoice.lines.append(record)
+        elif isinstance(record, Party):
+            if record.role == 'seller':
+                invoice.seller = record
+            elif record.role == 'buyer':
+                invoice.buyer = record
+            else:
+                invoice.third_parties.append(record)
+        elif isinstance(record, InvoiceHeader):
+            invoice.header = record
+        elif isinstance(record, InvoiceSummary):
+            invoice.summary = record
+    return invoice
+
+
+def _convert(text: Optional[str], convert) -> Any:
+    """Converts leaf text; P_12 stays a string unless it is a plain number"""
+    if text is None:
+        return None
+    if convert is None:
+        return int(text) if text.isdigit() else text
+    return convert(text)
+
+
+def _add_vat_total(vat_totals: Dict[str, VatTotal], tag: str, text: Optional[str]):
+    """Routes P_13_x / P_14_x / P_14_xW into the VatTotal for suffix x"""
+    if text is None:
+        return
+    suffix = tag[5:]
+    if tag.startswith('P_14_') and suffix.endswith('W'):
+        suffix = suffix[:-1]
+        field = 'vat_pln'
+    elif tag.startswith('P_14_'):
+        field = 'vat'
+    else:
+        field = 'net'
+
+    total = vat_totals.get(suffix)
+    if total is None:
+        total = vat_totals[suffix] = VatTotal(suffix)
+    setattr(total, field, float(text))
+
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""Local XSD pre-flight validation of FA(2)/FA(3) invoices"""
+import glob
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # lxml ships with Odoo; without it validation is skipped
+    etree = None
+
+_logger = logging.getLogger(__name__)
+
+_thread_schemas = threading.local()
+
+# Local copies of the schemas (docs/FA2/schemat.xsd, docs/MF/StrukturyDanych_v10-0E.local.xsd...).
+# Form schemas are matched by targetNamespace, imported definition schemas by
+# file name. Nothing is fetched from crd.gov.pl: a schema that imports a file
+# missing here fails to compile.
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs')
+
+# Non-official stand-ins for MF definition schemas that are not bundled
+# (X.local.xsd replaces X.xsd). An official X.xsd placed next to it wins.
+LOCAL_STUB_SUFFIX = '.local.xsd'
+
+# schema_source() values
+SOURCE_OFFICIAL = 'official'
+SOURCE_LOCAL = 'local'
+
+# {namespace: [names of the local stubs the schema was compiled with]}
+_schema_stubs = {}
+
+# Same code/description KSeF uses for invoices failing schema validation
+INVALID_XML_CODE = 450
+INVALID_XML_DESCRIPTION = 'Błąd weryfikacji semantyki dokumentu faktury'
+
+# Maximum number of error lines reported per document
+MAX_DETAILS = 20
+
+# Batches smaller than this are validated in-process
+BATCH_MIN_PARALLEL = 32
+
+
+@lru_cache(maxsize=None)
+def _local_schemas() -> Dict[str, Dict[str, str]]:
+    """
+    {'namespaces': {form targetNamespace: path}, 'files': {definition file name: path},
+     'stubs': {official file name: path of its local stub}} for SCHEMA_DIR
+    """
+    namespaces = {}
+    files = {}
+    stubs = {}
+    for path in sorted(glob.glob(os.path.join(SCHEMA_DIR, '**', '*.xsd'), recursive=True)):
+        try:
+            _, root = next(etree.iterparse(path, events=('start',)))
+        except etree.XMLSyntaxError as e:
+            _logger.warning(f'Skipping unreadable schema {path}: {e}')
+            continue
+        namespace = root.get('targetNamespace') or ''
+        # Form schemas are all called schemat.xsd - only definition schemas
+        # (StrukturyDanych_v10-0E.xsd...) can be matched by file name
+        name = os.path.basename(path)
+        if '/wzor/' in namespace:
+            namespaces.setdefault(namespace, path)
+        elif name.endswith(LOCAL_STUB_SUFFIX):
+            stubs.setdefault(name[:-len(LOCAL_STUB_SUFFIX)] + '.xsd', path)
+        else:
+            files.setdefault(name, path)
+    stubs = {name: path for name, path in stubs.items() if name not in files}
+    return {'namespaces': namespaces, 'files': dict(stubs, **files), 'stubs': stubs}
+
+
+def _schema_parser(used_stubs: Optional[List[str]] = None):
+    """
+    XML parser that resolves xsd:import/xsd:include locations to local files only
+
+    Names of the local stubs resolved instead of official files are appended to used_stubs.
+    """
+    local_schemas = _local_schemas()
+    files = local_schemas['files']
+    stubs = local_schemas['stubs']
+
+    class LocalResolver(etree.Resolver):
+        def resolve(self, url, pubid, context):
+            name = url.rpartition('/')[2]
+            path = files.get(name)
+            if path:
+                if name in stubs and used_stubs is not None:
+                    used_stubs.append(os.path.basename(path))
+                return self.resolve_filename(path, context)
+            return None
+
+    parser = etree.XMLParser(no_network=True)
+    parser.resolvers.add(LocalResolver())
+    return parser
+
+
+def get_schema(namespace: str) -> Optional[Any]:
+    """
+    Повертає скомпільовану XSD для простору імен FA
+
+    Schemas are compiled once per thread (lxml validators keep per-object error
+    logs, Odoo serves requests from a thread pool) and stay warm afterwards.
+    A schema that cannot be compiled is logged as an error and remembered as None.
+
+    Args:
+        namespace: targetNamespace (напр. http://crd.gov.pl/wzor/2023/06/29/12648/)
+
+    Returns:
+        lxml.etree.XMLSchema або None, якщо схему неможливо скомпілювати
+    """
+    if etree is None or not namespace:
+        return None
+
+    schemas = getattr(_thread_schemas, 'schemas', None)
+    if schemas is None:
+        schemas = _thread_schemas.schemas = {}
+    if namespace not in schemas:
+        schemas[namespace] = _compile_schema(namespace)
+    return schemas[namespace]
+
+
+def schema_source(namespace: str) -> Optional[str]:
+    """
+    Чим перевіряється документ простору імен FA
+
+    Returns:
+        SOURCE_OFFICIAL - the schema and everything it imports are official files;
+        SOURCE_LOCAL - compiled against non-official local stubs, errors are only indicative;
+        None - no schema, documents of this namespace are not validated
+    """
+    if get_schema(namespace) is None:
+        return None
+    return SOURCE_LOCAL if _schema_stubs.get(namespace) else SOURCE_OFFICIAL
+
+
+def _compile_schema(namespace: str) -> Optional[Any]:
+    location = _local_schemas()['namespaces'].get(namespace)
+    if not location:
+        _logger.warning(
+            f'No local XSD for {namespace} in {SCHEMA_DIR}, documents are sent without pre-flight validation'
+        )
+        return None
+    used_stubs = []
+    try:
+        start = time.perf_counter()
+        schema = etree.XMLSchema(etree.parse(location, parser=_schema_parser(used_stubs)))
+    except (etree.XMLSchemaParseError, etree.XMLSyntaxError, OSError) as e:
+        _logger.error(f'Failed to compile XSD {location} for {namespace}, skipping pre-flight validation: {e}')
+        return None
+    _schema_stubs[namespace] = sorted(set(used_stubs))
+    _logger.info(f'Compiled XSD for {namespace} in {(time.perf_counter() - start) * 1000:.0f} ms')
+    if used_stubs:
+        _logger.warning(
+            f'XSD for {namespace} uses non-official local stubs ({", ".join(_schema_stubs[namespace])}), '
+            f'validation errors are only indicative'
+        )
+    return schema
+
+
+def validate_xml(content: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Перевіряє XML інвойсу за схемою FA перед відправкою в KSeF
+
+    Args:
+        content: XML інвойсу (UTF-8 bytes)
+
+    Returns:
+        None якщо документ валідний (або схема недоступна - див. schema_source()),
+        інакше статус у форматі відповіді KSeF:
+            {'status': {'code': 450, 'description': str, 'details': [str, ...]}}
+    """
+    if etree is None:
+        return None
+
+    try:
+        document = etree.fromstring(content, parser=_document_parser())
+    except etree.XMLSyntaxError as e:
+        return _invalid_status([f'Linia {e.lineno}: {e.msg}'])
+
+    schema = get_schema(etree.QName(document).namespace)
+    if schema is None or schema.validate(document):
+        return None
+
+    return _invalid_status([f'Linia {error.line}: {error.message}' for error in schema.error_log])
+
+
+def validate_batch(contents: List[bytes], max_workers: Optional[int] = None,
+                   chunksize: Optional[int] = None, mp_context=None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Перевіряє пакет XML паралельно; кожен процес компілює схеми один раз
+
+    Returns:
+        Список результатів validate_xml() у тому ж порядку
+    """
+    if not contents:
+        return []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if etree is None or max_workers == 1 or len(contents) < BATCH_MIN_PARALLEL:
+        return [validate_xml(content) for content in contents]
+
+    if not chunksize:
+        chunksize = max(1, len(contents) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                             initializer=warm_schemas) as executor:
+        return list(executor.map(validate_xml, contents, chunksize=chunksize))
+
+
+def warm_schemas():
+    """Compiles every local FA schema (pool initializer / Odoo worker start-up)"""
+    if etree is None:
+        return
+    for namespace in _local_schemas()['namespaces']:
+        get_schema(namespace)
+
+
+def _document_parser():
+    """Parser for validated documents - no network, no entity expansion"""
+    return etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
+
+def _invalid_status(details: List[str]) -> Dict[str, Any]:
+    if len(details) > MAX_DETAILS:
+        details = details[:MAX_DETAILS] + [f'... (+{len(details) - MAX_DETAILS})']
+    return {
+        'status': {
+            'code': INVALID_XML_CODE,
+            'description': INVALID_XML_DESCRIPTION,
+            'details': details,
+        }
+    }
@@ -2,10 +2,24 @@
 """Account Move Extension for KSeF"""
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from datetime import datetime, timedelta
+import base64
+import json
 import logging
+import re
 
 _logger = logging.getLogger(__name__)
 
+# Seconds between background status polls after sending; once exhausted the
+# invoice is left to the regular pending-invoice cron
+KSEF_POLL_INTERVALS = (2, 5, 10, 30, 60, 120, 300)
+
+# Fields of a posted invoice that stay editable and end up in invoice_data;
+# writing any of them refreshes the frozen KSeF snapshot
+KSEF_SNAPSHOT_FIELDS = frozenset((
+    'ref', 'delivery_note_number', 'ksef_correction_type', 'date_of_receipt_by_buyer', 'partner_shipping_id',
+))
+
 
 class AccountMove(models.Model):
     _inherit = 'account.move'
@@ -22,6 +36,13 @@ class AccountMove(models.Model):
         copy=False,
         help='KSeF reference number from submission',
     )
+    ksef_session_reference = fields.Char(
+        string='KSeF Session Reference',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Reference number of the KSeF online session the invoice was sent in',
+    )
     ksef_status = fields.Selection(
         [
             ('draft', 'Not Sent'),
@@ -49,6 +70,50 @@ class AccountMove(models.Model):
         readonly=True,
         copy=False,
     )
+    ksef_upo_received = fields.Boolean(
+        string='KSeF UPO Received',
+        readonly=True,
+        copy=False,
+        help='UPO (official receipt confirmation) extract is attached to the invoice',
+    )
+    ksef_sent_by_id = fields.Many2one(
+        'res.users',
+        string='KSeF Sent By',
+        readonly=True,
+        copy=False,
+        help='User notified when KSeF finishes processing the invoice',
+    )
+    ksef_next_poll = fields.Datetime(
+        string='KSeF Next Status Poll',
+        readonly=True,
+        copy=False,
+        index=True,
+    )
+    ksef_poll_count = fields.Integer(
+        string='KSeF Status Polls',
+        readonly=True,
+        copy=False,
+    )
+    ksef_xml_cache = fields.Binary(
+        string='KSeF XML Cache',
+        attachment=True,
+        readonly=True,
+        copy=False,
+        help='Last generated FA XML, reused while ksef_xml_cache_key matches',
+    )
+    ksef_xml_cache_key = fields.Char(
+        string='KSeF XML Cache Key',
+        readonly=True,
+        copy=False,
+        help='Content hash of the invoice data and FA version the cached XML was generated from',
+    )
+    ksef_snapshot = fields.Text(
+        string='KSeF Snapshot',
+        readonly=True,
+        copy=False,
+        help='invoice_data frozen at posting and refreshed when an editable field it contains changes '
+             '(compact JSON); sending reads only this snapshot',
+    )
 
     has_ksef_config = fields.Boolean(
         string='Has KSeF Configuration',
@@ -102,6 +167,424 @@ class AccountMove(models.Model):
                 },
             }
 
+    def _ksef_prepare_invoice_data(self):
+        """
+        Build xml_generator input (invoice_data) for the whole recordset.
+
+        Lines, taxes, products, Polish UoM/payment term names, partners, sale orders
+        and corrected invoices are loaded set-wise before the per-invoice loop, so
+        the number of queries does not grow with the number of invoices or lines.
+
+        Returns:
+            {move.id: invoice_data}
+        """
+        from ..ksef_client.vat_summary import (
+            check_amount_total, format_grosze, inconsistent_invoices, sum_totals, summarize_invoices,
+        )
+
+        company_lang = 'pl_PL'
+        today = datetime.today().strftime('%Y-%m-%d')
+
+        for invoice in self:
+            # Validate data
+            if not invoice.partner_id.vat:
+                raise UserError(_('Customer of %s must have a valid NIP (VAT number)') % invoice.name)
+            if not invoice.company_id.vat:
+                raise UserError(_('Company of %s must have a valid NIP (VAT number)') % invoice.name)
+
+        # Set-wise loading - one query per relation instead of one per invoice/line.
+        # Translated names are read once through a single pl_PL environment.
+        # Sale orders, delivery addresses, GLN and receipt date come from optional modules
+        has_shipping = 'partner_shipping_id' in self._fields
+        has_sale = 'sale_line_ids' in self.env['account.move.line']._fields
+        has_gln = 'gln_code' in self.env['res.partner']._fields
+        has_receipt_date = 'date_of_receipt_by_buyer' in self._fields
+        shipping_partners = self.partner_shipping_id if has_shipping else self.env['res.partner']
+        partners = self.partner_id | shipping_partners | self.company_id.partner_id
+        partners.mapped('country_id.code')
+        if has_gln:
+            partners.mapped('gln_code')
+        self.company_id.mapped('country_id.code')
+        self.reversed_entry_id.mapped('invoice_date')
+
+        lines = self.invoice_line_ids.filtered(lambda l: l.display_type == 'product')
+        lines.mapped('tax_ids.amount')
+        lines.product_id.mapped('product_tmpl_id.type')
+        if has_sale:
+            lines.sale_line_ids.order_id.mapped('date_order')
+        uom_names = {uom.id: uom.name for uom in lines.product_uom_id.with_context(lang=company_lang)}
+        payment_term_names = {
+            term.id: term.name for term in self.invoice_payment_term_id.with_context(lang=company_lang)
+        }
+        has_customer_product = 'sh_line_customer_code' in lines._fields
+
+        result = {}
+        for invoice in self:
+            receipt_date = invoice.date_of_receipt_by_buyer if has_receipt_date else None
+            issue_date = invoice.invoice_date.strftime('%Y-%m-%d') if invoice.invoice_date else today
+
+            # Get currency exchange rate
+            # Odoo already calculates and stores currency_rate in invoice
+            is_foreign_currency = invoice.currency_id != invoice.company_id.currency_id
+            currency_rate = invoice.currency_rate if is_foreign_currency else None
+
+            # Prepare invoice data
+            invoice_data = {
+                'invoice_number': invoice.name,
+                'date_of_receipt_by_buyer': receipt_date.strftime('%Y-%m-%d') if receipt_date else None,
+                'ref': invoice.ref if invoice.ref else '',
+                'issue_date': issue_date,
+                'sale_date': issue_date,
+                'payment_date': invoice.invoice_date_due.strftime('%Y-%m-%d') if invoice.invoice_date_due else issue_date,
+                'currency': invoice.currency_id.name or 'PLN',
+                'currency_rate': currency_rate if is_foreign_currency else None,
+                'is_foreign_currency': is_foreign_currency,
+
+                # Seller data (company)
+                'seller': {
+                    'nip': invoice.company_id.vat,
+                    'name': invoice.company_id.name,
+                    'street': invoice.company_id.street or '',
+                    'city': invoice.company_id.city or '',
+                    'zip': invoice.company_id.zip or '',
+                    'country': invoice.company_id.country_id.code or 'PL',
+                    'gln': (invoice.company_id.partner_id.gln_code or '') if has_gln else '',
+                },
+
+                # Buyer data (customer)
+                'buyer': {
+                    'nip': invoice.partner_id.vat,
+                    'name': invoice.partner_id.name,
+                    'street': invoice.partner_id.street or '',
+                    'city': invoice.partner_id.city or '',
+                    'zip': invoice.partner_id.zip or '',
+                    'country': invoice.partner_id.country_id.code or 'PL',
+                    'gln': (invoice.partner_id.gln_code or '') if has_gln else '',
+                },
+
+                # Invoice lines
+                'lines': [],
+
+                # Totals
+                'total_net': 0.0,
+                'total_vat': 0.0,
+                'total_gross': invoice.amount_total,
+
+                # Payment term - will be set below if exists
+                'payment_term': None,
+
+                # Delivery note number (WZ) from stock picking
+                'delivery_note_number': invoice.delivery_note_number or '',
+            }
+
+            # Parse payment term from invoice (name in Polish for KSeF)
+            if invoice.invoice_payment_term_id:
+                payment_term_name = payment_term_names[invoice.invoice_payment_term_id.id]
+                # Try to extract number of days from payment term name
+                # Examples: "14 dni", "30 Days", "Natychmiast", "7 days net"
+                days_match = re.search(r'(\d+)', payment_term_name)
+                if days_match:
+                    days = int(days_match.group(1))
+
+                    invoice_data['payment_term'] = {
+                        'days': days,
+                        'unit': 'dni',  # Always use Polish for KSeF
+                        'event': 'wystawienie faktury',  # Default: invoice issue
+                        'due_date': invoice.invoice_date_due.strftime('%Y-%m-%d') if invoice.invoice_date_due else None,
+                    }
+
+            sale_order_id = invoice.invoice_line_ids.sale_line_ids.order_id[:1] if has_sale else None
+            if sale_order_id:
+                # Format date as YYYY-MM-DD for FA(3) DataZamowienia (TDataU type)
+                invoice_data['order_date'] = sale_order_id.date_order.strftime('%Y-%m-%d')
+
+            # Delivery address (Podmiot3) - if different from invoice partner
+            # IMPORTANT: Get delivery address ONLY from invoice, not from sale order
+            # This ensures delivery address is explicitly set and controlled
+            delivery_partner = invoice.partner_shipping_id if has_shipping else None
+            if delivery_partner and delivery_partner != invoice.partner_id:
+                invoice_data['delivery_address'] = {
+                    'name': delivery_partner.name,
+                    'street': delivery_partner.street or '',
+                    'city': delivery_partner.city or '',
+                    'zip': delivery_partner.zip or '',
+                    'country': delivery_partner.country_id.code if delivery_partner.country_id else 'PL',
+                    'nip': delivery_partner.vat or '',
+                    'gln': (delivery_partner.gln_code or '') if has_gln else '',  # GLN from dedicated field
+                }
+
+            # Position identifier (IdentyfikatorPozycji) - only for Auchan (VAT=5260309174)
+            # Check VAT of delivery address (partner_shipping_id), not main buyer
+            buyer_vat = (delivery_partner.vat or '') if delivery_partner else ''
+            buyer_vat_clean = buyer_vat.replace('PL', '').replace('pl', '').replace(' ', '').replace('-', '').strip()
+            is_auchan = buyer_vat_clean == '5260309174'
+
+            # Logistics activity code (AktywnoscLogistyczna) from delivery address
+            logistics_code = (delivery_partner.ksef_code or None) if delivery_partner else None
+
+            # Process invoice lines
+            for line in invoice.invoice_line_ids:
+                if line.display_type != 'product':  # Skip section/note lines
+                    continue
+
+                # Get VAT rate
+                vat_rate = 23  # Default
+                if line.tax_ids:
+                    vat_rate = int(line.tax_ids[0].amount) if line.tax_ids[0].amount else 0
+
+                # Get unit of measure in Polish (required by KSeF)
+                unit = uom_names[line.product_uom_id.id] if line.product_uom_id else 'szt'
+
+                # P_7 - Product name (internal product name, NOT customer name)
+                product_name = line.name or line.product_id.name or 'Product/Service'
+
+                # Indeks - Internal product code (NOT customer code)
+                product_index = line.product_id.default_code or ""
+
+                # GTIN - Barcode (clean trailing special characters like "._")
+                product_gtin = ""
+                if line.product_id.barcode:
+                    # Remove trailing special characters (e.g., "342342._" -> "342342")
+                    product_gtin = re.sub(r'[._\-\s]+$', '', line.product_id.barcode)
+
+                # Customer-specific product info (for DodatkowyOpis), if available in this setup
+                customer_product_code = ""
+                customer_product_name = ""
+                if has_customer_product:
+                    customer_product_code = line.sh_line_customer_code or ""
+                    customer_product_name = line.sh_line_customer_product_name or ""
+
+                # Map product type to position identifier (Auchan only)
+                # CU = Storable (consu/product), SER = Service, RC = returnable packaging
+                position_identifier = None
+                if is_auchan:
+                    if line.product_id.type == 'service':
+                        position_identifier = 'SER'
+                    elif line.product_id.type in ('product', 'consu'):
+                        position_identifier = 'CU'
+                    # RC (returnable packaging) - not implemented yet
+
+                # Calculate discount for P_10 field
+                discount_percent = line.discount if line.discount else 0.0
+                discount_amount = 0.0
+                original_price = line.price_unit
+
+                if discount_percent > 0:
+                    # Calculate total discount amount for this line
+                    discount_amount = line.price_unit * line.quantity - line.price_subtotal
+
+                # Determine procedure
+                # Note: WDT (intra-EU supply) does NOT use the Procedura field.
+                # It's indicated by P_13_6_2 in VAT summary and P_19/P_19A annotations.
+                procedure = None
+
+                invoice_data['lines'].append({
+                    'name': product_name,
+                    'index': product_index,
+                    'gtin': product_gtin,  # GTIN barcode
+                    'quantity': line.quantity,
+                    'unit': unit,
+                    'price_unit': original_price,  # P_9A - original price before discount (in invoice currency)
+                    'discount_amount': discount_amount,  # P_10 - discount amount (in invoice currency)
+                    'net_amount': line.price_subtotal,  # P_11 - final amount after discount (in invoice currency)
+                    'vat_rate': vat_rate,
+                    'vat_amount': line.price_total - line.price_subtotal,
+                    'gross_amount': line.price_total,
+                    'currency_rate': currency_rate if is_foreign_currency else None,  # Exchange rate for this line
+                    'procedure': procedure,  # WDT, EE, etc.
+                    'customer_product_code': customer_product_code,  # For DodatkowyOpis
+                    'customer_product_name': customer_product_name,  # For DodatkowyOpis
+                    'position_identifier': position_identifier,  # For DodatkowyOpis - Auchan only
+                    'logistics_code': logistics_code,  # For DodatkowyOpis - from delivery address
+                })
+
+            # Determine invoice type (RodzajFaktury)
+            if invoice.move_type == 'out_refund':
+                # Credit note (Faktura Korygująca)
+                invoice_data['rodzaj_faktury'] = 'KOR'
+
+                # Add credit note specific data
+                # Use standard 'ref' field for correction reason
+                invoice_data['correction_reason'] = invoice.ref or 'Korekta'
+                invoice_data['correction_type'] = invoice.ksef_correction_type or '2'
+
+                # Get original invoice data (reversed_entry_id is Odoo's field for original invoice)
+                # DaneFaKorygowanej is REQUIRED for KOR invoices!
+                if not invoice.reversed_entry_id:
+                    raise UserError(
+                        f'Credit note {invoice.name} has no reference to the original invoice!\n'
+                        f'Field "reversed_entry_id" is required for sending credit notes to KSeF.\n'
+                        f'Create credit note using "Credit Note" button on the original invoice.'
+                    )
+
+                invoice_data['corrected_invoices'] = [{
+                    'date': invoice.reversed_entry_id.invoice_date.strftime('%Y-%m-%d') if invoice.reversed_entry_id.invoice_date else issue_date,
+                    'number': invoice.reversed_entry_id.name,
+                    'ksef_number': invoice.reversed_entry_id.ksef_number if invoice.reversed_entry_id.ksef_number else None,
+                }]
+            else:
+                # Regular invoice
+                invoice_data['rodzaj_faktury'] = 'VAT'
+
+            result[invoice.id] = invoice_data
+
+        # Totals from exact per-rate sums of the whole batch (integer grosze, no float drift)
+        summaries = summarize_invoices({move_id: data['lines'] for move_id, data in result.items()})
+        inconsistent = set(inconsistent_invoices(summaries, {invoice.id: invoice.amount_total for invoice in self}))
+        for invoice in self:
+            invoice_data = result[invoice.id]
+            totals = sum_totals(summaries[invoice.id])
+            invoice_data['total_net'] = totals.net / 100
+            invoice_data['total_vat'] = totals.vat / 100
+
+            if invoice.id in inconsistent:
+                difference = format_grosze(check_amount_total(summaries[invoice.id], invoice.amount_total))
+                # Shown in the send wizard
+                invoice_data['amount_total_difference'] = difference
+                _logger.warning(
+                    f'KSeF VAT summary of {invoice.name} differs from amount_total by '
+                    f'{difference} {invoice_data["currency"]}'
+                )
+
+            # NOTE: For foreign currency invoices, we keep PLN equivalents for internal accounting
+            # However, in KSeF XML:
+            # - P_13_*, P_14_*, P_15 remain in document currency (e.g., EUR)
+            # - Only P_14_*W fields contain VAT converted to PLN (per art. 106e ust. 11)
+            if invoice_data['is_foreign_currency']:
+                currency_rate = invoice_data['currency_rate']
+                invoice_data['total_net_pln'] = invoice_data['total_net'] * currency_rate
+                invoice_data['total_vat_pln'] = invoice_data['total_vat'] * currency_rate
+                invoice_data['total_gross_pln'] = invoice_data['total_gross'] * currency_rate
+            else:
+                invoice_data['total_net_pln'] = invoice_data['total_net']
+                invoice_data['total_vat_pln'] = invoice_data['total_vat']
+                invoice_data['total_gross_pln'] = invoice_data['total_gross']
+
+        return result
+
+    def _post(self, soft=True):
+        """Freeze the KSeF snapshot of customer invoices when they are posted"""
+        posted = super()._post(soft=soft)
+        posted._ksef_snapshot_moves()._ksef_freeze_snapshot()
+        return posted
+
+    def write(self, vals):
+        """Refresh the KSeF snapshot when a posted invoice field it was built from changes"""
+        res = super().write(vals)
+        if KSEF_SNAPSHOT_FIELDS.intersection(vals):
+            unsent = self.filtered(lambda m: m.state == 'posted' and not m.ksef_number)
+            unsent._ksef_snapshot_moves()._ksef_freeze_snapshot()
+        return res
+
+    def _ksef_snapshot_moves(self):
+        """Customer invoices / credit notes of companies with a KSeF configuration"""
+        return self.filtered(
+            lambda m: m.move_type in ('out_invoice', 'out_refund') and m.company_id.has_ksef_config
+        )
+
+    def _ksef_freeze_snapshot(self):
+        """
+        Stores invoice_data of every move as compact JSON (ksef_snapshot).
+
+        Never raises: moves whose data cannot be built (e.g. customer without NIP)
+        are left without a snapshot, so posting is not blocked - the data is built
+        again and the error is shown when sending.
+        """
+        if not self:
+            return
+        # Savepoints keep the posting transaction usable if building the data fails
+        try:
+            with self.env.cr.savepoint(flush=False):
+                invoice_data = self._ksef_prepare_invoice_data()
+        except Exception:
+            invoice_data = {}
+            for move in self:
+                try:
+                    with self.env.cr.savepoint(flush=False):
+                        invoice_data.update(move._ksef_prepare_invoice_data())
+                except Exception as e:
+                    _logger.warning(f'KSeF snapshot of {move.name} not created: {e}')
+
+        for move in self:
+            data = invoice_data.get(move.id)
+            move.ksef_snapshot = json.dumps(data, ensure_ascii=False, separators=(',', ':')) if data else False
+
+    def _ksef_get_invoice_data(self):
+        """
+        invoice_data for send/retry/batch - read from the snapshot frozen at posting.
+
+        Moves posted before snapshots existed are built from the ORM once and frozen.
+        The KSeF number of a corrected invoice is usually assigned after its credit
+        note is posted, so it is re-read from reversed_entry_id on every call (and
+        thereby also enters the XML cache key).
+
+        Returns:
+            {move.id: invoice_data}
+        """
+        result = {move.id: json.loads(move.ksef_snapshot) for move in self if move.ksef_snapshot}
+        missing = self.filtered(lambda m: m.id not in result)
+        if missing:
+            invoice_data = missing._ksef_prepare_invoice_data()
+            for move in missing:
+                move.sudo().ksef_snapshot = json.dumps(invoice_data[move.id], ensure_ascii=False, separators=(',', ':'))
+            result.update(invoice_data)
+
+        self.reversed_entry_id.mapped('ksef_number')
+        for move in self.filtered('reversed_entry_id'):
+            for corrected_invoice in result[move.id].get('corrected_invoices') or []:
+                corrected_invoice['ksef_number'] = move.reversed_entry_id.ksef_number or None
+        return result
+
+    def _ksef_get_invoice_xml(self, invoice_data, format_version):
+        """
+        Returns FA XML (UTF-8 bytes) for invoice_data, rendering it only when the
+        content hash differs from the cached one. The key is hashed from invoice_data
+        itself (the ksef_snapshot, rebuilt by write() when an editable field it
+        contains changes), so an XML that no longer matches the data is never reused.
+        """
+        self.ensure_one()
+        from ..ksef_client.xml_generator import fa_vat_xml_cache_key, generate_fa_vat_xml
+
+        cache_key = fa_vat_xml_cache_key(invoice_data, format_version)
+        if self.ksef_xml_cache_key == cache_key:
+            cached = self.with_context(bin_size=False).ksef_xml_cache
+            if cached:
+                _logger.debug(f'Reusing cached KSeF XML for {self.name}')
+                return base64.b64decode(cached)
+
+        content = generate_fa_vat_xml(invoice_data, format_version=format_version).encode('utf-8')
+        self.sudo().write({
+            'ksef_xml_cache': base64.b64encode(content),
+            'ksef_xml_cache_key': cache_key,
+        })
+        return content
+
+    def _prepare_ksef_status_vals(self, status):
+        """Convert a KSeF invoice status response into account.move values"""
+        status_info = status.get('status', {})
+
+        # Build detailed error message including details array
+        status_description = status_info.get('description', '')
+        details = status_info.get('details', [])
+        if details:
+            details_str = '\n\n' + '\n'.join(f'• {detail}' for detail in details)
+            status_description += details_str
+
+        code = status_info.get('code')
+        if code == 200:
+            ksef_status = 'accepted'
+        elif (code or 0) >= 400:
+            ksef_status = 'rejected'
+        else:
+            ksef_status = 'pending'
+
+        return {
+            'ksef_status': ksef_status,
+            'ksef_status_code': code,
+            'ksef_status_description': status_description,
+            'ksef_number': status.get('ksefNumber'),
+        }
+
     def action_check_ksef_status(self):
         """Check KSeF invoice status"""
         self.ensure_one()
@@ -115,43 +598,33 @@ class AccountMove(models.Model):
             # Get config
             config = self.env['ksef.config'].get_config(self.company_id.id)
 
-            # Authenticate
-            auth_client = auth.Auth(config.api_url, config.ksef_token)
-            if not auth_client.token:
+            # Authenticate (reuses the access token of earlier calls while valid)
+            access_token = auth.get_access_token(config.api_url, config.ksef_token)
+            if not access_token:
                 raise UserError(_('Failed to authenticate with KSeF API'))
 
-            # Open session and check status
-            session = ksef_invoice.InvoiceSession(config.api_url, auth_client.token)
-            if not session.open():
-                raise UserError(_('Failed to open KSeF session'))
+            if self.ksef_session_reference:
+                # Status lives in the session the invoice was sent in
+                session_status = ksef_invoice.SessionStatus(
+                    config.api_url, access_token, self.ksef_session_reference)
+                status = session_status.get_invoice_status(self.ksef_reference)
+            else:
+                # Invoices sent before the session reference was stored
+                session = ksef_invoice.InvoiceSession(config.api_url, access_token)
+                if not session.open():
+                    raise UserError(_('Failed to open KSeF session'))
 
-            status = session.get_invoice_status(self.ksef_reference)
-            session.close()
+                status = session.get_invoice_status(self.ksef_reference)
+                session.close()
 
             if status:
-                status_info = status.get('status', {})
-
-                # Build detailed error message including details array
-                status_description = status_info.get('description', '')
-                details = status_info.get('details', [])
-                if details:
-                    details_str = '\n\n' + '\n'.join(f'• {detail}' for detail in details)
-                    status_description += details_str
-
-                self.write({
-                    'ksef_status_code': status_info.get('code'),
-                    'ksef_status_description': status_description,
-                    'ksef_number': status.get('ksefNumber'),
-                })
+                self.write(self._prepare_ksef_status_vals(status))
 
-                if status_info.get('code') == 200:
-                    self.ksef_status = 'accepted'
+                if self.ksef_status == 'accepted':
                     message = _('KSeF Status: Accepted\nKSeF Number: %s') % self.ksef_number
-                elif status_info.get('code', 0) >= 400:
-                    self.ksef_status = 'rejected'
+                elif self.ksef_status == 'rejected':
                     message = _('KSeF Status: Rejected\n%s') % self.ksef_status_description
                 else:
-                    self.ksef_status = 'pending'
                     message = _('KSeF Status: %s') % self.ksef_status_description
 
                 return {
@@ -171,6 +644,93 @@ class AccountMove(models.Model):
             _logger.error(f'KSeF status check failed: {e}')
             raise UserError(_('Status check failed: %s') % str(e))
 
+    def _ksef_reconcile_sessions(self):
+        """Update KSeF status of one company's invoices, session by session"""
+        from ..ksef_client import auth, invoice as ksef_invoice
+
+        company = self.company_id
+        company.ensure_one()
+
+        config = self.env['ksef.config'].get_config(company.id)
+        access_token = auth.get_access_token(config.api_url, config.ksef_token)
+        if not access_token:
+            raise UserError(_('Failed to authenticate with KSeF API'))
+
+        moves_by_session = {}
+        for move in self:
+            moves_by_session.setdefault(move.ksef_session_reference, self.browse())
+            moves_by_session[move.ksef_session_reference] |= move
+
+        for session_reference, moves in moves_by_session.items():
+            session_status = ksef_invoice.SessionStatus(config.api_url, access_token, session_reference)
+            moves._ksef_reconcile_session(session_status)
+            moves.filtered(lambda m: m.ksef_status != 'pending')._ksef_finish_polling()
+
+    def _ksef_finish_polling(self):
+        """Clear the background poll schedule of invoices with a final KSeF status and notify the sender"""
+        self.filtered('ksef_next_poll').write({'ksef_next_poll': False})
+        self.filtered('ksef_poll_count').write({'ksef_poll_count': 0})
+        self._ksef_notify_status()
+
+    def _ksef_reconcile_session(self, session_status):
+        """Update KSeF status of invoices sent in one session
+
+        The session counters are read first; while no invoice of the session is
+        processed nothing else is requested. Rejected invoices are taken from the
+        failed list, fetched only when the counters report failures. Accepted
+        invoices need their KSeF number, which only the session invoice listing
+        returns: it is read only for invoices still lacking one and stops as soon
+        as all of them are found. Once the session is complete, the remaining
+        invoices that already have a KSeF number are accepted in a single write.
+        """
+        moves_by_reference = {move.ksef_reference: move for move in self}
+
+        session = session_status.get_status() or {}
+        invoice_count = session.get('invoiceCount') or 0
+        failed_count = session.get('failedInvoiceCount') or 0
+        successful_count = session.get('successfulInvoiceCount') or 0
+        if not failed_count and not successful_count:
+            _logger.info(f'KSeF session {session_status.session_reference}: no invoice processed yet')
+            return
+        complete = invoice_count and successful_count + failed_count >= invoice_count
+
+        if failed_count:
+            for status in session_status.iter_failed_invoices():
+                move = moves_by_reference.pop(status.get('referenceNumber'), None)
+                if move:
+                    move.write(move._prepare_ksef_status_vals(status))
+                if not moves_by_reference:
+                    return
+            if complete and not successful_count:
+                return
+
+        if complete:
+            numbered_moves = self.browse([move.id for move in moves_by_reference.values() if move.ksef_number])
+            if numbered_moves:
+                numbered_moves.write({
+                    'ksef_status': 'accepted',
+                    'ksef_status_code': 200,
+                    'ksef_status_description': 'Sukces',
+                })
+            moves_by_reference = {
+                reference: move for reference, move in moves_by_reference.items() if not move.ksef_number
+            }
+            if not moves_by_reference:
+                return
+
+        # KSeF numbers (or the status of a session still processing): one paginated listing
+        for status in session_status.iter_invoices():
+            move = moves_by_reference.pop(status.get('referenceNumber'), None)
+            if move:
+                move.write(move._prepare_ksef_status_vals(status))
+            if not moves_by_reference:
+                break
+
+        if moves_by_reference:
+            _logger.warning(
+                f'KSeF session {session_status.session_reference}: '
+                f'{len(moves_by_reference)} invoice(s) not listed yet')
+
     @api.model
     def _cron_check_ksef_pending(self):
         """Cron job to check status of pending KSeF invoices"""
@@ -181,41 +741,293 @@ class AccountMove(models.Model):
 
         _logger.info(f'Checking {len(pending_invoices)} pending KSeF invoices')
 
-        for invoice in pending_invoices:
+        # Invoices sent before ksef_session_reference was stored are checked one by one
+        for invoice in pending_invoices.filtered(lambda m: not m.ksef_session_reference):
             try:
                 invoice.action_check_ksef_status()
             except Exception as e:
                 _logger.error(f'Failed to check KSeF status for invoice {invoice.name}: {e}')
 
+        # Access token reused across companies with the same KSeF token and across cron runs,
+        # one paginated listing per session
+        session_invoices = pending_invoices.filtered('ksef_session_reference')
+        for company in session_invoices.company_id:
+            try:
+                session_invoices.filtered(lambda m: m.company_id == company)._ksef_reconcile_sessions()
+            except Exception as e:
+                _logger.error(f'Failed to check KSeF status for company {company.name}: {e}')
+
+    def _ksef_render_visualizations(self, with_pdf=False):
+        """
+        Attach human-readable copies (styl.xsl HTML, optionally PDF) of the FA XML
+        generated for these invoices. Rendered in this worker; all documents share
+        one compiled stylesheet per thread.
+        """
+        from ..ksef_client import visualization
+
+        records = self.with_context(bin_size=False).read(['name', 'ksef_xml_cache'])
+        records = [record for record in records if record['ksef_xml_cache']]
+        if not records:
+            return self.env['ir.attachment']
+
+        contents = [base64.b64decode(record['ksef_xml_cache']) for record in records]
+        htmls = visualization.render_batch(contents)
+        description = 'KSeF invoice visualization (styl.xsl)'
+        if visualization.local_stylesheets():
+            description = 'KSeF invoice visualization (styl.xsl with non-official local templates)'
+
+        attachment_vals = []
+        for record, html in zip(records, htmls):
+            if html is None:
+                _logger.error(f'KSeF visualization of invoice {record["name"]} failed')
+                continue
+            file_name = f'KSeF_{record["name"].replace("/", "_")}'
+            attachment_vals.append({
+                'name': f'{file_name}.html',
+                'type': 'binary',
+                'raw': html,
+                'res_model': 'account.move',
+                'res_id': record['id'],
+                'mimetype': 'text/html',
+                'description': description,
+            })
+            if with_pdf:
+                pdf = self.env['ir.actions.report']._run_wkhtmltopdf([html.decode('utf-8')])
+                attachment_vals.append({
+                    'name': f'{file_name}.pdf',
+                    'type': 'binary',
+                    'raw': pdf,
+                    'res_model': 'account.move',
+                    'res_id': record['id'],
+                    'mimetype': 'application/pdf',
+                    'description': description,
+                })
+
+        _logger.info(f'Rendered KSeF visualization for {len(attachment_vals)} of {len(self)} invoices')
+        return self.env['ir.attachment'].create(attachment_vals)
+
+    def action_ksef_render_visualization(self):
+        """Server action: visualization attachments for the selected invoices"""
+        attachments = self._ksef_render_visualizations(
+            with_pdf=self.env.context.get('ksef_visualization_pdf', False),
+        )
+        message = _('%s visualization file(s) attached.') % len(attachments)
+        rendered_ids = set(attachments.mapped('res_id'))
+        failed = self.filtered(lambda m: m.id not in rendered_ids)
+        if failed:
+            message += '\n' + _('No visualization for: %s (missing FA XML or stylesheet, see server log)') % \
+                ', '.join(failed.mapped('name'))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('KSeF Visualization'),
+                'message': message,
+                'type': 'warning' if failed else 'info',
+                'sticky': bool(failed),
+            }
+        }
+
+    def _ksef_fetch_session_upo(self):
+        """Attach UPO to one company's accepted invoices, downloading each session's UPO once"""
+        from ..ksef_client import auth, invoice as ksef_invoice, upo as ksef_upo
+
+        company = self.company_id
+        company.ensure_one()
+
+        config = self.env['ksef.config'].get_config(company.id)
+        access_token = auth.get_access_token(config.api_url, config.ksef_token)
+        if not access_token:
+            raise UserError(_('Failed to authenticate with KSeF API'))
+
+        moves_by_session = {}
+        for move in self:
+            moves_by_session.setdefault(move.ksef_session_reference, self.browse())
+            moves_by_session[move.ksef_session_reference] |= move
+
+        attachment_vals = []
+        received_ids = set()
+        for session_reference, moves in moves_by_session.items():
+            session_status = ksef_invoice.SessionStatus(config.api_url, access_token, session_reference)
+
+            # UPO is generated only after the session is closed and processed
+            session = session_status.get_status() or {}
+            pages = (session.get('upo') or {}).get('pages') or []
+            if not pages:
+                continue
+
+            contents = session_status.download_upo_pages(pages)
+            if contents is None:
+                continue
+
+            moves_by_ksef_number = {move.ksef_number: move for move in moves if move.ksef_number}
+            moves_by_name = {move.name: move for move in moves}
+            # The signed UPO page is attached unchanged to every invoice it lists
+            for page_number, content in enumerate(contents, 1):
+                for document in ksef_upo.session_upo_documents(content):
+                    move = (moves_by_ksef_number.get(document['ksef_number'])
+                            or moves_by_name.get(document['invoice_number']))
+                    if not move or move.id in received_ids:
+                        continue
+
+                    if not move.ksef_number and document['ksef_number']:
+                        move.ksef_number = document['ksef_number']
+
+                    received_ids.add(move.id)
+                    attachment_vals.append({
+                        'name': f'UPO_{move.name.replace("/", "_")}.xml',
+                        'type': 'binary',
+                        'raw': content,
+                        'res_model': 'account.move',
+                        'res_id': move.id,
+                        'mimetype': 'application/xml',
+                        'description': f'KSeF session UPO (page {page_number}/{len(contents)}) - '
+                                       f'Session: {session_reference}, KSeF Number: {document["ksef_number"]}',
+                    })
+
+        if attachment_vals:
+            self.env['ir.attachment'].create(attachment_vals)
+            self.browse(list(received_ids)).write({'ksef_upo_received': True})
+            _logger.info(f'Attached KSeF UPO to {len(received_ids)} invoices')
+
+    @api.model
+    def _cron_fetch_ksef_upo(self):
+        """Cron job attaching session UPO to accepted KSeF invoices"""
+        invoices = self.search([
+            ('ksef_status', '=', 'accepted'),
+            ('ksef_session_reference', '!=', False),
+            ('ksef_upo_received', '=', False),
+        ])
+
+        for company in invoices.company_id:
+            try:
+                invoices.filtered(lambda m: m.company_id == company)._ksef_fetch_session_upo()
+            except Exception as e:
+                _logger.error(f'Failed to fetch KSeF UPO for company {company.name}: {e}')
+
+    def _ksef_schedule_poll(self):
+        """Schedule the next background status poll with a growing interval"""
+        now = fields.Datetime.now()
+        moves_by_count = {}
+        for move in self:
+            moves_by_count.setdefault(move.ksef_poll_count, self.browse())
+            moves_by_count[move.ksef_poll_count] |= move
+
+        next_polls = []
+        for poll_count, moves in moves_by_count.items():
+            if poll_count >= len(KSEF_POLL_INTERVALS):
+                moves.write({'ksef_next_poll': False})
+                continue
+            next_poll = now + timedelta(seconds=KSEF_POLL_INTERVALS[poll_count])
+            moves.write({'ksef_next_poll': next_poll, 'ksef_poll_count': poll_count + 1})
+            next_polls.append(next_poll)
+
+        if next_polls:
+            self.env.ref('bio_ksef2.ir_cron_ksef_poll_status')._trigger(at=min(next_polls))
+
+    def _ksef_notify_status(self):
+        """Push the final KSeF status to the user who sent the invoice"""
+        for move in self.filtered('ksef_sent_by_id'):
+            if move.ksef_status == 'accepted':
+                message = _('Invoice %s accepted by KSeF.\nKSeF Number: %s') % (move.name, move.ksef_number)
+                msg_type = 'success'
+            else:
+                message = _('Invoice %s rejected by KSeF!\nReason: %s') % (move.name, move.ksef_status_description)
+                msg_type = 'danger'
+
+            self.env['bus.bus']._sendone(move.ksef_sent_by_id.partner_id, 'simple_notification', {
+                'title': _('KSeF Submission'),
+                'message': message,
+                'type': msg_type,
+                'sticky': msg_type != 'success',
+            })
+
+    @api.model
+    def _cron_poll_ksef_status(self):
+        """Cron job completing the status of freshly sent invoices in the background"""
+        due_invoices = self.search([
+            ('ksef_status', '=', 'pending'),
+            ('ksef_session_reference', '!=', False),
+            ('ksef_next_poll', '!=', False),
+            ('ksef_next_poll', '<=', fields.Datetime.now()),
+        ])
+
+        for company in due_invoices.company_id:
+            try:
+                due_invoices.filtered(lambda m: m.company_id == company)._ksef_reconcile_sessions()
+            except Exception as e:
+                _logger.error(f'Failed to poll KSeF status for company {company.name}: {e}')
+
+        # Finished invoices were already unscheduled and notified by _ksef_reconcile_sessions
+        due_invoices.filtered(lambda m: m.ksef_status == 'pending')._ksef_schedule_poll()
+
     def _get_delivery_note_number(self):
         """Get delivery note number from last stock picking of related sale order"""
         self.ensure_one()
+        return self._get_delivery_note_numbers().get(self.id, False)
 
-        # Get sale order from invoice lines
-        sale_orders = self.mapped('invoice_line_ids.sale_line_ids.order_id')
-        if not sale_orders:
-            return False
+    def _get_delivery_note_numbers(self):
+        """
+        Delivery note numbers for the whole recordset
+
+        The sale order of every move (first order of its lines) is resolved from
+        prefetched lines; the latest done outgoing picking of all those orders is
+        then read in one query.
+
+        Returns:
+            {move.id: picking name} - moves without a delivery are omitted
+        """
+        # Sale orders / deliveries exist only with sale_stock installed
+        if 'sale_line_ids' not in self.env['account.move.line']._fields or 'stock.picking' not in self.env \
+                or 'sale_id' not in self.env['stock.picking']._fields:
+            return {}
 
-        # Get last delivery (stock.picking) from sale order
-        sale_order = sale_orders[0]
-        pickings = sale_order.picking_ids.filtered(
-            lambda p: p.picking_type_code == 'outgoing' and p.state == 'done'
-        ).sorted(key=lambda p: p.date_done, reverse=True)
+        # Get sale order from invoice lines
+        move_orders = {}
+        for move in self:
+            sale_orders = move.invoice_line_ids.sale_line_ids.order_id
+            if sale_orders:
+                move_orders[move.id] = sale_orders[0].id
+        if not move_orders:
+            return {}
 
-        if pickings:
-            return pickings[0].name
+        # Get last delivery (stock.picking) of every sale order
+        self.env['stock.picking'].flush_model(['sale_id', 'picking_type_id', 'state', 'date_done', 'name'])
+        self.env['stock.picking.type'].flush_model(['code'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (p.sale_id) p.sale_id, p.name
+              FROM stock_picking p
+              JOIN stock_picking_type t ON t.id = p.picking_type_id
+             WHERE p.sale_id IN %s
+               AND p.state = 'done'
+               AND t.code = 'outgoing'
+          ORDER BY p.sale_id, p.date_done DESC NULLS LAST, p.id DESC
+        """, [tuple(set(move_orders.values()))])
+        order_notes = dict(self.env.cr.fetchall())
 
-        return False
+        return {
+            move_id: order_notes[order_id]
+            for move_id, order_id in move_orders.items()
+            if order_id in order_notes
+        }
 
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to auto-populate delivery_note_number"""
         moves = super(AccountMove, self).create(vals_list)
 
-        for move in moves:
-            if move.move_type in ('out_invoice', 'out_refund') and not move.delivery_note_number:
-                delivery_note = move._get_delivery_note_number()
-                if delivery_note:
-                    move.delivery_note_number = delivery_note
+        customer_moves = moves.filtered(
+            lambda m: m.move_type in ('out_invoice', 'out_refund') and not m.delivery_note_number
+        )
+        delivery_notes = customer_moves._get_delivery_note_numbers() if customer_moves else {}
+        # One write per delivery note (usually one per sale order), not per move
+        moves_by_note = {}
+        for move in customer_moves:
+            note = delivery_notes.get(move.id)
+            if note:
+                moves_by_note.setdefault(note, self.browse())
+                moves_by_note[note] |= move
+        for note, note_moves in moves_by_note.items():
+            note_moves.write({'delivery_note_number': note})
 
         return moves
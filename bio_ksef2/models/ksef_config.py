@@ -44,6 +44,13 @@ class KSefConfig(models.Model):
         default=False,
         help='Automatically send invoices to KSeF upon validation',
     )
+    use_http2 = fields.Boolean(
+        string='Use HTTP/2',
+        default=False,
+        help='Multiplex KSeF API calls over one HTTP/2 connection (needs httpx[http2]).\n'
+             'The connection pool is shared by the whole server process, so HTTP/2 is used '
+             'when any active configuration enables it.',
+    )
     fa_version = fields.Selection(
         [
             ('FA2', 'FA(2) - ONLY working format'),
@@ -78,6 +85,8 @@ class KSefConfig(models.Model):
     def create(self, vals_list):
         """Set has_ksef_config flag on company when config is created"""
         records = super().create(vals_list)
+        if any(vals.get('use_http2') for vals in vals_list):
+            self._configure_transport()
         # Skip updating company flag during module install/upgrade
         if not self.env.context.get('module_install', False):
             for record in records:
@@ -92,6 +101,8 @@ class KSefConfig(models.Model):
     def write(self, vals):
         """Update has_ksef_config flag when active status changes"""
         result = super().write(vals)
+        if 'use_http2' in vals or 'active' in vals:
+            self._configure_transport()
         # Skip updating company flag during module install/upgrade
         if not self.env.context.get('module_install', False):
             if 'active' in vals or 'company_id' in vals:
@@ -128,6 +139,17 @@ class KSefConfig(models.Model):
                     pass
         return result
 
+    def _register_hook(self):
+        super()._register_hook()
+        self._configure_transport()
+
+    @api.model
+    def _configure_transport(self):
+        """Applies use_http2 of the active configurations to the shared KSeF HTTP client"""
+        from ..ksef_client import transport
+
+        transport.configure(http2=bool(self.sudo().search_count([('use_http2', '=', True)])))
+
     @api.model
     def _init_company_ksef_flags(self):
         """Initialize has_ksef_config flags for all companies.
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from . import test_invoice_data
+from . import test_reconcile_session
+from . import test_visualization
+from . import test_xsd_validator
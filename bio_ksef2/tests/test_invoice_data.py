@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from odoo import Command
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestKsefInvoiceData(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.company_data['company'].vat = '5261040828'
+        partners = cls.env['res.partner'].create([
+            {'name': f'Nabywca {idx}', 'vat': f'70100021{idx:02d}'} for idx in range(5)
+        ])
+        products = cls.product_a | cls.product_b
+        # 300 invoices x 3 lines: lines of the whole batch stay within one ORM prefetch batch (1,000)
+        cls.invoices = cls.env['account.move'].create([{
+            'move_type': 'out_invoice',
+            'partner_id': partners[idx % len(partners)].id,
+            'invoice_date': '2026-01-31',
+            'invoice_payment_term_id': cls.pay_terms_a.id,
+            'invoice_line_ids': [Command.create({
+                'product_id': products[(idx + line) % len(products)].id,
+                'quantity': 1 + (idx + line) % 3,
+                'price_unit': 10.0 + (idx + line) % 7,
+                'tax_ids': [Command.set(products[(idx + line) % len(products)].taxes_id.ids)],
+            }) for line in range(3)],
+        } for idx in range(300)])
+
+    def _prepare(self, invoices):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        return invoices._ksef_prepare_invoice_data()
+
+    def test_query_count_does_not_grow_with_batch(self):
+        # Warm-up: registry/ormcache queries are not part of the per-batch cost
+        self._prepare(self.invoices[:1])
+
+        start = self.cr.sql_log_count
+        self._prepare(self.invoices[:1])
+        single_count = self.cr.sql_log_count - start
+
+        with self.assertQueryCount(single_count):
+            result = self._prepare(self.invoices[:1])
+        self.assertEqual(len(result), 1)
+
+        with self.assertQueryCount(single_count):
+            result = self._prepare(self.invoices)
+        self.assertEqual(len(result), 300)
+        self.assertEqual(len(result[self.invoices[-1].id]['lines']), 3)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+class SessionStatusDouble:
+    """Records which SessionStatus requests _ksef_reconcile_session makes"""
+
+    session_reference = 'SESSION-1'
+
+    def __init__(self, session, failed=(), invoices=()):
+        self.session = session
+        self.failed = list(failed)
+        self.invoices = list(invoices)
+        self.calls = []
+
+    def get_status(self):
+        self.calls.append('status')
+        return self.session
+
+    def iter_failed_invoices(self):
+        self.calls.append('failed')
+        return iter(self.failed)
+
+    def iter_invoices(self):
+        self.calls.append('invoices')
+        return iter(self.invoices)
+
+
+@tagged('post_install', '-at_install')
+class TestKsefReconcileSession(AccountTestInvoicingCommon):
+
+    def setUp(self):
+        super().setUp()
+        self.moves = self.env['account.move']
+        for idx in range(3):
+            move = self.init_invoice('out_invoice', products=self.product_a)
+            move.write({
+                'ksef_status': 'pending',
+                'ksef_reference': f'REF-{idx}',
+                'ksef_session_reference': SessionStatusDouble.session_reference,
+            })
+            self.moves |= move
+
+    def _status(self, reference, code, ksef_number=None):
+        return {
+            'referenceNumber': reference,
+            'ksefNumber': ksef_number,
+            'status': {'code': code, 'description': 'Sukces' if code == 200 else 'Błąd'},
+        }
+
+    def test_nothing_processed_reads_counters_only(self):
+        session = SessionStatusDouble({'invoiceCount': 3, 'successfulInvoiceCount': 0, 'failedInvoiceCount': 0})
+        self.moves._ksef_reconcile_session(session)
+        self.assertEqual(session.calls, ['status'])
+        self.assertEqual(set(self.moves.mapped('ksef_status')), {'pending'})
+
+    def test_all_failed_uses_failed_list_only(self):
+        session = SessionStatusDouble(
+            {'invoiceCount': 3, 'successfulInvoiceCount': 0, 'failedInvoiceCount': 3},
+            failed=[self._status(f'REF-{idx}', 450) for idx in range(3)],
+        )
+        self.moves._ksef_reconcile_session(session)
+        self.assertEqual(session.calls, ['status', 'failed'])
+        self.assertEqual(set(self.moves.mapped('ksef_status')), {'rejected'})
+
+    def test_failed_then_numbers_from_listing(self):
+        session = SessionStatusDouble(
+            {'invoiceCount': 3, 'successfulInvoiceCount': 2, 'failedInvoiceCount': 1},
+            failed=[self._status('REF-0', 450)],
+            invoices=[
+                self._status('REF-0', 450),
+                self._status('REF-1', 200, 'KSEF-1'),
+                self._status('REF-2', 200, 'KSEF-2'),
+            ],
+        )
+        self.moves._ksef_reconcile_session(session)
+        self.assertEqual(session.calls, ['status', 'failed', 'invoices'])
+        self.assertEqual(self.moves.mapped('ksef_status'), ['rejected', 'accepted', 'accepted'])
+        self.assertEqual(self.moves[1:].mapped('ksef_number'), ['KSEF-1', 'KSEF-2'])
+
+    def test_complete_session_with_numbers_bulk_accepts(self):
+        for idx, move in enumerate(self.moves):
+            move.ksef_number = f'KSEF-{idx}'
+        session = SessionStatusDouble({'invoiceCount': 3, 'successfulInvoiceCount': 3, 'failedInvoiceCount': 0})
+        self.moves._ksef_reconcile_session(session)
+        self.assertEqual(session.calls, ['status'])
+        self.assertEqual(set(self.moves.mapped('ksef_status')), {'accepted'})
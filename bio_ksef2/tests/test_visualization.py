@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import TransactionCase, tagged
+
+from ..ksef_client import visualization
+from ..ksef_client.invoice import create_sample_invoice_xml
+from ..ksef_client.xml_generator import FORMAT_PARAMS
+
+
+@tagged('post_install', '-at_install')
+class TestVisualization(TransactionCase):
+
+    def _sample_xml(self, format_version='FA2'):
+        content = create_sample_invoice_xml(
+            'FV/2026/0001', '5261040828', 'Sprzedawca Sp. z o.o.', '7010002137', 'Nabywca S.A.',
+            100.0, 123.0, 23.0, issue_date='2026-01-31',
+        )
+        # The sample is FA(2); FA(3) keeps the elements it uses
+        return content.replace(FORMAT_PARAMS['FA2'][0], FORMAT_PARAMS[format_version][0]).encode('utf-8')
+
+    def test_stylesheets_compile_offline(self):
+        for format_version, (namespace, *_) in FORMAT_PARAMS.items():
+            with self.subTest(format_version=format_version):
+                self.assertIsNotNone(visualization.get_transform(namespace))
+
+    def test_render_sample_invoice(self):
+        for format_version in FORMAT_PARAMS:
+            with self.subTest(format_version=format_version):
+                html = visualization.render_html(self._sample_xml(format_version)).decode('utf-8')
+                self.assertIn('<html', html)
+                self.assertIn('FV/2026/0001', html)
+                self.assertIn('Faktura podstawowa', html)
+                self.assertIn('5261040828', html)
+
+    def test_render_unknown_namespace(self):
+        self.assertIsNone(visualization.render_html(b'<Faktura xmlns="urn:unknown"/>'))
+
+    def test_local_substitutes_labelled(self):
+        # docs/FA2/styl.local.xsl and the MF common templates are not official files
+        self.assertEqual(
+            visualization.local_stylesheets(),
+            ['WspolneSzablonyWizualizacji_v12-0E.local.xsl', 'styl.local.xsl'],
+        )
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import TransactionCase, tagged
+
+from ..ksef_client import xsd_validator
+from ..ksef_client.invoice import create_sample_invoice_xml
+from ..ksef_client.xml_generator import FORMAT_PARAMS
+
+
+@tagged('post_install', '-at_install')
+class TestXsdValidator(TransactionCase):
+
+    def _sample_xml(self, seller_nip='5261040828'):
+        return create_sample_invoice_xml(
+            'FV/2026/0001', seller_nip, 'Sprzedawca Sp. z o.o.', '7010002137', 'Nabywca S.A.',
+            100.0, 123.0, 23.0, issue_date='2026-01-31',
+        )
+
+    def test_fa2_schema_compiles_offline(self):
+        namespace = FORMAT_PARAMS['FA2'][0]
+        self.assertIsNotNone(xsd_validator.get_schema(namespace))
+
+    def test_valid_invoice(self):
+        self.assertIsNone(xsd_validator.validate_xml(self._sample_xml().encode('utf-8')))
+
+    def test_unexpected_element_rejected(self):
+        content = self._sample_xml().replace('<P_15>', '<Foo/><P_15>').encode('utf-8')
+        result = xsd_validator.validate_xml(content)
+        self.assertEqual(result['status']['code'], xsd_validator.INVALID_XML_CODE)
+        self.assertIn('Foo', result['status']['details'][0])
+
+    def test_empty_form_rejected(self):
+        content = f'<Faktura xmlns="{FORMAT_PARAMS["FA2"][0]}"><Foo/></Faktura>'.encode('utf-8')
+        self.assertIsNotNone(xsd_validator.validate_xml(content))
+
+    def test_definition_types_checked(self):
+        # TNrNIP comes from the imported MF definition schema
+        content = self._sample_xml(seller_nip='0123456789').encode('utf-8')
+        self.assertIsNotNone(xsd_validator.validate_xml(content))
+
+    def test_malformed_xml_rejected(self):
+        result = xsd_validator.validate_xml(b'<Faktura>')
+        self.assertEqual(result['status']['code'], xsd_validator.INVALID_XML_CODE)
+
+    def test_fa2_compiled_with_local_stubs(self):
+        # docs/MF only holds non-official stubs of the MF definition schemas
+        self.assertEqual(xsd_validator.schema_source(FORMAT_PARAMS['FA2'][0]), xsd_validator.SOURCE_LOCAL)
+
+    def test_fa3_not_validated(self):
+        self.assertIsNone(xsd_validator.schema_source(FORMAT_PARAMS['FA3'][0]))
@@ -0,0 +1,63 @@
+"""Invoice metadata as attrs models vs ksef.columnar: decode time, memory, totals
+
+    python benchmarks/bench_columnar.py [records]
+"""
+import gc
+import sys
+import tracemalloc
+
+from payloads import invoice_metadata_page, timeit
+
+from ksef import converters
+from ksef.columnar import InvoiceMetadataColumns
+from ksef.models import QueryInvoicesMetadataResponse
+
+
+def retained(build):
+    """Bytes still allocated by the result of build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def totals_from_models(invoices):
+    totals = {}
+    for invoice in invoices:
+        key = (invoice.seller.nip, invoice.currency)
+        sums = totals.setdefault(key, [0, 0, 0, 0])
+        sums[0] += 1
+        sums[1] += round(invoice.net_amount * 100)
+        sums[2] += round(invoice.vat_amount * 100)
+        sums[3] += round(invoice.gross_amount * 100)
+    return totals
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    page = invoice_metadata_page(records)
+
+    convert = converters.get_converter(QueryInvoicesMetadataResponse)
+    invoices = convert(page).invoices
+    table = InvoiceMetadataColumns.from_pages([page])
+    assert len(table) == len(invoices)
+
+    print(f"{records:,} InvoiceMetadata records")
+    print(f"{'':<28} {'decode ms':>10} {'retained MB':>12} {'totals ms':>10}")
+    rows = (
+        ("generated from_dict", lambda: QueryInvoicesMetadataResponse.from_dict(page), None),
+        ("converters (attrs models)", lambda: convert(page), lambda: totals_from_models(invoices)),
+        ("columnar", lambda: InvoiceMetadataColumns.from_pages([page]), table.totals_by_seller),
+    )
+    for name, build, totals in rows:
+        decode_ms = timeit(build) * 1000
+        retained_mb = retained(build) / 2 ** 20
+        totals_ms = f"{timeit(totals) * 1000:>10.1f}" if totals else f"{'-':>10}"
+        print(f"{name:<28} {decode_ms:>10.1f} {retained_mb:>12.1f} {totals_ms}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Records per second of the generated from_dict vs ksef.converters
+
+    python benchmarks/bench_from_dict.py [records]
+"""
+import sys
+
+from payloads import invoice_metadata_page, person_permissions_page, session_invoices_page, timeit
+
+from ksef import converters
+from ksef.models import QueryInvoicesMetadataResponse, QueryPersonPermissionsResponse, SessionInvoicesResponse
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    cases = (
+        ("InvoiceMetadata", QueryInvoicesMetadataResponse, invoice_metadata_page(records)),
+        ("SessionInvoiceStatusResponse", SessionInvoicesResponse, session_invoices_page(records)),
+        ("PersonPermission", QueryPersonPermissionsResponse, person_permissions_page(records)),
+    )
+
+    print(f"{'model':<30} {'generated rec/s':>16} {'converters rec/s':>17} {'speedup':>8}")
+    for name, cls, page in cases:
+        convert = converters.get_converter(cls)
+        assert convert(page) == cls.from_dict(page)
+
+        generated = timeit(lambda: cls.from_dict(page))
+        compiled = timeit(lambda: convert(page))
+        print(f"{name:<30} {records / generated:>16,.0f} {records / compiled:>17,.0f} {generated / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Concurrent KSeF calls over HTTP/1.1 vs HTTP/2 against a local test server
+
+Sends N requests (asyncio tasks, then a thread pool sharing one client) with
+at most 100 in flight and 100 connections, and reports wall time, TCP+TLS
+connections opened and the protocol. Over HTTP/1.1 each in-flight request
+holds its own connection; over HTTP/2 they share one. The asyncio HTTP/1.1
+row is mostly httpcore pool bookkeeping, which grows with the number of
+open connections.
+The last row runs an HTTP/2 client against a server that only offers
+HTTP/1.1 (ALPN fallback).
+
+    python benchmarks/bench_http2.py [requests] [latency ms] [threads]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from h2server import TestServer
+from payloads import timeit  # noqa: F401 - puts the ksef package on sys.path
+
+from ksef import AuthenticatedClient
+
+MAX_CONNECTIONS = 100
+PATH = "/api/v2/sessions/20251009-SO-0000000000-0000000000-00"
+
+
+def client(server, http2):
+    # keep every HTTP/1.1 connection alive (httpx keeps 20 by default and reconnects above that)
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    return AuthenticatedClient(base_url=server.url, token="token", http2=http2, verify_ssl=server.certificate,
+                               httpx_args={"limits": limits})
+
+
+def run_async(server, http2, count):
+    async def main():
+        async with client(server, http2) as ksef:
+            httpx_client = ksef.get_async_httpx_client()
+            # requests queued in the HTTP/1.1 pool beyond max_connections are served very unevenly
+            in_flight = asyncio.Semaphore(MAX_CONNECTIONS)
+
+            async def get():
+                async with in_flight:
+                    return await httpx_client.get(PATH)
+            responses = await asyncio.gather(*(get() for _ in range(count)))
+        return {response.http_version for response in responses}
+    return asyncio.run(main())
+
+
+def run_threads(server, http2, count, threads):
+    with client(server, http2) as ksef:
+        httpx_client = ksef.get_httpx_client()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            responses = list(executor.map(lambda _: httpx_client.get(PATH), range(count)))
+    return {response.http_version for response in responses}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    print(f"{count} requests, server latency {latency * 1000:.0f} ms, {threads} threads")
+    print(f"{'mode':<34} {'wall s':>7} {'connections':>12} {'protocol':>10}")
+
+    cases = (
+        ("asyncio, HTTP/1.1", True, False, lambda server, http2: run_async(server, http2, count)),
+        ("asyncio, HTTP/2", True, True, lambda server, http2: run_async(server, http2, count)),
+        (f"{threads} threads, HTTP/1.1", True, False, lambda server, http2: run_threads(server, http2, count, threads)),
+        (f"{threads} threads, HTTP/2", True, True, lambda server, http2: run_threads(server, http2, count, threads)),
+        ("asyncio, HTTP/2 -> HTTP/1.1 server", False, True, lambda server, http2: run_async(server, http2, count)),
+    )
+    for mode, server_http2, http2, run in cases:
+        with TestServer(latency=latency, http2=server_http2) as server:
+            start = time.perf_counter()
+            protocols = run(server, http2)
+            elapsed = time.perf_counter() - start
+            assert server.requests == count
+            print(f"{mode:<34} {elapsed:>7.2f} {server.connections:>12} {','.join(sorted(protocols)):>10}")
+
+
+if __name__ == "__main__":
+    main()
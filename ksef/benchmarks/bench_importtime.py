@@ -0,0 +1,78 @@
+"""Import-time benchmark / regression guard for the lazy ksef.models and ksef.api packages
+
+Runs ``python -X importtime -c <statement>`` in a fresh interpreter and reports how
+many generated model modules were imported and how long the ksef packages took.
+
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --max-model-modules 10 --max-ms 150
+
+Exits with status 1 when a limit is exceeded, so it can run in CI.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+KSEF_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = (
+    "import ksef.models",
+    "from ksef.models import AuthenticationChallengeResponse",
+    "from ksef.api.auth import post_api_v2_auth_challenge",
+)
+
+
+def importtime(statement):
+    """Returns {module: (self_us, cumulative_us, depth)} for one fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [KSEF_ROOT, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--statement", action="append", help="import statement(s) to measure")
+    parser.add_argument("--max-model-modules", type=int, default=None,
+                        help="fail if a statement imports more ksef.models.* modules")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if the ksef packages take longer (cumulative, ms)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'statement':<60} {'models':>7} {'modules':>8} {'ksef ms':>9}")
+    for statement in args.statement or STATEMENTS:
+        modules = importtime(statement)
+        model_modules = sum(1 for name in modules if name.startswith("ksef.models."))
+        ksef_modules = sum(1 for name in modules if name == "ksef" or name.startswith("ksef."))
+        # Lazily loaded modules are logged at depth 0 once their package is imported;
+        # every depth-0 ksef entry carries the cost of what it imported
+        ksef_ms = sum(
+            cumulative for name, (_, cumulative, depth) in modules.items()
+            if depth == 0 and (name == "ksef" or name.startswith("ksef."))
+        ) / 1000
+        print(f"{statement:<60} {model_modules:>7} {ksef_modules:>8} {ksef_ms:>9.1f}")
+
+        if args.max_model_modules is not None and model_modules > args.max_model_modules:
+            print(f"  FAIL: {model_modules} model modules imported (limit {args.max_model_modules})")
+            failed = True
+        if args.max_ms is not None and ksef_ms > args.max_ms:
+            print(f"  FAIL: {ksef_ms:.1f} ms (limit {args.max_ms} ms)")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Per-request cost of the instrumentation hooks
+
+Calls ``get_api_v_2_sessions_reference_number`` through an ``httpx.MockTransport``
+returning a streamed body (as a network transport does), with and without
+``instrumentation=``, and reports microseconds per call.
+
+    python benchmarks/bench_instrumentation.py [calls]
+"""
+import sys
+
+import httpx
+from payloads import timeit
+
+from ksef import AuthenticatedClient
+from ksef.api.status import get_api_v_2_sessions_reference_number
+from ksef.instrumentation import Instrumentation
+
+BODY = b'{"status": {"code": 200, "description": "Sesja aktywna"}, "invoiceCount": 1}'
+
+
+class Body(httpx.SyncByteStream):
+    def __iter__(self):
+        yield BODY
+
+
+def handler(request):
+    return httpx.Response(200, headers={"Content-Type": "application/json"}, stream=Body())
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{calls} calls")
+    baseline = None
+    for mode, instrumentation in (("disabled", None), ("enabled", Instrumentation())):
+        client = AuthenticatedClient(base_url="https://ksef-test.mf.gov.pl", token="token",
+                                     instrumentation=instrumentation,
+                                     httpx_args={"transport": httpx.MockTransport(handler)})
+
+        def run():
+            for _ in range(calls):
+                get_api_v_2_sessions_reference_number.sync_detailed("20251009-SO-0000000000-0000000000-00",
+                                                                    client=client)
+
+        per_call = timeit(run) / calls * 1e6
+        baseline = baseline or per_call
+        print(f"{mode:<9} {per_call:8.1f} us/call  (+{per_call - baseline:.1f} us)")
+        if instrumentation is not None:
+            endpoint = instrumentation.snapshot()["endpoints"][0]
+            print(f"          recorded {endpoint['count']} x {endpoint['method']} {endpoint['endpoint']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Wall time of paging with and without prefetching
+
+Pages come from an ``httpx.MockTransport`` that answers after a simulated
+network latency; the consumer spends a simulated processing time per item
+(I/O such as database writes, so it releases the GIL like real I/O would).
+
+    python benchmarks/bench_pagination.py [pages] [latency ms] [processing us per item]
+"""
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+from payloads import session_invoices_page
+
+from ksef import AuthenticatedClient
+from ksef.api.status import get_api_v_2_sessions_reference_number_invoices
+from ksef.pagination import paginate
+
+PAGE_SIZE = 1000
+# Simulated processing is applied per batch of items (per-item event loop sleeps would dominate)
+BATCH = 100
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+    processing = (float(sys.argv[3]) if len(sys.argv) > 3 else 200) / 1e6
+    bodies = [
+        json.dumps(session_invoices_page(PAGE_SIZE, continuation_token=f"token-{i + 1}" if i + 1 < pages else None))
+        .encode()
+        for i in range(pages)
+    ]
+
+    def page_index(request):
+        token = request.headers.get("x-continuation-token")
+        return int(token.rpartition("-")[2]) if token else 0
+
+    def handler(request):
+        time.sleep(latency)
+        return httpx.Response(200, content=bodies[page_index(request)])
+
+    async def async_handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, content=bodies[page_index(request)])
+
+    def client(transport_handler):
+        return AuthenticatedClient(base_url="https://ksef.example", token="token",
+                                   httpx_args={"transport": httpx.MockTransport(transport_handler)})
+
+    def run(prefetch):
+        for count, _ in enumerate(paginate(get_api_v_2_sessions_reference_number_invoices, client=client(handler),
+                                           reference_number="20251009-SO-0000000000-0000000000-00",
+                                           prefetch=prefetch), 1):
+            if count % BATCH == 0:
+                time.sleep(processing * BATCH)
+
+    async def arun(prefetch):
+        count = 0
+        async for _ in paginate(get_api_v_2_sessions_reference_number_invoices, client=client(async_handler),
+                                reference_number="20251009-SO-0000000000-0000000000-00", prefetch=prefetch):
+            count += 1
+            if count % BATCH == 0:
+                await asyncio.sleep(processing * BATCH)
+
+    print(f"{pages} pages x {PAGE_SIZE} items, latency {latency * 1000:.0f} ms, "
+          f"processing {processing * 1e6:.0f} us/item")
+    print(f"{'mode':<20} {'wall s':>8}")
+    for mode, func in (
+        ("sync", lambda: run(False)),
+        ("sync prefetch", lambda: run(True)),
+        ("async", lambda: asyncio.run(arun(False))),
+        ("async prefetch", lambda: asyncio.run(arun(True))),
+    ):
+        start = time.perf_counter()
+        func()
+        print(f"{mode:<20} {time.perf_counter() - start:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Peak memory and latency of buffered vs streamed list responses
+
+Buffered: the generated endpoint path (``response.json()`` + ``from_dict``).
+Streamed: ``ksef.streaming.stream`` with every installed JSON backend.
+Bodies come from an ``httpx.MockTransport`` in 16 KiB chunks.
+
+    python benchmarks/bench_streaming.py [records]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import httpx
+from payloads import invoice_metadata_page, person_permissions_page, session_invoices_page
+
+from ksef import AuthenticatedClient, json_backend, streaming
+from ksef.api.invoices import post_api_v2_invoices_query_metadata
+from ksef.api.permissions import post_api_v2_permissions_query_persons_grants
+from ksef.api.status import get_api_v_2_sessions_reference_number_invoices
+from ksef.models import InvoiceQueryFilters, PersonPermissionsQueryRequest
+
+CHUNK = 16 * 1024
+
+
+def client_for(body):
+    def chunks():
+        for start in range(0, len(body), CHUNK):
+            yield body[start:start + CHUNK]
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+    return AuthenticatedClient(base_url="https://ksef.example", token="token", httpx_args={"transport": transport})
+
+
+def measure(func, repeat=3):
+    """(seconds to first item, total seconds) of the best of ``repeat`` runs, peak MiB of a traced run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        first = func(start)
+        timings.append((first, time.perf_counter() - start))
+
+    tracemalloc.start()
+    func(time.perf_counter())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (*min(timings, key=lambda timing: timing[1]), peak / 2**20)
+
+
+def buffered(endpoint, body, kwargs):
+    def run(start):
+        client = client_for(body)
+        parsed = endpoint.sync(client=client, **kwargs)
+        return time.perf_counter() - start, parsed
+    return lambda start: run(start)[0]
+
+
+def streamed(endpoint, body, kwargs):
+    def run(start):
+        first = None
+        with streaming.stream(endpoint, client=client_for(body), **kwargs) as items:
+            for _ in items:
+                if first is None:
+                    first = time.perf_counter() - start
+        return first
+    return run
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    filters = InvoiceQueryFilters.from_dict({"subjectType": "Subject1",
+                                             "dateRange": {"dateType": "Issue", "from": "2025-10-01T00:00:00Z"}})
+    cases = (
+        ("invoices/query/metadata", post_api_v2_invoices_query_metadata,
+         invoice_metadata_page(records), {"body": filters}),
+        ("sessions/{ref}/invoices", get_api_v_2_sessions_reference_number_invoices,
+         session_invoices_page(records), {"reference_number": "20251009-SO-0000000000-0000000000-00"}),
+        ("permissions/query/persons", post_api_v2_permissions_query_persons_grants,
+         person_permissions_page(records), {"body": PersonPermissionsQueryRequest.from_dict({"queryType": "PermissionsInCurrentContext"})}),
+    )
+    default = json_backend.backend()
+    backends = [name for name in json_backend.BACKENDS if _available(name)]
+
+    print(f"{'endpoint':<26} {'mode':<18} {'first item ms':>14} {'total ms':>9} {'peak MiB':>9}")
+    for name, endpoint, page, kwargs in cases:
+        body = json.dumps(page).encode()
+        runs = [(f"buffered ({backend})", backend, buffered(endpoint, body, kwargs)) for backend in backends]
+        runs += [(f"streamed ({backend})", backend, streamed(endpoint, body, kwargs)) for backend in backends]
+        for mode, backend, run in runs:
+            json_backend.use(backend)
+            first, total, peak = measure(run)
+            print(f"{name:<26} {mode:<18} {first * 1000:>14,.0f} {total * 1000:>9,.0f} {peak:>9.1f}")
+        print(f"{'':<26} body {len(body) / 2**20:.1f} MiB, {records} items")
+    json_backend.use(default)
+
+
+def _available(name):
+    try:
+        json_backend.use(name)
+    except ImportError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Local HTTPS test server speaking HTTP/2 (h2) and HTTP/1.1 (h11), negotiated via ALPN
+
+Every request is answered with a small JSON body after a fixed latency, like a
+KSeF status call. Runs its own event loop in a background thread:
+
+    with TestServer(latency=0.05) as server:
+        server.url, server.connections, server.requests
+"""
+import asyncio
+import datetime
+import ipaddress
+import os
+import ssl
+import tempfile
+import threading
+
+import h11
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+BODY = b'{"status": {"code": 200, "description": "Sesja aktywna"}, "invoiceCount": 1}'
+
+
+def self_signed_certificate(directory):
+    """(certificate path, key path) for localhost / 127.0.0.1"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost"),
+                                                    x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]),
+                       critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    certificate_path = os.path.join(directory, "server.pem")
+    key_path = os.path.join(directory, "server.key")
+    with open(certificate_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return certificate_path, key_path
+
+
+class TestServer:
+    def __init__(self, latency=0.05, http2=True):
+        self.latency = latency
+        self.http2 = http2
+        self.connections = 0
+        self.requests = 0
+        self.protocols = {}
+        self._directory = tempfile.TemporaryDirectory()
+        self.certificate, key = self_signed_certificate(self._directory.name)
+        self._ssl = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self._ssl.load_cert_chain(self.certificate, key)
+        self._ssl.set_alpn_protocols(["h2", "http/1.1"] if http2 else ["http/1.1"])
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self.url = None
+
+    def __enter__(self):
+        self._thread.start()
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._serve, "127.0.0.1", 0, ssl=self._ssl, backlog=1024), self._loop
+        ).result()
+        self._server = server
+        self.url = f"https://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        return self
+
+    def __exit__(self, *args):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._directory.cleanup()
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+        self.protocols = {}
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        protocol = writer.get_extra_info("ssl_object").selected_alpn_protocol() or "http/1.1"
+        self.protocols[protocol] = self.protocols.get(protocol, 0) + 1
+        try:
+            if protocol == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_h11(reader, writer)
+        except (ConnectionError, h11.RemoteProtocolError, h2.exceptions.ProtocolError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h11(self, reader, writer):
+        connection = h11.Connection(h11.SERVER)
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                data = await reader.read(65536)
+                connection.receive_data(data)
+                if not data:
+                    return
+            elif isinstance(event, h11.EndOfMessage):
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                writer.write(b"".join((
+                    connection.send(h11.Response(
+                        status_code=200,
+                        headers=[("content-type", "application/json"), ("content-length", str(len(BODY)))],
+                    )),
+                    connection.send(h11.Data(data=BODY)),
+                    connection.send(h11.EndOfMessage()),
+                )))
+                await writer.drain()
+                if connection.our_state is not h11.DONE or connection.their_state is not h11.DONE:
+                    return
+                connection.start_next_cycle()
+            elif isinstance(event, h11.ConnectionClosed):
+                return
+
+    async def _serve_h2(self, reader, writer):
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        # h2 enforces 100 concurrent streams before the client has seen our SETTINGS
+        connection.local_settings = h2.settings.Settings(client=False, initial_values={
+            h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000,
+            h2.settings.SettingCodes.MAX_HEADER_LIST_SIZE: 65536,
+        })
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+
+        async def respond(stream_id):
+            self.requests += 1
+            await asyncio.sleep(self.latency)
+            connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                                ("content-length", str(len(BODY)))])
+            connection.send_data(stream_id, BODY, end_stream=True)
+            writer.write(connection.data_to_send())
+
+        tasks = set()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.ensure_future(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(connection.data_to_send())
+            await writer.drain()
@@ -0,0 +1,99 @@
+"""Synthetic KSeF API payloads (plain JSON dicts) shared by the benchmarks"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CURRENCIES = ("PLN", "PLN", "PLN", "EUR", "USD")
+INVOICE_TYPES = ("Vat", "Vat", "Vat", "Kor", "Zal")
+
+
+def nip(i):
+    return f"{5260000000 + i * 7919 % 9999999:010d}"
+
+
+def invoice_metadata(i):
+    net = round(100 + i * 37.13 % 10000, 2)
+    vat = round(net * 0.23, 2)
+    metadata = {
+        "ksefNumber": f"{nip(i % 50)}-20251009-{i:010X}-{i % 256:02X}",
+        "invoiceNumber": f"FV/{i}/10/2025",
+        "issueDate": "2025-10-09",
+        "invoicingDate": "2025-10-09T12:34:56.1234567+00:00",
+        "acquisitionDate": "2025-10-09T12:35:01.7654321+00:00",
+        "permanentStorageDate": "2025-10-09T12:35:02.0000001+00:00",
+        "seller": {"nip": nip(i % 50), "name": f"Sprzedawca {i % 50} Sp. z o.o."},
+        "buyer": {"identifier": {"type": "Nip", "value": nip(i % 997 + 1000)}, "name": f"Nabywca {i % 997}"},
+        "netAmount": net,
+        "grossAmount": round(net + vat, 2),
+        "vatAmount": vat,
+        "currency": CURRENCIES[i % len(CURRENCIES)],
+        "invoicingMode": "Online",
+        "invoiceType": INVOICE_TYPES[i % len(INVOICE_TYPES)],
+        "formCode": {"systemCode": "FA (3)", "schemaVersion": "1-0E", "value": "FA"},
+        "isSelfInvoicing": False,
+        "hasAttachment": False,
+        "invoiceHash": "mYd2ZcB7o2gJ0mT3p9m3ZqJ8wq1Q2R3s4T5u6V7w8X8=",
+    }
+    if i % 5 == 3:
+        metadata["hashOfCorrectedInvoice"] = "qZ1ZcB7o2gJ0mT3p9m3ZqJ8wq1Q2R3s4T5u6V7w8X8="
+    return metadata
+
+
+def invoice_metadata_page(count, has_more=False):
+    return {"hasMore": has_more, "isTruncated": False, "invoices": [invoice_metadata(i) for i in range(count)]}
+
+
+def session_invoice_status(i):
+    return {
+        "ordinalNumber": i + 1,
+        "referenceNumber": f"20251009-EE-{i:010X}-{i % 256:02X}",
+        "invoiceHash": "mYd2ZcB7o2gJ0mT3p9m3ZqJ8wq1Q2R3s4T5u6V7w8X8=",
+        "invoicingDate": "2025-10-09T12:34:56.1234567+00:00",
+        "status": {"code": 200, "description": "Sukces"},
+        "invoiceNumber": f"FV/{i}/10/2025",
+        "ksefNumber": f"{nip(1)}-20251009-{i:010X}-{i % 256:02X}",
+        "invoiceFileName": None,
+        "acquisitionDate": "2025-10-09T12:35:01.7654321+00:00",
+        "permanentStorageDate": "2025-10-09T12:35:02.0000001+00:00",
+        "upoDownloadUrl": f"https://ksef-test.mf.gov.pl/upo/{i}",
+        "upoDownloadUrlExpirationDate": "2025-10-12T12:35:02+00:00",
+        "invoicingMode": "Online",
+    }
+
+
+def session_invoices_page(count, continuation_token=None):
+    page = {"invoices": [session_invoice_status(i) for i in range(count)]}
+    if continuation_token:
+        page["continuationToken"] = continuation_token
+    return page
+
+
+def person_permission(i):
+    return {
+        "id": f"{i:08x}-0000-4000-8000-000000000000",
+        "authorizedIdentifier": {"type": "Pesel", "value": f"{90010100000 + i:011d}"},
+        "authorIdentifier": {"type": "Nip", "value": nip(1)},
+        "permissionScope": ("InvoiceRead", "InvoiceWrite", "CredentialsRead")[i % 3],
+        "description": f"Uprawnienie {i}",
+        "permissionState": "Active",
+        "startDate": "2025-01-02T08:00:00+00:00",
+        "canDelegate": i % 7 == 0,
+        "contextIdentifier": {"type": "Nip", "value": nip(1)},
+    }
+
+
+def person_permissions_page(count, has_more=False):
+    return {"permissions": [person_permission(i) for i in range(count)], "hasMore": has_more}
+
+
+def timeit(func, repeat=3):
+    """Best wall time of func() in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,24 @@
+""" Contains methods for accessing the API """
+
+__all__ = (
+    "auth",
+    "certificates",
+    "invoices",
+    "limits",
+    "operations",
+    "peppol",
+    "permissions",
+    "publickey",
+    "sendbatch",
+    "sendonline",
+    "sessions",
+    "status",
+    "testdata",
+    "tokens",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -0,0 +1,16 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v_2_auth_reference_number",
+    "post_api_v2_auth_challenge",
+    "post_api_v2_auth_ksef_token",
+    "post_api_v2_auth_token_redeem",
+    "post_api_v2_auth_token_refresh",
+    "post_api_v2_auth_xades_signature",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -5,7 +5,7 @@ import httpx
 
 from ...client import AuthenticatedClient, Client
 from ...types import Response, UNSET
-from ... import errors
+from ... import errors, json_backend
 
 from ...models.authentication_init_response import AuthenticationInitResponse
 from ...models.exception_response import ExceptionResponse
@@ -43,14 +43,14 @@ def _get_kwargs(
 
 def _parse_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Optional[Union[AuthenticationInitResponse, ExceptionResponse]]:
     if response.status_code == 202:
-        response_202 = AuthenticationInitResponse.from_dict(response.json())
+        response_202 = AuthenticationInitResponse.from_dict(json_backend.loads(response.content))
 
 
 
         return response_202
 
     if response.status_code == 400:
-        response_400 = ExceptionResponse.from_dict(response.json())
+        response_400 = ExceptionResponse.from_dict(json_backend.loads(response.content))
 
 
 
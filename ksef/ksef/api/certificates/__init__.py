@@ -0,0 +1,17 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v2_certificates_enrollments_data",
+    "get_api_v2_certificates_limits",
+    "get_api_v_2_certificates_enrollments_reference_number",
+    "post_api_v2_certificates_enrollments",
+    "post_api_v2_certificates_query",
+    "post_api_v2_certificates_retrieve",
+    "post_api_v_2_certificates_certificate_serial_number_revoke",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -5,7 +5,7 @@ import httpx
 
 from ...client import AuthenticatedClient, Client
 from ...types import Response, UNSET
-from ... import errors
+from ... import errors, json_backend
 
 from ...models.exception_response import ExceptionResponse
 from ...models.revoke_certificate_request import RevokeCertificateRequest
@@ -47,7 +47,7 @@ def _parse_response(*, client: Union[AuthenticatedClient, Client], response: htt
         return response_204
 
     if response.status_code == 400:
-        response_400 = ExceptionResponse.from_dict(response.json())
+        response_400 = ExceptionResponse.from_dict(json_backend.loads(response.content))
 
 
 
@@ -0,0 +1,14 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v_2_invoices_exports_reference_number",
+    "get_api_v_2_invoices_ksef_ksef_number",
+    "post_api_v2_invoices_exports",
+    "post_api_v2_invoices_query_metadata",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -5,7 +5,7 @@ import httpx
 
 from ...client import AuthenticatedClient, Client
 from ...types import Response, UNSET
-from ... import errors
+from ... import errors, json_backend
 
 from ...models.exception_response import ExceptionResponse
 from ...models.export_invoices_response import ExportInvoicesResponse
@@ -43,14 +43,14 @@ def _get_kwargs(
 
 def _parse_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Optional[Union[Any, ExceptionResponse, ExportInvoicesResponse]]:
     if response.status_code == 201:
-        response_201 = ExportInvoicesResponse.from_dict(response.json())
+        response_201 = ExportInvoicesResponse.from_dict(json_backend.loads(response.content))
 
 
 
         return response_201
 
     if response.status_code == 400:
-        response_400 = ExceptionResponse.from_dict(response.json())
+        response_400 = ExceptionResponse.from_dict(json_backend.loads(response.content))
 
 
 
@@ -0,0 +1,19 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "delete_api_v2_testdata_limits_context_session",
+    "delete_api_v2_testdata_limits_subject_certificate",
+    "delete_api_v2_testdata_rate_limits",
+    "get_api_v2_limits_context",
+    "get_api_v2_limits_subject",
+    "get_api_v2_rate_limits",
+    "post_api_v2_testdata_limits_context_session",
+    "post_api_v2_testdata_limits_subject_certificate",
+    "post_api_v2_testdata_rate_limits",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
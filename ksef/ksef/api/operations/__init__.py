@@ -0,0 +1,12 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v2_permissions_attachments_status",
+    "get_api_v_2_permissions_operations_reference_number",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
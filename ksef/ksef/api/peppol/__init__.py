@@ -0,0 +1,11 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v2_peppol_query",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -0,0 +1,26 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "delete_api_v_2_permissions_authorizations_grants_permission_id",
+    "delete_api_v_2_permissions_common_grants_permission_id",
+    "get_api_v2_permissions_query_entities_roles",
+    "post_api_v2_permissions_authorizations_grants",
+    "post_api_v2_permissions_entities_grants",
+    "post_api_v2_permissions_eu_entities_administration_grants",
+    "post_api_v2_permissions_eu_entities_grants",
+    "post_api_v2_permissions_indirect_grants",
+    "post_api_v2_permissions_persons_grants",
+    "post_api_v2_permissions_query_authorizations_grants",
+    "post_api_v2_permissions_query_eu_entities_grants",
+    "post_api_v2_permissions_query_personal_grants",
+    "post_api_v2_permissions_query_persons_grants",
+    "post_api_v2_permissions_query_subordinate_entities_roles",
+    "post_api_v2_permissions_query_subunits_grants",
+    "post_api_v2_permissions_subunits_grants",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -5,7 +5,7 @@ import httpx
 
 from ...client import AuthenticatedClient, Client
 from ...types import Response, UNSET
-from ... import errors
+from ... import errors, json_backend
 
 from ...models.eu_entity_permissions_query_request import EuEntityPermissionsQueryRequest
 from ...models.exception_response import ExceptionResponse
@@ -56,14 +56,14 @@ def _get_kwargs(
 
 def _parse_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Optional[Union[Any, ExceptionResponse, QueryEuEntityPermissionsResponse]]:
     if response.status_code == 200:
-        response_200 = QueryEuEntityPermissionsResponse.from_dict(response.json())
+        response_200 = QueryEuEntityPermissionsResponse.from_dict(json_backend.loads(response.content))
 
 
 
         return response_200
 
     if response.status_code == 400:
-        response_400 = ExceptionResponse.from_dict(response.json())
+        response_400 = ExceptionResponse.from_dict(json_backend.loads(response.content))
 
 
 
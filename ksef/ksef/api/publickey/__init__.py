@@ -0,0 +1,11 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v2_security_public_key_certificates",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
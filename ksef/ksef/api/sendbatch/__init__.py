@@ -0,0 +1,12 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "post_api_v2_sessions_batch",
+    "post_api_v_2_sessions_batch_reference_number_close",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
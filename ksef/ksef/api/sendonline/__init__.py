@@ -0,0 +1,13 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "post_api_v2_sessions_online",
+    "post_api_v_2_sessions_online_reference_number_close",
+    "post_api_v_2_sessions_online_reference_number_invoices",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
@@ -0,0 +1,18 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "get_api_v2_sessions",
+    "get_api_v_2_sessions_reference_number",
+    "get_api_v_2_sessions_reference_number_invoices",
+    "get_api_v_2_sessions_reference_number_invoices_failed",
+    "get_api_v_2_sessions_reference_number_invoices_invoice_reference_number",
+    "get_api_v_2_sessions_reference_number_invoices_invoice_reference_number_upo",
+    "get_api_v_2_sessions_reference_number_invoices_ksef_ksef_number_upo",
+    "get_api_v_2_sessions_reference_number_upo_upo_reference_number",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
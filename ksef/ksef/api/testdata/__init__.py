@@ -0,0 +1,18 @@
+""" Contains endpoint functions for accessing the API """
+
+__all__ = (
+    "post_api_v2_testdata_attachment",
+    "post_api_v2_testdata_attachment_revoke",
+    "post_api_v2_testdata_permissions",
+    "post_api_v2_testdata_permissions_revoke",
+    "post_api_v2_testdata_person",
+    "post_api_v2_testdata_person_remove",
+    "post_api_v2_testdata_subject",
+    "post_api_v2_testdata_subject_remove",
+)
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return __import__(name, globals(), level=1)
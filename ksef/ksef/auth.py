@@ -0,0 +1,172 @@
+""" Self-refreshing bearer token authentication for AuthenticatedClient
+
+A KSeF access token is valid for minutes; with ``token=`` every call after it
+expires fails with 401. ``TokenAuth`` is an ``httpx.Auth`` holding the
+access/refresh token pair from ``post_api_v2_auth_token_redeem``::
+
+    from ksef import AuthenticatedClient
+    from ksef.api.auth import post_api_v2_auth_token_redeem
+    from ksef.auth import TokenAuth
+
+    tokens = post_api_v2_auth_token_redeem.sync(client=authentication_client)
+    client = AuthenticatedClient(base_url=..., auth=TokenAuth.from_tokens(tokens))
+
+The access token is renewed with ``post_api_v2_auth_token_refresh`` shortly
+before it expires, and when a request is answered 401 (the request is then
+sent once more with the new token). The refresh request goes through the same
+httpx client, so its pooled connections, retries, rate limiter and
+instrumentation are kept. Concurrent requests wait for a single refresh.
+Requests with a streamed body cannot be sent again and return the 401.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections.abc import AsyncGenerator, Callable, Generator
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
+
+import httpx
+
+from . import json_backend
+from .api.auth import post_api_v2_auth_token_refresh
+from .models.authentication_token_refresh_response import AuthenticationTokenRefreshResponse
+from .ratelimit import CONTEXT
+from .retry import _replayable
+
+if TYPE_CHECKING:
+    from .models.authentication_tokens_response import AuthenticationTokensResponse
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class TokenAuth(httpx.Auth):
+    """
+    Access/refresh token pair, renewed as needed (thread-safe; usable by the sync and async client).
+
+    Attributes:
+        access_token: Current access token
+        access_valid_until: Expiry of the access token (None: unknown, refreshed on 401 only)
+        refresh_token: Refresh token (None: the access token cannot be renewed)
+        refresh_valid_until: Expiry of the refresh token
+        margin: Seconds before ``access_valid_until`` at which the token is renewed
+        on_refresh: Called with this object after each renewal, e.g. to store the new access token
+        refreshes: Number of renewals
+    """
+
+    def __init__(self, access_token: str, refresh_token: Optional[str] = None,
+                 access_valid_until: Optional[datetime] = None, refresh_valid_until: Optional[datetime] = None, *,
+                 margin: float = 60.0, prefix: str = "Bearer", header_name: str = "Authorization",
+                 on_refresh: Optional[Callable[["TokenAuth"], None]] = None):
+        self.access_token = access_token
+        self.access_valid_until = _utc(access_valid_until)
+        self.refresh_token = refresh_token
+        self.refresh_valid_until = _utc(refresh_valid_until)
+        self.margin = margin
+        self.prefix = prefix
+        self.header_name = header_name
+        self.on_refresh = on_refresh
+        self.refreshes = 0
+        # Rate limits apply per KSeF context, which outlives the access token
+        self.context = hashlib.sha256((refresh_token or access_token).encode()).hexdigest()[:16]
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_tokens(cls, tokens: "AuthenticationTokensResponse", **kwargs) -> "TokenAuth":
+        """ From the response of ``post_api_v2_auth_token_redeem`` """
+        return cls(tokens.access_token.token, tokens.refresh_token.token,
+                   tokens.access_token.valid_until, tokens.refresh_token.valid_until, **kwargs)
+
+    def expiring(self) -> bool:
+        """ Whether the access token expires within ``margin`` seconds """
+        if self.access_valid_until is None:
+            return False
+        return datetime.now(timezone.utc) + timedelta(seconds=self.margin) >= self.access_valid_until
+
+    def can_refresh(self) -> bool:
+        if self.refresh_token is None:
+            return False
+        return self.refresh_valid_until is None or datetime.now(timezone.utc) < self.refresh_valid_until
+
+    def _authorize(self, request: httpx.Request, token: str) -> None:
+        request.headers[self.header_name] = f"{self.prefix} {token}" if self.prefix else token
+        request.extensions[CONTEXT] = self.context
+
+    def _refresh_request(self, request: httpx.Request) -> httpx.Request:
+        kwargs = post_api_v2_auth_token_refresh._get_kwargs()
+        refresh = httpx.Request(kwargs["method"].upper(), request.url.join(kwargs["url"]))
+        self._authorize(refresh, self.refresh_token)
+        return refresh
+
+    def _update(self, response: httpx.Response) -> None:
+        if response.status_code == 401:
+            # refresh token expired or revoked: a new authentication is needed
+            self.refresh_token = None
+            return
+        if response.status_code != 200:
+            return
+        parsed = AuthenticationTokenRefreshResponse.from_dict(json_backend.loads(response.content))
+        self.access_token = parsed.access_token.token
+        self.access_valid_until = _utc(parsed.access_token.valid_until)
+        self.refreshes += 1
+        if self.on_refresh is not None:
+            self.on_refresh(self)
+
+    def sync_auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        if self.expiring() and self.can_refresh():
+            with self._lock:
+                if self.expiring() and self.can_refresh():
+                    response = yield self._refresh_request(request)
+                    response.read()
+                    self._update(response)
+
+        token = self.access_token
+        self._authorize(request, token)
+        response = yield request
+        if response.status_code != 401 or not _replayable(request):
+            return
+
+        with self._lock:
+            # another request may have renewed the token meanwhile
+            if self.access_token == token and self.can_refresh():
+                refresh = yield self._refresh_request(request)
+                refresh.read()
+                self._update(refresh)
+        if self.access_token != token:
+            self._authorize(request, self.access_token)
+            yield request
+
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        if self.expiring() and self.can_refresh():
+            async with self._async_lock:
+                if self.expiring() and self.can_refresh():
+                    response = yield self._refresh_request(request)
+                    await response.aread()
+                    self._update(response)
+
+        token = self.access_token
+        self._authorize(request, token)
+        response = yield request
+        if response.status_code != 401 or not _replayable(request):
+            return
+
+        async with self._async_lock:
+            if self.access_token == token and self.can_refresh():
+                refresh = yield self._refresh_request(request)
+                await refresh.aread()
+                self._update(refresh)
+        if self.access_token != token:
+            self._authorize(request, self.access_token)
+            yield request
+
+
+__all__ = (
+    "TokenAuth",
+)
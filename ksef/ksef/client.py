@@ -1,9 +1,52 @@
 import ssl
-from typing import Any, Union, Optional
+from typing import TYPE_CHECKING, Any, Union, Optional
 
 from attrs import define, field, evolve
 import httpx
 
+if TYPE_CHECKING:
+    # Annotations only: these modules are loaded by clients that use them, not by ``import ksef``
+    from .instrumentation import Instrumentation
+    from .ratelimit import RateLimiter
+    from .retry import RetryConfig
+
+# Arguments of httpx.Client that configure its default transport
+_TRANSPORT_ARGS = ("cert", "http1", "http2", "limits", "proxy", "trust_env")
+
+
+def _httpx_args(client: Union["Client", "AuthenticatedClient"], asynchronous: bool = False) -> dict[str, Any]:
+    """httpx_args of a client with HTTP/2, instrumentation hooks and its transport wrapped by the rate limiter
+    and retries (when set)"""
+    args = dict(client._httpx_args)
+    if "http2" not in args and client.http2:
+        args["http2"] = True
+    if isinstance(client, AuthenticatedClient) and client.auth is not None:
+        args["auth"] = client.auth
+    if client.instrumentation is not None:
+        hooks = {name: list(value) for name, value in (args.get("event_hooks") or {}).items()}
+        for name, value in client.instrumentation.event_hooks(asynchronous).items():
+            hooks.setdefault(name, []).extend(value)
+        args["event_hooks"] = hooks
+    if client.retry is None and client.rate_limiter is None:
+        return args
+    transport = args.pop("transport", None)
+    if not isinstance(transport, httpx.AsyncBaseTransport if asynchronous else httpx.BaseTransport):
+        transport_args = {key: args[key] for key in _TRANSPORT_ARGS if key in args}
+        transport_cls = httpx.AsyncHTTPTransport if asynchronous else httpx.HTTPTransport
+        transport = transport_cls(verify=client._verify_ssl, **transport_args)
+    # a proxy would be mounted in front of the transport
+    args.pop("proxy", None)
+    if client.rate_limiter is not None:
+        from .ratelimit import AsyncRateLimitTransport, RateLimitTransport
+
+        transport = (AsyncRateLimitTransport if asynchronous else RateLimitTransport)(transport, client.rate_limiter)
+    if client.retry is not None:
+        from .retry import AsyncRetryTransport, RetryTransport
+
+        transport = (AsyncRetryTransport if asynchronous else RetryTransport)(transport, client.retry)
+    args["transport"] = transport
+    return args
+
 
 
 
@@ -35,8 +78,19 @@ class Client:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        retry: A ``ksef.retry.RetryConfig`` to send requests through retrying transports (429, transient
+            5xx and connection errors, honouring ``Retry-After``). None (default) sends each request once.
+        rate_limiter: A ``ksef.ratelimit.RateLimiter`` delaying requests to fit KSeF's published rate limits.
+        http2: Offer HTTP/2 (requires the ``h2`` package): concurrent requests share a connection, servers
+            without HTTP/2 are used over HTTP/1.1. False (default) uses HTTP/1.1 only.
+        instrumentation: A ``ksef.instrumentation.Instrumentation`` recording per-endpoint latency, status codes,
+            payload sizes, retries and rate-limit waits. None (default) installs no hooks.
     """
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    retry: Optional["RetryConfig"] = field(default=None, kw_only=True)
+    rate_limiter: Optional["RateLimiter"] = field(default=None, kw_only=True)
+    http2: bool = field(default=False, kw_only=True)
+    instrumentation: Optional["Instrumentation"] = field(default=None, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
@@ -89,7 +143,7 @@ class Client:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_args(self),
             )
         return self._client
 
@@ -120,7 +174,7 @@ class Client:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_args(self, asynchronous=True),
             )
         return self._async_client
 
@@ -161,12 +215,26 @@ class AuthenticatedClient:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
-        token: The token to use for authentication
+        retry: A ``ksef.retry.RetryConfig`` to send requests through retrying transports (429, transient
+            5xx and connection errors, honouring ``Retry-After``). None (default) sends each request once.
+        rate_limiter: A ``ksef.ratelimit.RateLimiter`` delaying requests to fit KSeF's published rate limits.
+        http2: Offer HTTP/2 (requires the ``h2`` package): concurrent requests share a connection, servers
+            without HTTP/2 are used over HTTP/1.1. False (default) uses HTTP/1.1 only.
+        instrumentation: A ``ksef.instrumentation.Instrumentation`` recording per-endpoint latency, status codes,
+            payload sizes, retries and rate-limit waits. None (default) installs no hooks.
+        auth: An ``httpx.Auth`` setting the Authorization header of every request instead of ``token``, e.g.
+            ``ksef.auth.TokenAuth``, which renews the access token before it expires or after a 401.
+        token: The token to use for authentication (not needed with ``auth``)
         prefix: The prefix to use for the Authorization header
         auth_header_name: The name of the Authorization header
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    retry: Optional["RetryConfig"] = field(default=None, kw_only=True)
+    rate_limiter: Optional["RateLimiter"] = field(default=None, kw_only=True)
+    http2: bool = field(default=False, kw_only=True)
+    instrumentation: Optional["Instrumentation"] = field(default=None, kw_only=True)
+    auth: Optional[httpx.Auth] = field(default=None, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
@@ -177,7 +245,7 @@ class AuthenticatedClient:
     _client: Optional[httpx.Client] = field(default=None, init=False)
     _async_client: Optional[httpx.AsyncClient] = field(default=None, init=False)
 
-    token: str
+    token: str = ""
     prefix: str = "Bearer"
     auth_header_name: str = "Authorization"
 
@@ -216,7 +284,8 @@ class AuthenticatedClient:
     def get_httpx_client(self) -> httpx.Client:
         """Get the underlying httpx.Client, constructing a new one if not previously set"""
         if self._client is None:
-            self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
+            if self.auth is None:
+                self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
             self._client = httpx.Client(
                 base_url=self._base_url,
                 cookies=self._cookies,
@@ -224,7 +293,7 @@ class AuthenticatedClient:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_args(self),
             )
         return self._client
 
@@ -248,7 +317,8 @@ class AuthenticatedClient:
     def get_async_httpx_client(self) -> httpx.AsyncClient:
         """Get the underlying httpx.AsyncClient, constructing a new one if not previously set"""
         if self._async_client is None:
-            self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
+            if self.auth is None:
+                self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
             self._async_client = httpx.AsyncClient(
                 base_url=self._base_url,
                 cookies=self._cookies,
@@ -256,7 +326,7 @@ class AuthenticatedClient:
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_args(self, asynchronous=True),
             )
         return self._async_client
 
@@ -0,0 +1,395 @@
+""" Columnar (array-backed) invoice metadata
+
+``post_api_v2_invoices_query_metadata`` returns one ``InvoiceMetadata`` attrs object
+(plus seller/buyer/form code objects) per invoice. For reconciliation and totals
+over tens of thousands of rows this module decodes the JSON pages straight into
+typed columns instead:
+
+- amounts as ``array('q')`` of integer grosze
+- dates as ``array('q')`` (microseconds / days since the Unix epoch, UTC)
+- repeated strings (NIPs, names, currencies, types) dictionary-encoded:
+  ``array('i')`` codes + a list of distinct values
+
+``InvoiceMetadataColumns.to_numpy()`` exposes the same columns as NumPy arrays
+(``int64`` grosze, ``datetime64``), when NumPy is installed.
+
+Usage::
+
+    from ksef import columnar
+
+    table = columnar.sync(client=client, body=filters, page_size=250)
+    table.totals_by_seller()       # {(nip, currency): MetadataTotals}
+    table.totals_by_currency()     # {currency: MetadataTotals}
+"""
+
+import datetime
+from array import array
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional, Union
+
+from attrs import define
+
+from . import json_backend
+from .api.invoices import post_api_v2_invoices_query_metadata
+from .client import AuthenticatedClient
+from .converters import parse_date, parse_datetime
+from .models.exception_response import ExceptionResponse
+from .models.invoice_query_filters import InvoiceQueryFilters
+from .models.sort_order import SortOrder
+from .types import Unset
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Missing optional dates / values
+NAT = -(2 ** 63)
+NULL_CODE = -1
+
+
+class DictionaryColumn:
+    """ Dictionary-encoded string column: ``codes[i]`` indexes ``values`` (-1 = null) """
+    __slots__ = ("codes", "values", "_index")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(NULL_CODE if value is None else self._code(value))
+
+    def extend(self, other: "DictionaryColumn") -> None:
+        remap = array("i", (self._code(value) for value in other.values))
+        self.codes.extend(code if code == NULL_CODE else remap[code] for code in other.codes)
+
+    def _code(self, value: str) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return None if code == NULL_CODE else self.values[code]
+
+    def __iter__(self):
+        values = self.values
+        return (None if code == NULL_CODE else values[code] for code in self.codes)
+
+
+@define(slots=True)
+class MetadataTotals:
+    """ Count and sums (grosze) of one group """
+
+    count: int = 0
+    net: int = 0
+    vat: int = 0
+    gross: int = 0
+
+
+# Column name -> kind, in InvoiceMetadata field order
+COLUMNS = {
+    "ksef_number": "str",
+    "invoice_number": "str",
+    "issue_date": "date",
+    "invoicing_date": "datetime",
+    "acquisition_date": "datetime",
+    "permanent_storage_date": "datetime",
+    "seller_nip": "dict",
+    "seller_name": "dict",
+    "buyer_identifier_type": "dict",
+    "buyer_identifier_value": "dict",
+    "buyer_name": "dict",
+    "net_amount": "grosze",
+    "gross_amount": "grosze",
+    "vat_amount": "grosze",
+    "currency": "dict",
+    "invoicing_mode": "dict",
+    "invoice_type": "dict",
+    "form_code": "dict",
+    "is_self_invoicing": "bool",
+    "has_attachment": "bool",
+    "invoice_hash": "str",
+    "hash_of_corrected_invoice": "str",
+}
+
+
+def _new_column(kind: str):
+    if kind == "str":
+        return []
+    if kind == "dict":
+        return DictionaryColumn()
+    if kind == "date":
+        return array("i")
+    if kind == "bool":
+        return array("b")
+    return array("q")
+
+
+class InvoiceMetadataColumns:
+    """
+    Invoice metadata as typed columns, one entry per invoice (see ``COLUMNS``).
+
+    Nested lists (``thirdSubjects``, ``authorizedSubject``) are not kept - use the
+    generated models when they are needed.
+    """
+
+    def __init__(self):
+        for name, kind in COLUMNS.items():
+            setattr(self, name, _new_column(kind))
+        self.has_more = False
+        self.is_truncated = False
+
+    def __len__(self) -> int:
+        return len(self.ksef_number)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Mapping[str, Any]]) -> "InvoiceMetadataColumns":
+        """ Decodes ``QueryInvoicesMetadataResponse`` JSON pages into one table """
+        table = cls()
+        for page in pages:
+            table.append_page(page)
+        return table
+
+    def append_page(self, page: Mapping[str, Any]) -> None:
+        """ Appends the ``invoices`` of one ``QueryInvoicesMetadataResponse`` JSON page """
+        self.has_more = page["hasMore"]
+        self.is_truncated = page["isTruncated"]
+        self.append_rows(page["invoices"])
+
+    def append_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """ Appends ``InvoiceMetadata`` JSON objects """
+        # Bound appends, hoisted out of the row loop
+        ksef_number = self.ksef_number.append
+        invoice_number = self.invoice_number.append
+        issue_date = self.issue_date.append
+        invoicing_date = self.invoicing_date.append
+        acquisition_date = self.acquisition_date.append
+        permanent_storage_date = self.permanent_storage_date.append
+        seller_nip = self.seller_nip.append
+        seller_name = self.seller_name.append
+        buyer_identifier_type = self.buyer_identifier_type.append
+        buyer_identifier_value = self.buyer_identifier_value.append
+        buyer_name = self.buyer_name.append
+        net_amount = self.net_amount.append
+        gross_amount = self.gross_amount.append
+        vat_amount = self.vat_amount.append
+        currency = self.currency.append
+        invoicing_mode = self.invoicing_mode.append
+        invoice_type = self.invoice_type.append
+        form_code = self.form_code.append
+        is_self_invoicing = self.is_self_invoicing.append
+        has_attachment = self.has_attachment.append
+        invoice_hash = self.invoice_hash.append
+        hash_of_corrected_invoice = self.hash_of_corrected_invoice.append
+
+        start = len(self)
+        try:
+            for row in rows:
+                seller = row["seller"]
+                buyer = row["buyer"]
+                identifier = buyer["identifier"]
+                ksef_number(row["ksefNumber"])
+                invoice_number(row["invoiceNumber"])
+                issue_date(to_epoch_days(row["issueDate"]))
+                invoicing_date(to_epoch_us(row["invoicingDate"]))
+                acquisition_date(to_epoch_us(row["acquisitionDate"]))
+                permanent_storage_date(to_epoch_us(row["permanentStorageDate"]))
+                seller_nip(seller["nip"])
+                seller_name(seller.get("name"))
+                buyer_identifier_type(identifier["type"])
+                buyer_identifier_value(identifier.get("value"))
+                buyer_name(buyer.get("name"))
+                net_amount(to_grosze(row["netAmount"]))
+                gross_amount(to_grosze(row["grossAmount"]))
+                vat_amount(to_grosze(row["vatAmount"]))
+                currency(row["currency"])
+                invoicing_mode(row["invoicingMode"])
+                invoice_type(row["invoiceType"])
+                form_code(row["formCode"]["value"])
+                is_self_invoicing(row["isSelfInvoicing"])
+                has_attachment(row["hasAttachment"])
+                invoice_hash(row["invoiceHash"])
+                hash_of_corrected_invoice(row.get("hashOfCorrectedInvoice"))
+        except Exception:
+            # Keep the columns aligned when a row is malformed
+            self._truncate(start)
+            raise
+
+    def _truncate(self, length: int) -> None:
+        for name in COLUMNS:
+            column = getattr(self, name)
+            del (column.codes if isinstance(column, DictionaryColumn) else column)[length:]
+
+    def extend(self, other: "InvoiceMetadataColumns") -> None:
+        """ Appends all rows of another table (dictionaries are merged) """
+        for name in COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+        self.has_more = other.has_more
+        self.is_truncated = other.is_truncated
+
+    def totals_by(self, *columns: str) -> dict[Any, MetadataTotals]:
+        """
+        Count and net/VAT/gross grosze per distinct value of the given dictionary
+        columns (tuple keys for more than one column).
+        """
+        if not columns:
+            raise ValueError("totals_by() needs at least one column")
+        for name in columns:
+            if COLUMNS.get(name) != "dict":
+                raise ValueError(f"{name!r} is not a dictionary-encoded column")
+
+        dictionaries = [getattr(self, name) for name in columns]
+        if len(dictionaries) == 1:
+            keys = dictionaries[0].codes
+        else:
+            keys = zip(*(dictionary.codes for dictionary in dictionaries))
+
+        # Integer sums per code (tuple); values are looked up once per group
+        groups: dict[Any, list[int]] = {}
+        for key, net, vat, gross in zip(keys, self.net_amount, self.vat_amount, self.gross_amount):
+            sums = groups.get(key)
+            if sums is None:
+                groups[key] = [1, net, vat, gross]
+            else:
+                sums[0] += 1
+                sums[1] += net
+                sums[2] += vat
+                sums[3] += gross
+
+        def decode(code: int, dictionary: DictionaryColumn) -> Optional[str]:
+            return None if code == NULL_CODE else dictionary.values[code]
+
+        result = {}
+        for key, sums in groups.items():
+            if len(dictionaries) == 1:
+                value = decode(key, dictionaries[0])
+            else:
+                value = tuple(decode(code, dictionary) for code, dictionary in zip(key, dictionaries))
+            result[value] = MetadataTotals(*sums)
+        return result
+
+    def totals_by_seller(self) -> dict[tuple[str, str], MetadataTotals]:
+        """ {(seller NIP, currency): totals} """
+        return self.totals_by("seller_nip", "currency")
+
+    def totals_by_buyer(self) -> dict[tuple[str, Optional[str], str], MetadataTotals]:
+        """ {(buyer identifier type, value, currency): totals} """
+        return self.totals_by("buyer_identifier_type", "buyer_identifier_value", "currency")
+
+    def totals_by_currency(self) -> dict[str, MetadataTotals]:
+        """ {currency: totals} """
+        return self.totals_by("currency")
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Columns as NumPy arrays: grosze -> int64, dates -> datetime64[D]/[us] (NaT for
+        missing), booleans -> bool, dictionary columns -> int32 codes (values stay in
+        ``self.<column>.values``), plain strings -> object arrays.
+        """
+        import numpy as np
+
+        result = {}
+        for name, kind in COLUMNS.items():
+            column = getattr(self, name)
+            if kind == "grosze":
+                result[name] = np.frombuffer(column, dtype=np.int64).copy()
+            elif kind == "datetime":
+                result[name] = np.frombuffer(column, dtype=np.int64).view("datetime64[us]").copy()
+            elif kind == "date":
+                result[name] = np.frombuffer(column, dtype=np.int32).astype("datetime64[D]")
+            elif kind == "bool":
+                result[name] = np.frombuffer(column, dtype=np.int8).astype(bool)
+            elif kind == "dict":
+                result[name] = np.frombuffer(column.codes, dtype=np.int32).copy()
+            else:
+                result[name] = np.array(column, dtype=object)
+        return result
+
+
+def to_grosze(amount: Union[int, float]) -> int:
+    """ JSON amount -> integer grosze (amounts carry at most 2 decimal places) """
+    return round(amount * 100)
+
+
+def to_epoch_us(value: Optional[str]) -> int:
+    """ ISO 8601 date-time -> microseconds since the Unix epoch (naive = UTC, None = NAT) """
+    if value is None:
+        return NAT
+    parsed = parse_datetime(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def to_epoch_days(value: str) -> int:
+    """ ISO 8601 date -> days since the Unix epoch """
+    return (parse_date(value) - _EPOCH_DATE).days
+
+
+def sync(
+    *,
+    client: AuthenticatedClient,
+    body: InvoiceQueryFilters,
+    sort_order: Union[Unset, SortOrder] = SortOrder.ASC,
+    page_offset: Union[Unset, int] = 0,
+    page_size: Union[Unset, int] = 10,
+    table: Optional[InvoiceMetadataColumns] = None,
+) -> Optional[Union[Any, ExceptionResponse, InvoiceMetadataColumns]]:
+    """
+    ``post_api_v2_invoices_query_metadata.sync`` returning (or appending the page to)
+    an ``InvoiceMetadataColumns`` table instead of ``QueryInvoicesMetadataResponse``.
+    Error responses are returned as by the generated function.
+    """
+    kwargs = post_api_v2_invoices_query_metadata._get_kwargs(
+        body=body,
+        sort_order=sort_order,
+        page_offset=page_offset,
+        page_size=page_size,
+    )
+    response = client.get_httpx_client().request(**kwargs)
+    return _parse(client, response, table)
+
+
+async def asyncio(
+    *,
+    client: AuthenticatedClient,
+    body: InvoiceQueryFilters,
+    sort_order: Union[Unset, SortOrder] = SortOrder.ASC,
+    page_offset: Union[Unset, int] = 0,
+    page_size: Union[Unset, int] = 10,
+    table: Optional[InvoiceMetadataColumns] = None,
+) -> Optional[Union[Any, ExceptionResponse, InvoiceMetadataColumns]]:
+    """ Async version of ``sync`` """
+    kwargs = post_api_v2_invoices_query_metadata._get_kwargs(
+        body=body,
+        sort_order=sort_order,
+        page_offset=page_offset,
+        page_size=page_size,
+    )
+    response = await client.get_async_httpx_client().request(**kwargs)
+    return _parse(client, response, table)
+
+
+def _parse(client, response, table: Optional[InvoiceMetadataColumns]):
+    if response.status_code == 200:
+        table = table if table is not None else InvoiceMetadataColumns()
+        table.append_page(json_backend.loads(response.content))
+        return table
+    # Errors are parsed exactly like the generated endpoint does
+    return post_api_v2_invoices_query_metadata._parse_response(client=client, response=response)
+
+
+__all__ = (
+    "COLUMNS",
+    "DictionaryColumn",
+    "InvoiceMetadataColumns",
+    "MetadataTotals",
+    "asyncio",
+    "sync",
+)
@@ -0,0 +1,250 @@
+""" Fast from_dict conversion for the generated models
+
+The generated ``Model.from_dict`` re-imports nested model modules on every call,
+copies the input dict and parses every date with ``dateutil.parser.isoparse``.
+This module compiles one plain function per model class instead:
+
+- nested model classes, enums and parsers are resolved once, at compile time
+- dates go through ``datetime.fromisoformat`` with ``isoparse`` as fallback
+- the result is the same attrs instance ``Model.from_dict`` would build
+
+Usage::
+
+    from ksef import converters
+    from ksef.models import QueryInvoicesMetadataResponse
+
+    page = converters.from_dict(QueryInvoicesMetadataResponse, response.json())
+
+    # or make the generated endpoints use the converter (``_parse_response``
+    # calls ``Model.from_dict``):
+    converters.install(QueryInvoicesMetadataResponse)
+
+Classes whose fields cannot be compiled (free-form dicts, multi-type unions,
+``additional_properties``) keep their generated ``from_dict``. Input that does
+not match the schema is handed to the generated ``from_dict`` as well, so errors
+and lenient fallbacks are exactly the generated ones.
+"""
+
+import datetime
+import inspect
+import re
+import sys
+import types
+import typing
+from collections.abc import Callable, Iterable, Mapping
+from enum import Enum
+from typing import Any, Optional, TypeVar, Union
+
+import attrs
+from dateutil.parser import isoparse
+
+from .types import UNSET, Unset
+
+T = TypeVar("T")
+
+_fromisoformat_datetime = datetime.datetime.fromisoformat
+_fromisoformat_date = datetime.date.fromisoformat
+
+# "ksef_number = d.pop("ksefNumber")", "_invoices = d.pop("invoices")",
+# "x = _parse_x(d.pop("x", UNSET))" ... -> attribute name / JSON key
+_POP_RE = re.compile(r'^\s+_?(\w+) = .*?\bd\.pop\("([^"]+)"', re.M)
+
+_CONVERTERS: dict[type, Callable[[Mapping[str, Any]], Any]] = {}
+_GENERATED_FROM_DICT: dict[type, Callable[[Mapping[str, Any]], Any]] = {}
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """ ``isoparse`` result, via ``datetime.fromisoformat`` when it accepts the value """
+    try:
+        return _fromisoformat_datetime(value)
+    except ValueError:
+        return isoparse(value)
+
+
+def parse_date(value: str) -> datetime.date:
+    """ ``isoparse(value).date()``, via ``date.fromisoformat`` for plain dates """
+    if len(value) == 10:
+        try:
+            return _fromisoformat_date(value)
+        except ValueError:
+            pass
+    return parse_datetime(value).date()
+
+
+def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+    """ Same as ``cls.from_dict(src_dict)`` using the compiled converter """
+    return get_converter(cls)(src_dict)
+
+
+def from_dict_list(cls: type[T], items: Iterable[Mapping[str, Any]]) -> list[T]:
+    """ ``[cls.from_dict(item) for item in items]`` using the compiled converter """
+    convert = get_converter(cls)
+    return [convert(item) for item in items]
+
+
+def get_converter(cls: type[T]) -> Callable[[Mapping[str, Any]], T]:
+    """ Returns (and caches) the compiled converter of a generated model class """
+    convert = _CONVERTERS.get(cls)
+    if convert is None:
+        convert = _CONVERTERS[cls] = _compile(cls)
+    return convert
+
+
+def install(*classes: type) -> None:
+    """
+    Replaces ``from_dict`` of the given model classes with their compiled converters,
+    so the generated endpoint functions use them too. Nested classes are compiled
+    but keep their generated ``from_dict``.
+    """
+    for cls in classes:
+        if cls in _GENERATED_FROM_DICT:
+            continue
+        convert = get_converter(cls)
+        _GENERATED_FROM_DICT[cls] = _generated_from_dict(cls)
+        cls.from_dict = classmethod(lambda cls_, src_dict, _convert=convert: _convert(src_dict))
+
+
+def uninstall(*classes: type) -> None:
+    """ Restores the generated ``from_dict`` (all installed classes when none are given) """
+    for cls in classes or tuple(_GENERATED_FROM_DICT):
+        if cls in _GENERATED_FROM_DICT:
+            cls.from_dict = classmethod(_GENERATED_FROM_DICT.pop(cls).__func__)
+
+
+def _generated_from_dict(cls: type[T]) -> Callable[[Mapping[str, Any]], T]:
+    return _GENERATED_FROM_DICT.get(cls) or cls.from_dict
+
+
+def _compile(cls: type[T]) -> Callable[[Mapping[str, Any]], T]:
+    fallback = _generated_from_dict(cls)
+    try:
+        source, namespace = _converter_source(cls)
+    except _Unsupported:
+        return fallback
+
+    namespace.update(cls=cls, fallback=fallback, UNSET=UNSET)
+    exec(compile(source, f"<ksef converter {cls.__qualname__}>", "exec"), namespace)
+    return namespace["convert"]
+
+
+class _Unsupported(Exception):
+    """ Field type the converter does not compile - the class keeps its generated from_dict """
+
+
+class _Namespace(Mapping):
+    """ Resolves forward references ('InvoiceMetadataSeller') through the lazy ksef.models package """
+
+    def __init__(self, module: types.ModuleType):
+        self._module = module
+        self._models = sys.modules[module.__package__]
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self._module, name)
+        except AttributeError:
+            pass
+        try:
+            return getattr(self._models, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        return iter(vars(self._module))
+
+    def __len__(self) -> int:
+        return len(vars(self._module))
+
+
+def _converter_source(cls: type) -> tuple[str, dict[str, Any]]:
+    module = sys.modules[cls.__module__]
+    fields = attrs.fields(cls)
+    if any(not field.init for field in fields):
+        raise _Unsupported(cls)  # additional_properties
+
+    keys = dict(_POP_RE.findall(inspect.getsource(_generated_from_dict(cls))))
+    hints = typing.get_type_hints(cls, localns=_Namespace(module))
+
+    namespace: dict[str, Any] = {}
+    arguments = []
+    for index, field in enumerate(fields):
+        key = keys.get(field.name)
+        if key is None:
+            raise _Unsupported(cls, field.name)
+        hint = hints[field.name]
+        optional = field.default is not attrs.NOTHING
+        value_type, nullable = _unwrap_optional(hint) if optional else (hint, False)
+        expression = _value_expression(value_type, namespace, f"_{index}")
+
+        if not optional:
+            arguments.append(f"{field.name}={expression.format(value=f'data[{key!r}]')},")
+        elif expression == "{value}":
+            arguments.append(f"{field.name}=get({key!r}, UNSET),")
+        else:
+            var = f"_v{index}"
+            skip = f"({var} := get({key!r}, UNSET)) is UNSET" + (f" or {var} is None" if nullable else "")
+            arguments.append(f"{field.name}=({var} if {skip} else {expression.format(value=var)}),")
+
+    source = "\n".join([
+        "def convert(data):",
+        "    try:",
+        "        get = data.get",
+        "        return cls(",
+        *(f"            {argument}" for argument in arguments),
+        "        )",
+        "    except Exception:",
+        "        # Not what the schema describes - let the generated from_dict decide",
+        "        return fallback(data)",
+    ])
+    return source, namespace
+
+
+def _unwrap_optional(hint: Any) -> tuple[Any, bool]:
+    """ Union[None, Unset, X] -> (X, True); Union[Unset, X] -> (X, False) """
+    if typing.get_origin(hint) is not Union:
+        return hint, False
+    args = typing.get_args(hint)
+    nullable = type(None) in args
+    rest = [arg for arg in args if arg not in (Unset, type(None))]
+    if len(rest) != 1:
+        raise _Unsupported(hint)
+    return rest[0], nullable
+
+
+def _value_expression(hint: Any, namespace: dict[str, Any], name: str) -> str:
+    """ Python expression (with a {value} placeholder) converting one JSON value to hint """
+    if hint in (str, int, float, bool):
+        return "{value}"
+    if hint is datetime.datetime:
+        namespace["parse_datetime"] = parse_datetime
+        return "parse_datetime({value})"
+    if hint is datetime.date:
+        namespace["parse_date"] = parse_date
+        return "parse_date({value})"
+    if typing.get_origin(hint) is list:
+        (item_hint,) = typing.get_args(hint)
+        item = _value_expression(item_hint, namespace, f"{name}_item")
+        if item == "{value}":
+            return "{value}"
+        return f"[{item.format(value='item')} for item in {{value}}]"
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        namespace[f"enum{name}"] = hint
+        return f"enum{name}({{value}})"
+    if isinstance(hint, type) and attrs.has(hint):
+        namespace[f"model{name}"] = _LazyConverter(hint)
+        return f"model{name}({{value}})"
+    raise _Unsupported(hint)
+
+
+class _LazyConverter:
+    """ Nested model converter, compiled on first use (models may reference each other) """
+    __slots__ = ("cls", "convert")
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.convert: Optional[Callable[[Mapping[str, Any]], Any]] = None
+
+    def __call__(self, data: Mapping[str, Any]) -> Any:
+        convert = self.convert
+        if convert is None:
+            convert = self.convert = get_converter(self.cls)
+        return convert(data)
@@ -0,0 +1,337 @@
+""" Per-endpoint metrics of Client / AuthenticatedClient requests
+
+With ``instrumentation=Instrumentation()`` the client registers httpx event
+hooks that record, per method and URL template (``GET
+/api/v2/sessions/{reference_number}``):
+
+- a latency histogram, from sending the request until its body has been read
+  (retries and rate-limit waits included)
+- response counts per status code
+- request and response bytes on the wire
+- retries (``retry=``) and time spent waiting for the rate limiter (``rate_limiter=``)
+
+Without ``instrumentation`` no hooks are installed. Usage::
+
+    from ksef import AuthenticatedClient
+    from ksef.instrumentation import Instrumentation, PrometheusExporter
+
+    metrics = Instrumentation()
+    client = AuthenticatedClient(base_url=..., token=..., instrumentation=metrics)
+    ...
+    metrics.snapshot()                                     # dict
+    metrics.export()                                       # JSON
+    metrics.write("/var/lib/node_exporter/ksef.prom", PrometheusExporter())
+
+Requests that fail without a response (connection errors, timeouts) raise to
+the caller and are not recorded.
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any, Optional, Protocol
+
+import httpx
+from attrs import define, field
+
+from .routes import TEMPLATES, template_for
+
+# Latency histogram bucket bounds in seconds
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# httpx.Request.extensions keys; RetryTransport and RateLimitTransport add to the last two
+START = "ksef_start"
+RETRIES = "ksef_retries"
+RATE_LIMIT_WAIT = "ksef_rate_limit_wait"
+
+
+@define
+class EndpointMetrics:
+    """
+    Metrics of one (method, URL template).
+
+    Attributes:
+        buckets: Latency histogram bucket bounds in seconds
+        counts: Responses per latency bucket (not cumulative; the last one is above every bound)
+        latency_sum: Total latency in seconds
+        statuses: Responses per status code
+        request_bytes: Request bodies sent (Content-Length)
+        response_bytes: Response bodies received, as transferred (before decompression)
+        retries: Retries of these requests
+        rate_limit_wait: Seconds these requests waited for the rate limiter
+    """
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field()
+    latency_sum: float = 0.0
+    statuses: dict[int, int] = field(factory=dict)
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    rate_limit_wait: float = 0.0
+
+    @counts.default
+    def _counts(self) -> list[int]:
+        return [0] * (len(self.buckets) + 1)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """ Latency quantile estimated from the histogram (linear within a bucket), None without data """
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "latency": {
+                "sum": self.latency_sum,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99),
+                "buckets": [[bound, count] for bound, count in zip((*self.buckets, "+Inf"), self.counts)],
+            },
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "rate_limit_wait_seconds": self.rate_limit_wait,
+        }
+
+
+class Exporter(Protocol):
+    """ Renders ``Instrumentation.snapshot()`` as text """
+
+    def render(self, snapshot: dict[str, Any]) -> str: ...
+
+
+@define
+class JsonExporter:
+    """ ``snapshot()`` as JSON """
+
+    indent: Optional[int] = None
+
+    def render(self, snapshot: dict[str, Any]) -> str:
+        return json.dumps(snapshot, indent=self.indent)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@define
+class PrometheusExporter:
+    """ ``snapshot()`` in the Prometheus text exposition format """
+
+    prefix: str = "ksef_client"
+
+    def render(self, snapshot: dict[str, Any]) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_request_duration_seconds Time from sending a request until its response body was read",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        counters = (
+            ("responses_total", "Responses by status code", None),
+            ("request_bytes_total", "Request body bytes sent", "request_bytes"),
+            ("response_bytes_total", "Response body bytes received", "response_bytes"),
+            ("retries_total", "Retried attempts", "retries"),
+            ("rate_limit_wait_seconds_total", "Time spent waiting for the rate limiter", "rate_limit_wait_seconds"),
+        )
+        sections: dict[str, list[str]] = {name: [] for name, _help, _key in counters}
+        for endpoint in snapshot["endpoints"]:
+            labels = f'method="{_label(endpoint["method"])}",endpoint="{_label(endpoint["endpoint"])}"'
+            cumulative = 0
+            for bound, count in endpoint["latency"]["buckets"]:
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{p}_request_duration_seconds_sum{{{labels}}} {endpoint['latency']['sum']!r}")
+            lines.append(f"{p}_request_duration_seconds_count{{{labels}}} {endpoint['count']}")
+            for status, count in endpoint["statuses"].items():
+                sections["responses_total"].append(f'{p}_responses_total{{{labels},status="{status}"}} {count}')
+            for name, _help, key in counters[1:]:
+                sections[name].append(f"{p}_{name}{{{labels}}} {endpoint[key]!r}")
+        for name, help_text, _key in counters:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            lines.extend(sections[name])
+        return "\n".join(lines) + "\n"
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """ Response stream counting the bytes read; reports once when closed """
+
+    def __init__(self, stream: httpx.SyncByteStream, finish: Callable[[int], None]):
+        self._stream = stream
+        self._finish: Optional[Callable[[int], None]] = finish
+        self._size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._size += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()
+        if self._finish is not None:
+            finish, self._finish = self._finish, None
+            finish(self._size)
+
+
+class _AsyncMeteredStream(httpx.AsyncByteStream):
+    """ Async variant of ``_MeteredStream`` """
+
+    def __init__(self, stream: httpx.AsyncByteStream, finish: Callable[[int], None]):
+        self._stream = stream
+        self._finish: Optional[Callable[[int], None]] = finish
+        self._size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._size += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        if self._finish is not None:
+            finish, self._finish = self._finish, None
+            finish(self._size)
+
+
+@define
+class Instrumentation:
+    """
+    Per-endpoint request metrics, recorded by httpx event hooks (thread-safe).
+
+    Attributes:
+        buckets: Latency histogram bucket bounds in seconds
+        exporter: Default exporter of ``export()`` / ``write()``
+        clock: Monotonic clock in seconds
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    exporter: Exporter = field(factory=JsonExporter)
+    clock: Callable[[], float] = time.perf_counter
+    _endpoints: dict[tuple[str, str], EndpointMetrics] = field(factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False, eq=False)
+
+    def event_hooks(self, asynchronous: bool = False) -> dict[str, list[Callable[..., Any]]]:
+        """ httpx ``event_hooks`` recording into this instance """
+        if asynchronous:
+            async def on_request(request: httpx.Request) -> None:
+                self._on_request(request)
+
+            async def on_response(response: httpx.Response) -> None:
+                self._on_response(response, _AsyncMeteredStream)
+
+            return {"request": [on_request], "response": [on_response]}
+
+        def on_sync_response(response: httpx.Response) -> None:
+            self._on_response(response, _MeteredStream)
+
+        return {"request": [self._on_request], "response": [on_sync_response]}
+
+    def _on_request(self, request: httpx.Request) -> None:
+        request.extensions[START] = self.clock()
+
+    def _on_response(self, response: httpx.Response, stream_cls: type) -> None:
+        request = response.request
+        start = request.extensions.get(START)
+        if start is None:
+            return
+
+        def finish(size: int) -> None:
+            self.record(
+                request.method,
+                request.url.path,
+                response.status_code,
+                self.clock() - start,
+                request_bytes=int(request.headers.get("Content-Length") or 0),
+                response_bytes=size,
+                retries=request.extensions.get(RETRIES, 0),
+                rate_limit_wait=request.extensions.get(RATE_LIMIT_WAIT, 0.0),
+            )
+
+        if response.is_closed:
+            # body already read by the transport (e.g. httpx.MockTransport)
+            finish(len(response.content))
+        else:
+            response.stream = stream_cls(response.stream, finish)
+
+    def record(self, method: str, path: str, status_code: int, latency: float, request_bytes: int = 0,
+               response_bytes: int = 0, retries: int = 0, rate_limit_wait: float = 0.0) -> None:
+        """ Records one completed request """
+        key = (method, template_for(path))
+        index = bisect.bisect_left(self.buckets, latency)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics(self.buckets)
+            metrics.counts[index] += 1
+            metrics.latency_sum += latency
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+            metrics.retries += retries
+            metrics.rate_limit_wait += rate_limit_wait
+
+    def snapshot(self) -> dict[str, Any]:
+        """ Copy of the metrics as a JSON-serialisable dict, slowest endpoints (by total latency) first """
+        with self._lock:
+            endpoints = [
+                {"method": method, "endpoint": template, **metrics.as_dict()}
+                for (method, template), metrics in self._endpoints.items()
+            ]
+        endpoints.sort(key=lambda endpoint: endpoint["latency"]["sum"], reverse=True)
+        return {"endpoints": endpoints}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def export(self, exporter: Optional[Exporter] = None) -> str:
+        """ ``snapshot()`` rendered by ``exporter`` (default: ``self.exporter``) """
+        return (exporter or self.exporter).render(self.snapshot())
+
+    def write(self, path: str, exporter: Optional[Exporter] = None) -> None:
+        """ Atomically replaces ``path`` with ``export(exporter)`` (e.g. for the node_exporter textfile collector) """
+        text = self.export(exporter)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".ksef-metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+__all__ = (
+    "DEFAULT_BUCKETS",
+    "EndpointMetrics",
+    "Exporter",
+    "Instrumentation",
+    "JsonExporter",
+    "PrometheusExporter",
+    "TEMPLATES",
+    "template_for",
+)
@@ -0,0 +1,81 @@
+""" Pluggable JSON decoder for API responses
+
+orjson is used when installed, then msgspec, then the standard library ``json``.
+All generated endpoints and ``ksef.streaming`` decode through ``loads``; ``use()``
+selects a backend explicitly (e.g. to compare results or timings).
+
+Decoding errors are raised as ``json.JSONDecodeError`` whatever the backend.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any, Optional, Union
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+_loads: Callable[[Union[bytes, str]], Any] = json.loads
+_backend = "json"
+
+
+def _orjson_loads() -> Callable[[Union[bytes, str]], Any]:
+    import orjson
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads
+
+
+def _msgspec_loads() -> Callable[[Union[bytes, str]], Any]:
+    import msgspec
+
+    decode = msgspec.json.Decoder().decode
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            document = data if isinstance(data, str) else bytes(data).decode(errors="replace")
+            raise json.JSONDecodeError(str(e), document, 0) from None
+
+    return loads
+
+
+_FACTORIES = {
+    "orjson": _orjson_loads,
+    "msgspec": _msgspec_loads,
+    "json": lambda: json.loads,
+}
+
+
+def use(name: Optional[str] = None) -> str:
+    """
+    Selects the JSON backend ("orjson", "msgspec" or "json"); without a name the
+    first installed one in ``BACKENDS`` order. Returns the selected name.
+    """
+    global _loads, _backend
+
+    for candidate in (name,) if name else BACKENDS:
+        try:
+            _loads = _FACTORIES[candidate]()
+        except ImportError:
+            if name:
+                raise
+            continue
+        _backend = candidate
+        return candidate
+    raise ValueError(f"Unknown JSON backend {name!r}")  # pragma: no cover - "json" always imports
+
+
+def backend() -> str:
+    """ Name of the active backend """
+    return _backend
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """ Decodes one JSON document with the active backend """
+    return _loads(data)
+
+
+use()
+
+
+__all__ = ("BACKENDS", "backend", "loads", "use")
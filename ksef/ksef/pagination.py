@@ -0,0 +1,242 @@
+""" Prefetching paginators for the list endpoints
+
+Two paging styles exist in the API:
+
+- continuation token: ``get_api_v2_sessions``, ``get_api_v2_tokens``,
+  ``get_api_v2_auth_sessions``, ``get_api_v_2_sessions_reference_number_invoices``
+  (and ``_failed``) return ``continuationToken``, sent back as ``x-continuation-token``
+- offset: the permission queries, ``post_api_v2_certificates_query``,
+  ``get_api_v2_peppol_query`` and ``post_api_v2_invoices_query_metadata`` take
+  ``pageOffset`` (page number) / ``pageSize`` and return ``hasMore``
+
+``paginate()`` handles both, with the largest page size the endpoint accepts.
+The next page is requested as soon as the current one arrives (a worker thread
+for ``for``, a task for ``async for``), so the network overlaps the processing
+of the current page::
+
+    from ksef.pagination import paginate
+    from ksef.api.status import get_api_v2_sessions
+
+    for session in paginate(get_api_v2_sessions, client=client, session_type=SessionType.ONLINE,
+                            max_items=5000):
+        ...
+
+    async for session in paginate(get_api_v2_sessions, client=client, session_type=SessionType.ONLINE):
+        ...
+
+Pages are decoded with ``ksef.json_backend`` and ``ksef.converters``.
+``post_api_v2_invoices_query_metadata`` stops at KSeF's 10 000 record limit per
+filter set; ``Paginator.truncated`` is then True and the query has to be
+continued with a narrowed ``dateRange``.
+"""
+
+import asyncio
+import inspect
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Optional, Union
+
+import httpx
+
+from . import json_backend
+from .client import AuthenticatedClient, Client
+from .converters import get_converter
+from .streaming import _list_field
+
+MIN_PAGE_SIZE = 10
+
+# Largest pageSize KSeF accepts, per endpoint module (relative to ksef.api)
+MAX_PAGE_SIZE = {
+    "invoices.post_api_v2_invoices_query_metadata": 250,
+    "status.get_api_v2_sessions": 1000,
+    "status.get_api_v_2_sessions_reference_number_invoices": 1000,
+    "status.get_api_v_2_sessions_reference_number_invoices_failed": 1000,
+    "certificates.post_api_v2_certificates_query": 50,
+}
+DEFAULT_MAX_PAGE_SIZE = 100
+
+
+class PageError(Exception):
+    """ Non-200 response for a page; ``parsed`` is what the generated endpoint returns for it """
+
+    def __init__(self, status_code: int, parsed: Any, content: bytes):
+        self.status_code = status_code
+        self.parsed = parsed
+        self.content = content
+        super().__init__(f"Page request failed with status code {status_code}")
+
+
+def max_page_size(endpoint: ModuleType) -> int:
+    """ Largest page size of a generated list endpoint """
+    return MAX_PAGE_SIZE.get(endpoint.__name__.rpartition(".api.")[2], DEFAULT_MAX_PAGE_SIZE)
+
+
+class Paginator:
+    """
+    Items (``for`` / ``async for``) or pages (``pages()`` / ``apages()``) of a
+    paged endpoint. Every iteration starts again from the first page.
+
+    Attributes:
+        pages_fetched: Pages received by the last iteration
+        truncated: The last iteration stopped at KSeF's record limit (``isTruncated``)
+    """
+
+    def __init__(self, endpoint: ModuleType, client: Union[AuthenticatedClient, Client], kwargs: dict[str, Any],
+                 max_items: Optional[int] = None, page_size: Optional[int] = None, prefetch: bool = True):
+        parameters = inspect.signature(endpoint._get_kwargs).parameters
+        if "x_continuation_token" in parameters:
+            self._cursor_name = "x_continuation_token"
+            self._start = kwargs.pop("x_continuation_token", None)
+        elif "page_offset" in parameters:
+            self._cursor_name = "page_offset"
+            self._start = kwargs.pop("page_offset", 0)
+        else:
+            raise ValueError(f"{endpoint.__name__} is not a paged endpoint")
+
+        self.endpoint = endpoint
+        self.client = client
+        self.kwargs = kwargs
+        self.max_items = max_items
+        self.page_size = page_size or max_page_size(endpoint)
+        if max_items is not None:
+            self.page_size = min(self.page_size, max(max_items, MIN_PAGE_SIZE))
+        self.prefetch = prefetch
+        self.pages_fetched = 0
+        self.truncated = False
+        response_cls, self._items_attribute, _key, _item = _list_field(endpoint)
+        self._convert = get_converter(response_cls)
+
+    def _request(self, cursor: Any) -> dict[str, Any]:
+        kwargs = dict(self.kwargs, page_size=self.page_size)
+        if cursor is not None:
+            kwargs[self._cursor_name] = cursor
+        return self.endpoint._get_kwargs(**kwargs)
+
+    def _parse(self, response: httpx.Response) -> Any:
+        if response.status_code != 200:
+            parsed = self.endpoint._parse_response(client=self.client, response=response)
+            raise PageError(response.status_code, parsed, response.content)
+        return self._convert(json_backend.loads(response.content))
+
+    def _next(self, page: Any, cursor: Any, remaining: Optional[int]) -> Any:
+        """ Cursor of the page after ``page``, None when it is the last one needed """
+        self.pages_fetched += 1
+        if not getattr(page, self._items_attribute) or (remaining is not None and remaining <= 0):
+            return None
+        if self._cursor_name == "x_continuation_token":
+            token = page.continuation_token
+            return token if isinstance(token, str) and token else None
+        if not page.has_more:
+            return None
+        if getattr(page, "is_truncated", False):
+            self.truncated = True
+            return None
+        return cursor + 1
+
+    def _remaining(self, remaining: Optional[int], page: Any) -> Optional[int]:
+        return None if remaining is None else remaining - len(getattr(page, self._items_attribute))
+
+    def pages(self) -> Iterator[Any]:
+        """ Response models of the pages (the last one may exceed ``max_items``) """
+        self.pages_fetched = 0
+        self.truncated = False
+        client = self.client.get_httpx_client()
+
+        def fetch(cursor: Any) -> Any:
+            return self._parse(client.request(**self._request(cursor)))
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ksef-prefetch") if self.prefetch else None
+        try:
+            cursor = self._start
+            remaining = self.max_items
+            page = fetch(cursor)
+            while True:
+                remaining = self._remaining(remaining, page)
+                cursor = self._next(page, cursor, remaining)
+                pending = executor.submit(fetch, cursor) if executor is not None and cursor is not None else None
+                yield page
+                if cursor is None:
+                    return
+                page = pending.result() if pending is not None else fetch(cursor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def apages(self) -> AsyncIterator[Any]:
+        """ Async version of ``pages`` """
+        self.pages_fetched = 0
+        self.truncated = False
+        client = self.client.get_async_httpx_client()
+
+        async def fetch(cursor: Any) -> Any:
+            return self._parse(await client.request(**self._request(cursor)))
+
+        pending = None
+        try:
+            cursor = self._start
+            remaining = self.max_items
+            page = await fetch(cursor)
+            while True:
+                remaining = self._remaining(remaining, page)
+                cursor = self._next(page, cursor, remaining)
+                if self.prefetch and cursor is not None:
+                    pending = asyncio.ensure_future(fetch(cursor))
+                yield page
+                if cursor is None:
+                    return
+                if pending is not None:
+                    page = await pending
+                    pending = None
+                else:
+                    page = await fetch(cursor)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def __iter__(self) -> Iterator[Any]:
+        remaining = self.max_items
+        for page in self.pages():
+            items = getattr(page, self._items_attribute)
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            yield from items
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        remaining = self.max_items
+        async for page in self.apages():
+            items = getattr(page, self._items_attribute)
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            for item in items:
+                yield item
+
+
+def paginate(endpoint: ModuleType, *, client: Union[AuthenticatedClient, Client], max_items: Optional[int] = None,
+             page_size: Optional[int] = None, prefetch: bool = True, **kwargs: Any) -> Paginator:
+    """
+    Pages through a generated list endpoint (module). ``kwargs`` are the endpoint's
+    own arguments; ``page_offset`` / ``x_continuation_token`` set the first page.
+
+    Args:
+        max_items: Stop after this many items
+        page_size: Page size (default: the largest the endpoint accepts)
+        prefetch: Request the next page while the current one is consumed
+
+    Raises:
+        PageError: for non-200 responses (``parsed`` as the generated ``sync``), during iteration
+    """
+    return Paginator(endpoint, client, kwargs, max_items=max_items, page_size=page_size, prefetch=prefetch)
+
+
+__all__ = (
+    "DEFAULT_MAX_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "MIN_PAGE_SIZE",
+    "PageError",
+    "Paginator",
+    "max_page_size",
+    "paginate",
+)
@@ -0,0 +1,347 @@
+""" Client-side rate limiting with the limits KSeF publishes
+
+KSeF limits requests per category (``online_session``, ``invoice_send``,
+``invoice_metadata`` ...) and context, per second, minute and hour, and answers
+429 once a limit is exceeded. ``RateLimiter.load(client)`` reads the effective
+limits from ``get_api_v2_rate_limits``; with ``rate_limiter=`` the client then
+delays each request until it fits every window of its category, so bulk jobs
+run at the allowed rate instead of being throttled::
+
+    from ksef import AuthenticatedClient
+    from ksef.ratelimit import RateLimiter, SqliteStore
+
+    limiter = RateLimiter()                        # in-process
+    limiter = RateLimiter(store=SqliteStore(path))  # shared by all workers of a host
+    client = AuthenticatedClient(base_url=..., token=..., rate_limiter=limiter)
+    limiter.load(client)
+
+Windows are enforced exactly (a request is admitted once fewer than ``limit``
+requests were admitted in the preceding ``period``): a token bucket refilled at
+``limit / period`` would admit up to twice the limit within one period.
+Requests are admitted in arrival order; the delay is reserved up front.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Union
+
+import httpx
+from attrs import define, field
+
+from . import routes
+from .instrumentation import RATE_LIMIT_WAIT
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from .client import AuthenticatedClient
+    from .models.effective_api_rate_limits import EffectiveApiRateLimits
+
+CATEGORIES = (
+    "online_session",
+    "batch_session",
+    "invoice_send",
+    "invoice_status",
+    "session_list",
+    "session_invoice_list",
+    "session_misc",
+    "invoice_metadata",
+    "invoice_export",
+    "invoice_download",
+    "other",
+)
+
+# Rate limit category of endpoint modules (relative to ksef.api); endpoints
+# that are not listed count as "other". Methods and URL templates come from
+# ksef.routes.ENDPOINTS.
+ENDPOINTS = {
+    "sendonline.post_api_v2_sessions_online": "online_session",
+    "sendonline.post_api_v_2_sessions_online_reference_number_close": "online_session",
+    "sendonline.post_api_v_2_sessions_online_reference_number_invoices": "invoice_send",
+    "sendbatch.post_api_v2_sessions_batch": "batch_session",
+    "sendbatch.post_api_v_2_sessions_batch_reference_number_close": "batch_session",
+    "status.get_api_v2_sessions": "session_list",
+    "status.get_api_v_2_sessions_reference_number": "session_misc",
+    "status.get_api_v_2_sessions_reference_number_invoices_failed": "session_invoice_list",
+    "status.get_api_v_2_sessions_reference_number_invoices": "session_invoice_list",
+    "status.get_api_v_2_sessions_reference_number_invoices_invoice_reference_number": "invoice_status",
+    "status.get_api_v_2_sessions_reference_number_invoices_invoice_reference_number_upo": "session_misc",
+    "status.get_api_v_2_sessions_reference_number_invoices_ksef_ksef_number_upo": "session_misc",
+    "status.get_api_v_2_sessions_reference_number_upo_upo_reference_number": "session_misc",
+    "invoices.post_api_v2_invoices_query_metadata": "invoice_metadata",
+    "invoices.post_api_v2_invoices_exports": "invoice_export",
+    "invoices.get_api_v_2_invoices_exports_reference_number": "invoice_export",
+    "invoices.get_api_v_2_invoices_ksef_ksef_number": "invoice_download",
+}
+
+# (method, URL template) -> category
+_ROUTE_CATEGORIES = {
+    (method, template): ENDPOINTS[module] for module, method, template in routes.ENDPOINTS if module in ENDPOINTS
+}
+
+# EffectiveApiRateLimitValues attribute -> window length in seconds
+_PERIODS = (("per_second", 1.0), ("per_minute", 60.0), ("per_hour", 3600.0))
+
+Windows = tuple[tuple[int, float], ...]
+
+# httpx.Request.extensions key of a context key set by the auth flow (``ksef.auth.TokenAuth``)
+CONTEXT = "ksef_context"
+
+
+def category_of(endpoint: Union[ModuleType, str]) -> str:
+    """ Rate limit category of a generated endpoint module (or its name) """
+    name = endpoint if isinstance(endpoint, str) else endpoint.__name__
+    return ENDPOINTS.get(name.rpartition(".api.")[2], "other")
+
+
+def category_for(method: str, path: str) -> str:
+    """ Rate limit category of a request """
+    return _ROUTE_CATEGORIES.get((method.upper(), routes.template_for(path)), "other")
+
+
+def windows_from_limits(limits: "EffectiveApiRateLimits") -> dict[str, Windows]:
+    """ {category: ((limit, period seconds), ...)} of ``EffectiveApiRateLimits`` (non-positive limits skipped) """
+    windows = {}
+    for category in CATEGORIES:
+        values = getattr(limits, category)
+        windows[category] = tuple(
+            (getattr(values, name), period) for name, period in _PERIODS if getattr(values, name) > 0
+        )
+    return windows
+
+
+class MemoryStore:
+    """ Admission log of one process (thread-safe) """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._logs: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, windows: Windows) -> float:
+        """ Reserves the earliest admission for ``key`` that fits ``windows``; returns the delay in seconds """
+        size = max(limit for limit, _period in windows)
+        with self._lock:
+            now = self.clock()
+            log = self._logs.get(key)
+            if log is None or log.maxlen != size:
+                log = self._logs[key] = deque(log or (), maxlen=size)
+            at = max(now, log[-1]) if log else now
+            for limit, period in windows:
+                if len(log) >= limit:
+                    at = max(at, log[-limit] + period)
+            log.append(at)
+            return at - now
+
+
+class SqliteStore:
+    """
+    Admission log in an SQLite database file, shared by all processes of a host
+    (e.g. Odoo workers). Each reservation is one short ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.timeout = timeout
+        self.clock = clock
+        self._local = threading.local()
+
+    def _connection(self) -> "sqlite3.Connection":
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("CREATE TABLE IF NOT EXISTS ksef_rate_limit (key TEXT NOT NULL, at REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS ksef_rate_limit_key_at ON ksef_rate_limit (key, at)")
+            self._local.connection = connection
+        return connection
+
+    def reserve(self, key: str, windows: Windows) -> float:
+        """ Same as ``MemoryStore.reserve`` """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            (last,) = connection.execute("SELECT MAX(at) FROM ksef_rate_limit WHERE key = ?", (key,)).fetchone()
+            at = max(now, last) if last is not None else now
+            for limit, period in windows:
+                row = connection.execute(
+                    "SELECT at FROM ksef_rate_limit WHERE key = ? ORDER BY at DESC LIMIT 1 OFFSET ?",
+                    (key, limit - 1),
+                ).fetchone()
+                if row is not None:
+                    at = max(at, row[0] + period)
+            connection.execute("INSERT INTO ksef_rate_limit (key, at) VALUES (?, ?)", (key, at))
+            longest = max(period for _limit, period in windows)
+            connection.execute("DELETE FROM ksef_rate_limit WHERE key = ? AND at < ?", (key, now - longest))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return at - now
+
+
+def authorization_context(request: httpx.Request) -> str:
+    """
+    Default context key: the one set by the auth flow, otherwise a digest of the
+    Authorization header ("" for anonymous requests)
+    """
+    context = request.extensions.get(CONTEXT)
+    if context is not None:
+        return context
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return ""
+    return hashlib.sha256(authorization.encode()).hexdigest()[:16]
+
+
+@define
+class RateLimitMetrics:
+    """
+    Counters of the rate limiter (thread-safe).
+
+    Attributes:
+        requests: Requests admitted, per category
+        delayed: Requests that had to wait, per category
+        wait_seconds: Time spent waiting for admission, per category
+    """
+
+    requests: dict[str, int] = field(factory=dict)
+    delayed: dict[str, int] = field(factory=dict)
+    wait_seconds: dict[str, float] = field(factory=dict)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False, eq=False)
+
+    def record(self, category: str, delay: float) -> None:
+        with self._lock:
+            self.requests[category] = self.requests.get(category, 0) + 1
+            if delay > 0:
+                self.delayed[category] = self.delayed.get(category, 0) + 1
+                self.wait_seconds[category] = self.wait_seconds.get(category, 0.0) + delay
+
+    def snapshot(self) -> dict[str, Any]:
+        """ Copy of the counters as a dict """
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "delayed": dict(self.delayed),
+                "wait_seconds": dict(self.wait_seconds),
+            }
+
+
+@define
+class RateLimiter:
+    """
+    Delays requests to fit KSeF's limits, per (context, category).
+
+    Attributes:
+        windows: {category: ((limit, period seconds), ...)}; categories without windows are not limited
+        store: ``MemoryStore`` (default) or ``SqliteStore`` to share limits between processes
+        context: Maps a request to its KSeF context key (default: digest of the Authorization header)
+        margin: Windows are lengthened by this fraction to absorb network jitter
+        metrics: Admission counters
+    """
+
+    windows: dict[str, Windows] = field(factory=dict)
+    store: Union[MemoryStore, SqliteStore] = field(factory=MemoryStore)
+    context: Callable[[httpx.Request], str] = authorization_context
+    margin: float = 0.05
+    metrics: RateLimitMetrics = field(factory=RateLimitMetrics)
+
+    def load(self, client: "AuthenticatedClient") -> "RateLimiter":
+        """ Replaces ``windows`` with the limits returned by ``get_api_v2_rate_limits`` """
+        from .api.limits import get_api_v2_rate_limits
+
+        self._set_limits(get_api_v2_rate_limits.sync_detailed(client=client))
+        return self
+
+    async def aload(self, client: "AuthenticatedClient") -> "RateLimiter":
+        """ Async version of ``load`` """
+        from .api.limits import get_api_v2_rate_limits
+
+        self._set_limits(await get_api_v2_rate_limits.asyncio_detailed(client=client))
+        return self
+
+    def _set_limits(self, response: Any) -> None:
+        from .models.effective_api_rate_limits import EffectiveApiRateLimits
+
+        if not isinstance(response.parsed, EffectiveApiRateLimits):
+            raise ValueError(f"Could not load KSeF rate limits (status code {response.status_code})")
+        self.set_limits(response.parsed)
+
+    def set_limits(self, limits: "EffectiveApiRateLimits") -> None:
+        self.windows = windows_from_limits(limits)
+
+    def reserve(self, request: httpx.Request) -> float:
+        """ Reserves the request's admission; returns how long to wait before sending it """
+        category = category_for(request.method, request.url.path)
+        windows = self.windows.get(category)
+        if not windows:
+            return 0.0
+        if self.margin:
+            windows = tuple((limit, period * (1 + self.margin)) for limit, period in windows)
+        delay = self.store.reserve(f"{self.context(request)}:{category}", windows)
+        self.metrics.record(category, delay)
+        return delay
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    """ Sync transport sending requests of ``transport`` once the ``RateLimiter`` admits them """
+
+    def __init__(self, transport: httpx.BaseTransport, limiter: RateLimiter,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.transport = transport
+        self.limiter = limiter
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.limiter.reserve(request)
+        if delay > 0:
+            request.extensions[RATE_LIMIT_WAIT] = request.extensions.get(RATE_LIMIT_WAIT, 0.0) + delay
+            self._sleep(delay)
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitTransport(httpx.AsyncBaseTransport):
+    """ Async variant of ``RateLimitTransport`` """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter,
+                 sleep: Callable[[float], Any] = asyncio.sleep):
+        self.transport = transport
+        self.limiter = limiter
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.limiter.reserve(request)
+        if delay > 0:
+            request.extensions[RATE_LIMIT_WAIT] = request.extensions.get(RATE_LIMIT_WAIT, 0.0) + delay
+            await self._sleep(delay)
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = (
+    "AsyncRateLimitTransport",
+    "CATEGORIES",
+    "CONTEXT",
+    "ENDPOINTS",
+    "MemoryStore",
+    "RateLimitMetrics",
+    "RateLimitTransport",
+    "RateLimiter",
+    "SqliteStore",
+    "authorization_context",
+    "category_for",
+    "category_of",
+    "windows_from_limits",
+)
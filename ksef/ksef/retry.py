@@ -0,0 +1,381 @@
+""" Retrying httpx transports for Client / AuthenticatedClient
+
+A 429 or a transient 5xx from KSeF otherwise surfaces as a failed call. With
+``retry=RetryConfig()`` the client sends every request through a
+``RetryTransport`` (``AsyncRetryTransport`` for the async client), which
+
+- waits ``Retry-After`` (seconds or HTTP date) when the response carries it,
+  otherwise exponential backoff with full jitter
+- uses separate policies for idempotent requests (GET, HEAD, OPTIONS, PUT,
+  DELETE and the read-only ``.../query`` POSTs) and the rest: a POST that may
+  have reached KSeF is only retried when KSeF certainly did not process it
+  (429, connection not established)
+- draws every retry from a shared ``RetryBudget``, so retries cannot multiply
+  the load on KSeF during an outage
+- records attempts, retries and the time spent waiting in ``RetryMetrics``
+
+Usage::
+
+    from ksef import AuthenticatedClient
+    from ksef.retry import RetryConfig
+
+    retry = RetryConfig()
+    client = AuthenticatedClient(base_url=..., token=..., retry=retry)
+    ...
+    retry.metrics.snapshot()  # {"requests": ..., "retries": ..., "wait_seconds": ...}
+"""
+
+import asyncio
+import email.utils
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import httpx
+from attrs import define, field
+
+from .instrumentation import RETRIES
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# POST endpoints that only read: invoices/query/metadata, permissions/query/*, certificates/query ...
+IDEMPOTENT_POST_PATHS = (r"/query(/|$)",)
+
+
+@define(frozen=True)
+class RetryPolicy:
+    """
+    When and how often a request is retried.
+
+    Attributes:
+        max_attempts: Attempts including the first one
+        statuses: Response status codes that are retried
+        exceptions: Transport errors that are retried
+        backoff_base: First backoff (seconds); attempt n waits up to ``backoff_base * 2 ** (n - 1)``
+        backoff_max: Upper bound of one backoff
+        max_retry_after: A longer ``Retry-After`` is not waited for, the response is returned
+        max_total_wait: Total waiting per request after which the last result is returned
+    """
+
+    max_attempts: int = 4
+    statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    exceptions: tuple[type[Exception], ...] = (
+        httpx.ConnectError,
+        httpx.ConnectTimeout,
+        httpx.PoolTimeout,
+        httpx.ReadTimeout,
+        httpx.ReadError,
+        httpx.RemoteProtocolError,
+    )
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    max_retry_after: float = 120.0
+    max_total_wait: float = 300.0
+
+    def backoff(self, attempt: int) -> float:
+        """ Full-jitter backoff before attempt ``attempt + 1`` """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+# Safe to repeat: KSeF may already have processed a request that failed later than this
+NON_IDEMPOTENT_POLICY = RetryPolicy(
+    statuses=frozenset({429}),
+    exceptions=(httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout),
+)
+
+
+class RetryBudget:
+    """
+    Retries allowed within a sliding window of ``window`` seconds:
+    ``min_retries_per_second * window + ratio * requests in the window``.
+    Shared by all requests (and threads) of the clients using it.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0, window: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.window
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] <= horizon:
+                timestamps.popleft()
+
+    def record_request(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._requests.append(now)
+
+    def try_acquire(self) -> bool:
+        """ Takes one retry from the budget; False when it is spent """
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            allowed = self.min_retries_per_second * self.window + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+@define
+class RetryMetrics:
+    """
+    Counters of the retrying transports (thread-safe).
+
+    Attributes:
+        requests: Requests sent (not counting retries)
+        retries: Retries sent
+        retries_by_reason: Retries per status code ("429") or exception name ("ConnectError")
+        gave_up: Retryable failures returned/raised because attempts or waiting time ran out
+        budget_exhausted: Retryable failures returned/raised because the retry budget was spent
+        wait_seconds: Time spent waiting between attempts
+        retry_after_seconds: Part of ``wait_seconds`` requested by ``Retry-After``
+    """
+
+    requests: int = 0
+    retries: int = 0
+    retries_by_reason: dict[str, int] = field(factory=dict)
+    gave_up: int = 0
+    budget_exhausted: int = 0
+    wait_seconds: float = 0.0
+    retry_after_seconds: float = 0.0
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False, eq=False)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_retry(self, reason: str) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+    def record_wait(self, seconds: float, retry_after: bool) -> None:
+        with self._lock:
+            self.wait_seconds += seconds
+            if retry_after:
+                self.retry_after_seconds += seconds
+
+    def record_gave_up(self, budget: bool) -> None:
+        with self._lock:
+            if budget:
+                self.budget_exhausted += 1
+            else:
+                self.gave_up += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """ Copy of the counters as a dict """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "retries_by_reason": dict(self.retries_by_reason),
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "wait_seconds": self.wait_seconds,
+                "retry_after_seconds": self.retry_after_seconds,
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """ Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date) """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+@define
+class RetryConfig:
+    """
+    Retry settings shared by the sync and async transports of a client
+    (and by clients derived with ``with_headers`` etc.).
+
+    Attributes:
+        idempotent: Policy of idempotent requests
+        non_idempotent: Policy of the other requests
+        idempotent_post_paths: Regexes of POST paths that are treated as idempotent
+        budget: Shared retry budget, None for no limit
+        metrics: Counters of all requests sent through the transports
+    """
+
+    idempotent: RetryPolicy = field(factory=RetryPolicy)
+    non_idempotent: RetryPolicy = NON_IDEMPOTENT_POLICY
+    idempotent_post_paths: Iterable[str] = IDEMPOTENT_POST_PATHS
+    budget: Optional[RetryBudget] = field(factory=RetryBudget)
+    metrics: RetryMetrics = field(factory=RetryMetrics)
+    _post_path_re: Optional[re.Pattern] = field(default=None, init=False, repr=False, eq=False)
+
+    def policy_for(self, request: httpx.Request) -> RetryPolicy:
+        if request.method in IDEMPOTENT_METHODS:
+            return self.idempotent
+        if self._post_path_re is None:
+            self._post_path_re = re.compile("|".join(f"(?:{path})" for path in self.idempotent_post_paths) or "(?!)")
+        if request.method == "POST" and self._post_path_re.search(request.url.path):
+            return self.idempotent
+        return self.non_idempotent
+
+    def _start(self) -> None:
+        self.metrics.record_request()
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def _delay(self, policy: RetryPolicy, attempt: int, waited: float,
+               response: Optional[httpx.Response] = None,
+               exception: Optional[Exception] = None) -> Optional[tuple[float, bool]]:
+        """ (seconds to wait, requested by Retry-After) before the next attempt, None to stop """
+        if response is not None:
+            if response.status_code not in policy.statuses:
+                return None
+            reason = str(response.status_code)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        else:
+            if not isinstance(exception, policy.exceptions):
+                return None
+            reason = type(exception).__name__
+            retry_after = None
+
+        if retry_after is not None:
+            delay = retry_after
+            if delay > policy.max_retry_after:
+                self.metrics.record_gave_up(budget=False)
+                return None
+        else:
+            delay = policy.backoff(attempt)
+        if attempt >= policy.max_attempts or waited + delay > policy.max_total_wait:
+            self.metrics.record_gave_up(budget=False)
+            return None
+        if self.budget is not None and not self.budget.try_acquire():
+            self.metrics.record_gave_up(budget=True)
+            return None
+        self.metrics.record_retry(reason)
+        return delay, retry_after is not None
+
+
+def _replayable(request: httpx.Request) -> bool:
+    """ Whether the body can be sent again (streamed uploads cannot) """
+    return isinstance(request.stream, httpx.ByteStream)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """ Sync transport retrying requests of ``transport`` according to a ``RetryConfig`` """
+
+    def __init__(self, transport: httpx.BaseTransport, config: RetryConfig,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.transport = transport
+        self.config = config
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        config = self.config
+        config._start()
+        if not _replayable(request):
+            return self.transport.handle_request(request)
+
+        policy = config.policy_for(request)
+        attempt = 1
+        waited = 0.0
+        while True:
+            try:
+                response = self.transport.handle_request(request)
+            except Exception as e:
+                decision = config._delay(policy, attempt, waited, exception=e)
+                if decision is None:
+                    raise
+            else:
+                decision = config._delay(policy, attempt, waited, response=response)
+                if decision is None:
+                    return response
+                response.close()
+
+            delay, retry_after = decision
+            start = time.monotonic()
+            self._sleep(delay)
+            slept = time.monotonic() - start
+            config.metrics.record_wait(slept, retry_after)
+            request.extensions[RETRIES] = attempt
+            waited += delay
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """ Async variant of ``RetryTransport`` """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, config: RetryConfig,
+                 sleep: Callable[[float], Any] = asyncio.sleep):
+        self.transport = transport
+        self.config = config
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        config = self.config
+        config._start()
+        if not _replayable(request):
+            return await self.transport.handle_async_request(request)
+
+        policy = config.policy_for(request)
+        attempt = 1
+        waited = 0.0
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                decision = config._delay(policy, attempt, waited, exception=e)
+                if decision is None:
+                    raise
+            else:
+                decision = config._delay(policy, attempt, waited, response=response)
+                if decision is None:
+                    return response
+                await response.aclose()
+
+            delay, retry_after = decision
+            start = time.monotonic()
+            await self._sleep(delay)
+            slept = time.monotonic() - start
+            config.metrics.record_wait(slept, retry_after)
+            request.extensions[RETRIES] = attempt
+            waited += delay
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = (
+    "AsyncRetryTransport",
+    "IDEMPOTENT_METHODS",
+    "IDEMPOTENT_POST_PATHS",
+    "NON_IDEMPOTENT_POLICY",
+    "RetryBudget",
+    "RetryConfig",
+    "RetryMetrics",
+    "RetryPolicy",
+    "RetryTransport",
+    "parse_retry_after",
+)
@@ -0,0 +1,183 @@
+""" URL templates of the generated endpoints (``ksef.api``)
+
+One table for everything that classifies requests by endpoint: per-endpoint
+metrics (``ksef.instrumentation``) and rate limit categories (``ksef.ratelimit``).
+``ENDPOINTS`` is generated from the ``_get_kwargs`` of the endpoint modules;
+after regenerating the client, print the new table with::
+
+    python -m ksef.routes
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+# Endpoint module (relative to ksef.api), method, URL template
+ENDPOINTS = (
+    ("auth.get_api_v_2_auth_reference_number", "GET", "/api/v2/auth/{reference_number}"),
+    ("auth.post_api_v2_auth_challenge", "POST", "/api/v2/auth/challenge"),
+    ("auth.post_api_v2_auth_ksef_token", "POST", "/api/v2/auth/ksef-token"),
+    ("auth.post_api_v2_auth_token_redeem", "POST", "/api/v2/auth/token/redeem"),
+    ("auth.post_api_v2_auth_token_refresh", "POST", "/api/v2/auth/token/refresh"),
+    ("auth.post_api_v2_auth_xades_signature", "POST", "/api/v2/auth/xades-signature"),
+    ("certificates.get_api_v2_certificates_enrollments_data", "GET", "/api/v2/certificates/enrollments/data"),
+    ("certificates.get_api_v2_certificates_limits", "GET", "/api/v2/certificates/limits"),
+    ("certificates.get_api_v_2_certificates_enrollments_reference_number", "GET",
+     "/api/v2/certificates/enrollments/{reference_number}"),
+    ("certificates.post_api_v2_certificates_enrollments", "POST", "/api/v2/certificates/enrollments"),
+    ("certificates.post_api_v2_certificates_query", "POST", "/api/v2/certificates/query"),
+    ("certificates.post_api_v2_certificates_retrieve", "POST", "/api/v2/certificates/retrieve"),
+    ("certificates.post_api_v_2_certificates_certificate_serial_number_revoke", "POST",
+     "/api/v2/certificates/{certificate_serial_number}/revoke"),
+    ("invoices.get_api_v_2_invoices_exports_reference_number", "GET", "/api/v2/invoices/exports/{reference_number}"),
+    ("invoices.get_api_v_2_invoices_ksef_ksef_number", "GET", "/api/v2/invoices/ksef/{ksef_number}"),
+    ("invoices.post_api_v2_invoices_exports", "POST", "/api/v2/invoices/exports"),
+    ("invoices.post_api_v2_invoices_query_metadata", "POST", "/api/v2/invoices/query/metadata"),
+    ("limits.delete_api_v2_testdata_limits_context_session", "DELETE", "/api/v2/testdata/limits/context/session"),
+    ("limits.delete_api_v2_testdata_limits_subject_certificate", "DELETE",
+     "/api/v2/testdata/limits/subject/certificate"),
+    ("limits.delete_api_v2_testdata_rate_limits", "DELETE", "/api/v2/testdata/rate-limits"),
+    ("limits.get_api_v2_limits_context", "GET", "/api/v2/limits/context"),
+    ("limits.get_api_v2_limits_subject", "GET", "/api/v2/limits/subject"),
+    ("limits.get_api_v2_rate_limits", "GET", "/api/v2/rate-limits"),
+    ("limits.post_api_v2_testdata_limits_context_session", "POST", "/api/v2/testdata/limits/context/session"),
+    ("limits.post_api_v2_testdata_limits_subject_certificate", "POST", "/api/v2/testdata/limits/subject/certificate"),
+    ("limits.post_api_v2_testdata_rate_limits", "POST", "/api/v2/testdata/rate-limits"),
+    ("operations.get_api_v2_permissions_attachments_status", "GET", "/api/v2/permissions/attachments/status"),
+    ("operations.get_api_v_2_permissions_operations_reference_number", "GET",
+     "/api/v2/permissions/operations/{reference_number}"),
+    ("peppol.get_api_v2_peppol_query", "GET", "/api/v2/peppol/query"),
+    ("permissions.delete_api_v_2_permissions_authorizations_grants_permission_id", "DELETE",
+     "/api/v2/permissions/authorizations/grants/{permission_id}"),
+    ("permissions.delete_api_v_2_permissions_common_grants_permission_id", "DELETE",
+     "/api/v2/permissions/common/grants/{permission_id}"),
+    ("permissions.get_api_v2_permissions_query_entities_roles", "GET", "/api/v2/permissions/query/entities/roles"),
+    ("permissions.post_api_v2_permissions_authorizations_grants", "POST", "/api/v2/permissions/authorizations/grants"),
+    ("permissions.post_api_v2_permissions_entities_grants", "POST", "/api/v2/permissions/entities/grants"),
+    ("permissions.post_api_v2_permissions_eu_entities_administration_grants", "POST",
+     "/api/v2/permissions/eu-entities/administration/grants"),
+    ("permissions.post_api_v2_permissions_eu_entities_grants", "POST", "/api/v2/permissions/eu-entities/grants"),
+    ("permissions.post_api_v2_permissions_indirect_grants", "POST", "/api/v2/permissions/indirect/grants"),
+    ("permissions.post_api_v2_permissions_persons_grants", "POST", "/api/v2/permissions/persons/grants"),
+    ("permissions.post_api_v2_permissions_query_authorizations_grants", "POST",
+     "/api/v2/permissions/query/authorizations/grants"),
+    ("permissions.post_api_v2_permissions_query_eu_entities_grants", "POST",
+     "/api/v2/permissions/query/eu-entities/grants"),
+    ("permissions.post_api_v2_permissions_query_personal_grants", "POST", "/api/v2/permissions/query/personal/grants"),
+    ("permissions.post_api_v2_permissions_query_persons_grants", "POST", "/api/v2/permissions/query/persons/grants"),
+    ("permissions.post_api_v2_permissions_query_subordinate_entities_roles", "POST",
+     "/api/v2/permissions/query/subordinate-entities/roles"),
+    ("permissions.post_api_v2_permissions_query_subunits_grants", "POST", "/api/v2/permissions/query/subunits/grants"),
+    ("permissions.post_api_v2_permissions_subunits_grants", "POST", "/api/v2/permissions/subunits/grants"),
+    ("publickey.get_api_v2_security_public_key_certificates", "GET", "/api/v2/security/public-key-certificates"),
+    ("sendbatch.post_api_v2_sessions_batch", "POST", "/api/v2/sessions/batch"),
+    ("sendbatch.post_api_v_2_sessions_batch_reference_number_close", "POST",
+     "/api/v2/sessions/batch/{reference_number}/close"),
+    ("sendonline.post_api_v2_sessions_online", "POST", "/api/v2/sessions/online"),
+    ("sendonline.post_api_v_2_sessions_online_reference_number_close", "POST",
+     "/api/v2/sessions/online/{reference_number}/close"),
+    ("sendonline.post_api_v_2_sessions_online_reference_number_invoices", "POST",
+     "/api/v2/sessions/online/{reference_number}/invoices"),
+    ("sessions.delete_api_v2_auth_sessions_current", "DELETE", "/api/v2/auth/sessions/current"),
+    ("sessions.delete_api_v_2_auth_sessions_reference_number", "DELETE", "/api/v2/auth/sessions/{reference_number}"),
+    ("sessions.get_api_v2_auth_sessions", "GET", "/api/v2/auth/sessions"),
+    ("status.get_api_v2_sessions", "GET", "/api/v2/sessions"),
+    ("status.get_api_v_2_sessions_reference_number", "GET", "/api/v2/sessions/{reference_number}"),
+    ("status.get_api_v_2_sessions_reference_number_invoices", "GET", "/api/v2/sessions/{reference_number}/invoices"),
+    ("status.get_api_v_2_sessions_reference_number_invoices_failed", "GET",
+     "/api/v2/sessions/{reference_number}/invoices/failed"),
+    ("status.get_api_v_2_sessions_reference_number_invoices_invoice_reference_number", "GET",
+     "/api/v2/sessions/{reference_number}/invoices/{invoice_reference_number}"),
+    ("status.get_api_v_2_sessions_reference_number_invoices_invoice_reference_number_upo", "GET",
+     "/api/v2/sessions/{reference_number}/invoices/{invoice_reference_number}/upo"),
+    ("status.get_api_v_2_sessions_reference_number_invoices_ksef_ksef_number_upo", "GET",
+     "/api/v2/sessions/{reference_number}/invoices/ksef/{ksef_number}/upo"),
+    ("status.get_api_v_2_sessions_reference_number_upo_upo_reference_number", "GET",
+     "/api/v2/sessions/{reference_number}/upo/{upo_reference_number}"),
+    ("testdata.post_api_v2_testdata_attachment", "POST", "/api/v2/testdata/attachment"),
+    ("testdata.post_api_v2_testdata_attachment_revoke", "POST", "/api/v2/testdata/attachment/revoke"),
+    ("testdata.post_api_v2_testdata_permissions", "POST", "/api/v2/testdata/permissions"),
+    ("testdata.post_api_v2_testdata_permissions_revoke", "POST", "/api/v2/testdata/permissions/revoke"),
+    ("testdata.post_api_v2_testdata_person", "POST", "/api/v2/testdata/person"),
+    ("testdata.post_api_v2_testdata_person_remove", "POST", "/api/v2/testdata/person/remove"),
+    ("testdata.post_api_v2_testdata_subject", "POST", "/api/v2/testdata/subject"),
+    ("testdata.post_api_v2_testdata_subject_remove", "POST", "/api/v2/testdata/subject/remove"),
+    ("tokens.delete_api_v_2_tokens_reference_number", "DELETE", "/api/v2/tokens/{reference_number}"),
+    ("tokens.get_api_v2_tokens", "GET", "/api/v2/tokens"),
+    ("tokens.get_api_v_2_tokens_reference_number", "GET", "/api/v2/tokens/{reference_number}"),
+    ("tokens.post_api_v2_tokens", "POST", "/api/v2/tokens"),
+)
+
+# URL templates of ENDPOINTS, sorted
+TEMPLATES = tuple(sorted({template for _module, _method, template in ENDPOINTS}))
+
+_PARAMETER = re.compile(r"\{\w+\}$")
+
+
+def _build_routes(templates: Iterable[str]) -> dict:
+    """ Segment trie of ``templates``: {segment: node, "{}": parameter node, "": template} """
+    root: dict = {}
+    for template in templates:
+        node = root
+        for segment in template.strip("/").split("/"):
+            node = node.setdefault("{}" if _PARAMETER.match(segment) else segment, {})
+        node[""] = template
+    return root
+
+
+_ROUTES = _build_routes(TEMPLATES)
+
+
+def template_for(path: str) -> str:
+    """ URL template of ``path`` ("other" when no generated endpoint matches); literal segments win """
+
+    def match(node: dict, segments: list[str], index: int) -> Optional[str]:
+        if index == len(segments):
+            return node.get("")
+        child = node.get(segments[index])
+        if child is not None:
+            found = match(child, segments, index + 1)
+            if found is not None:
+                return found
+        child = node.get("{}")
+        return match(child, segments, index + 1) if child is not None else None
+
+    return match(_ROUTES, path.strip("/").split("/"), 0) or "other"
+
+
+def scan_api() -> Iterator[tuple[str, str, str]]:
+    """ (module, method, URL template) of every generated endpoint, read from its ``_get_kwargs`` source """
+    import importlib
+    import inspect
+    import pkgutil
+
+    from . import api
+
+    method_pattern = re.compile(r'"method": "(\w+)"')
+    url_pattern = re.compile(r'"url": "([^"]+)"')
+    for package in sorted(info.name for info in pkgutil.iter_modules(api.__path__) if info.ispkg):
+        package_path = importlib.import_module(f".api.{package}", __package__).__path__
+        for name in sorted(info.name for info in pkgutil.iter_modules(package_path)):
+            module = importlib.import_module(f".api.{package}.{name}", __package__)
+            source = inspect.getsource(module._get_kwargs)
+            yield f"{package}.{name}", method_pattern.search(source)[1].upper(), url_pattern.search(source)[1]
+
+
+def main() -> None:
+    print("ENDPOINTS = (")
+    for module, method, template in scan_api():
+        row = f'    ("{module}", "{method}", "{template}"),'
+        print(row if len(row) <= 120 else f'    ("{module}", "{method}",\n     "{template}"),')
+    print(")")
+
+
+__all__ = (
+    "ENDPOINTS",
+    "TEMPLATES",
+    "scan_api",
+    "template_for",
+)
+
+
+if __name__ == "__main__":
+    main()
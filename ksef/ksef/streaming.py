@@ -0,0 +1,340 @@
+""" Streaming decoding of list endpoints
+
+The generated endpoints buffer the whole body, decode it with ``response.json()``
+and only then build the models, so a large page is held several times over.
+``stream()`` / ``astream()`` call the same endpoint with ``httpx`` streaming and
+yield the items of the response's list field while the body is being read;
+only one item (plus a read chunk) is decoded at a time.
+
+Works with every endpoint whose 200 response has one list of models, e.g.
+``post_api_v2_invoices_query_metadata``, ``get_api_v2_sessions``,
+``get_api_v_2_sessions_reference_number_invoices`` (and ``_failed``) and the
+``post_api_v2_permissions_query_*`` endpoints::
+
+    from ksef import streaming
+    from ksef.api.invoices import post_api_v2_invoices_query_metadata
+
+    with streaming.stream(post_api_v2_invoices_query_metadata, client=client, body=filters,
+                          page_size=250) as page:
+        for invoice in page:          # InvoiceMetadata
+            ...
+        page.meta                     # {"hasMore": ..., "isTruncated": ...}
+
+Items are built with ``ksef.converters`` (``raw=True`` yields the decoded dicts);
+JSON is decoded with ``ksef.json_backend``.
+"""
+
+import inspect
+import re
+import sys
+import typing
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Optional, Union
+
+import attrs
+import httpx
+
+from . import json_backend
+from .client import AuthenticatedClient, Client
+from .converters import _POP_RE, _Namespace, get_converter
+
+# Consumed input is dropped from the read buffer once it exceeds this many bytes
+COMPACT_THRESHOLD = 64 * 1024
+
+_RESPONSE_200_RE = re.compile(r"response_200 = (\w+)\.from_dict")
+
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb"[,\]}\s]")
+_NON_WHITESPACE = re.compile(rb"\S")
+
+_QUOTE = ord('"')
+_OPEN = frozenset(b"[{")
+_COMMA, _COLON = ord(","), ord(":")
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_ARRAY, _CLOSE_ARRAY = ord("["), ord("]")
+
+# Yielded by the parser when it needs the next chunk (b"" = end of body)
+_NEED_DATA = object()
+
+
+class StreamError(Exception):
+    """ Non-200 response; ``parsed`` is what the generated endpoint returns for it """
+
+    def __init__(self, status_code: int, parsed: Any, content: bytes):
+        self.status_code = status_code
+        self.parsed = parsed
+        self.content = content
+        super().__init__(f"Streaming request failed with status code {status_code}")
+
+
+def list_field(endpoint: ModuleType) -> tuple[str, type]:
+    """ (JSON key, item model) of the list field in the endpoint's 200 response """
+    _response_cls, _name, key, item = _list_field(endpoint)
+    return key, item
+
+
+@lru_cache(maxsize=None)
+def _list_field(endpoint: ModuleType) -> tuple[type, str, str, type]:
+    """ (200 response class, attribute, JSON key, item model) of the endpoint's list field """
+    match = _RESPONSE_200_RE.search(inspect.getsource(endpoint._parse_response))
+    if match is None:
+        raise ValueError(f"{endpoint.__name__} has no JSON 200 response")
+    response_cls = getattr(endpoint, match.group(1))
+
+    keys = dict(_POP_RE.findall(inspect.getsource(response_cls.from_dict)))
+    hints = typing.get_type_hints(response_cls, localns=_Namespace(sys.modules[response_cls.__module__]))
+    candidates = []
+    for field in attrs.fields(response_cls):
+        hint = hints[field.name]
+        if typing.get_origin(hint) is list:
+            (item,) = typing.get_args(hint)
+            if isinstance(item, type) and attrs.has(item):
+                candidates.append((response_cls, field.name, keys[field.name], item))
+    if len(candidates) != 1:
+        raise ValueError(f"{response_cls.__name__} does not have exactly one list of models")
+    return candidates[0]
+
+
+class _Parser:
+    """
+    Incremental parser of ``{"key": value, ..., "<items_key>": [item, ...], ...}``.
+
+    ``parse()`` is a generator: it yields ``_NEED_DATA`` when the buffer runs out
+    (the driver sends the next chunk, ``b""`` at the end of the body) and every
+    decoded item of the ``items_key`` array. Other top-level values go to ``meta``.
+    """
+
+    def __init__(self, items_key: str, meta: dict[str, Any]):
+        self.items_key = items_key
+        self.meta = meta
+        self.buffer = bytearray()
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = yield _NEED_DATA
+        if chunk:
+            if self.pos > COMPACT_THRESHOLD:
+                del self.buffer[:self.pos]
+                self.pos = 0
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def _skip_whitespace(self):
+        """ Moves to the next significant byte and returns it """
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if self.eof:
+                raise ValueError("Unexpected end of JSON document")
+            yield from self._fill()
+
+    def _expect(self, byte: int):
+        if (yield from self._skip_whitespace()) != byte:
+            raise ValueError(f"Expected {chr(byte)!r} at offset {self.pos} of the JSON document")
+        self.pos += 1
+
+    def _value(self):
+        """ Returns the raw bytes of the next complete JSON value """
+        while True:
+            end = _value_end(self.buffer, self.pos, self.eof)
+            if end >= 0:
+                value = self.buffer[self.pos:end]
+                self.pos = end
+                return value
+            if self.eof:
+                raise ValueError("Unexpected end of JSON document")
+            yield from self._fill()
+
+    def parse(self):
+        loads = json_backend.loads
+        yield from self._expect(_OPEN_OBJECT)
+        if (yield from self._skip_whitespace()) == _CLOSE_OBJECT:
+            return
+
+        while True:
+            yield from self._skip_whitespace()
+            key = loads((yield from self._value()))
+            yield from self._expect(_COLON)
+            first = yield from self._skip_whitespace()
+
+            if key == self.items_key and first == _OPEN_ARRAY:
+                self.pos += 1
+                if (yield from self._skip_whitespace()) == _CLOSE_ARRAY:
+                    self.pos += 1
+                else:
+                    while True:
+                        yield from self._skip_whitespace()
+                        yield loads((yield from self._value()))
+                        separator = yield from self._skip_whitespace()
+                        self.pos += 1
+                        if separator == _CLOSE_ARRAY:
+                            break
+                        if separator != _COMMA:
+                            raise ValueError(f"Expected ',' or ']' at offset {self.pos - 1} of the JSON document")
+            else:
+                self.meta[key] = loads((yield from self._value()))
+
+            separator = yield from self._skip_whitespace()
+            self.pos += 1
+            if separator == _CLOSE_OBJECT:
+                return
+            if separator != _COMMA:
+                raise ValueError(f"Expected ',' or '}}' at offset {self.pos - 1} of the JSON document")
+
+
+def _string_end(buffer: bytearray, pos: int) -> int:
+    """ End (exclusive) of the string starting at pos, -1 when incomplete """
+    index = pos + 1
+    while True:
+        match = _STRING_SPECIAL.search(buffer, index)
+        if match is None:
+            return -1
+        index = match.start()
+        if buffer[index] == _QUOTE:
+            return index + 1
+        index += 2  # escaped character
+        if index > len(buffer):
+            return -1
+
+
+def _value_end(buffer: bytearray, pos: int, eof: bool) -> int:
+    """ End (exclusive) of the JSON value starting at pos, -1 when incomplete """
+    if pos >= len(buffer):
+        return -1
+    first = buffer[pos]
+    if first == _QUOTE:
+        return _string_end(buffer, pos)
+    if first in _OPEN:
+        depth = 0
+        index = pos
+        while True:
+            match = _STRUCTURAL.search(buffer, index)
+            if match is None:
+                return -1
+            index = match.start()
+            byte = buffer[index]
+            if byte == _QUOTE:
+                index = _string_end(buffer, index)
+                if index < 0:
+                    return -1
+                continue
+            index += 1
+            depth += 1 if byte in _OPEN else -1
+            if depth == 0:
+                return index
+    # number / true / false / null
+    match = _SCALAR_END.search(buffer, pos)
+    if match is None:
+        return len(buffer) if eof else -1
+    return match.start()
+
+
+class ItemStream:
+    """ Items of one list response, decoded while the body is read (iterate once) """
+
+    def __init__(self, response: httpx.Response, items_key: str, convert: Optional[Callable[[Any], Any]]):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.meta: dict[str, Any] = {}
+        self._items_key = items_key
+        self._convert = convert
+
+    def __iter__(self) -> Iterator[Any]:
+        items = iter_items(self.response.iter_bytes(), self._items_key, self.meta)
+        return items if self._convert is None else map(self._convert, items)
+
+
+class AsyncItemStream(ItemStream):
+    """ Async variant of ``ItemStream`` (``async for``) """
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' with AsyncItemStream")
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        parser = _Parser(self._items_key, self.meta).parse()
+        chunks = self.response.aiter_bytes()
+        convert = self._convert
+        try:
+            value = next(parser)
+            while True:
+                if value is _NEED_DATA:
+                    value = parser.send(await anext(chunks, b""))
+                else:
+                    yield convert(value) if convert is not None else value
+                    value = next(parser)
+        except StopIteration:
+            return
+
+
+def _prepare(endpoint: ModuleType, raw: bool, kwargs: dict[str, Any]):
+    items_key, item_cls = list_field(endpoint)
+    return endpoint._get_kwargs(**kwargs), items_key, None if raw else get_converter(item_cls)
+
+
+@contextmanager
+def stream(endpoint: ModuleType, *, client: Union[AuthenticatedClient, Client], raw: bool = False,
+           **kwargs: Any) -> Iterator[ItemStream]:
+    """
+    Calls a generated list endpoint (module) with streaming and yields an
+    ``ItemStream`` of its items. ``kwargs`` are the endpoint's own arguments.
+
+    Raises:
+        StreamError: for non-200 responses (``parsed`` as the generated ``sync``)
+    """
+    request, items_key, convert = _prepare(endpoint, raw, kwargs)
+    with client.get_httpx_client().stream(**request) as response:
+        if response.status_code != 200:
+            response.read()
+            parsed = endpoint._parse_response(client=client, response=response)
+            raise StreamError(response.status_code, parsed, response.content)
+        yield ItemStream(response, items_key, convert)
+
+
+@asynccontextmanager
+async def astream(endpoint: ModuleType, *, client: Union[AuthenticatedClient, Client], raw: bool = False,
+                  **kwargs: Any) -> AsyncIterator[AsyncItemStream]:
+    """ Async version of ``stream`` """
+    request, items_key, convert = _prepare(endpoint, raw, kwargs)
+    async with client.get_async_httpx_client().stream(**request) as response:
+        if response.status_code != 200:
+            await response.aread()
+            parsed = endpoint._parse_response(client=client, response=response)
+            raise StreamError(response.status_code, parsed, response.content)
+        yield AsyncItemStream(response, items_key, convert)
+
+
+def iter_items(chunks: Iterator[bytes], items_key: str, meta: Optional[dict[str, Any]] = None) -> Iterator[Any]:
+    """ Decoded items of ``items_key`` from JSON body chunks (no HTTP, e.g. files) """
+    parser = _Parser(items_key, meta if meta is not None else {}).parse()
+    chunks = iter(chunks)
+    try:
+        value = next(parser)
+        while True:
+            if value is _NEED_DATA:
+                value = parser.send(next(chunks, b""))
+            else:
+                yield value
+                value = next(parser)
+    except StopIteration:
+        return
+
+
+__all__ = (
+    "AsyncItemStream",
+    "ItemStream",
+    "StreamError",
+    "astream",
+    "iter_items",
+    "list_field",
+    "stream",
+)